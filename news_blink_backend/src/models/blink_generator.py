@@ -7,14 +7,21 @@ import hashlib
 import os
 import json
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
 import re
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from string import Template
 # from models.image_generator import ImageGenerator # <-- LÍNEA COMENTADA
 import ollama
 
+from .http_fetcher import get_shared_fetcher
+from .llm_cache import cached_chat, get_shared_llm_cache
+from .content_cache import ArticleContentCache
+from .html_extractor import DEFAULT_PARSER_BACKEND, extract_article
+from .simhash import hamming_distance, simhash
+from .stage_graph import StageGraph
+
 # Attempt to import the central app_logger
 try:
     from news_blink_backend.src.logger_config import app_logger as logger
@@ -33,12 +40,112 @@ except ImportError:
 
 ALLOWED_CATEGORIES = ["tecnología", "deportes", "entretenimiento", "política", "economía", "salud", "ciencia", "mundo", "cultura", "general"]
 
+# Esquema JSON que Ollama impone a la respuesta de classify_category (parámetro format de chat)
+CATEGORY_CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "categoria": {"type": "string", "enum": ALLOWED_CATEGORIES},
+        "confianza": {"type": "number", "minimum": 0, "maximum": 1}
+    },
+    "required": ["categoria", "confianza"]
+}
+
+_ANSWER_LETTERS = "a-záéíóúñü"
+
+
+def _visible_answer(text):
+    """Respuesta tras el bloque <think> de los modelos que razonan (qwen3), o None si aún no se ha cerrado"""
+    end = text.rfind("</think>")
+    if end != -1:
+        return text[end + len("</think>"):]
+    if text.lstrip().lower().startswith("<think>"):
+        return None
+    return text
+
+
+def _complete_lines(text):
+    """Líneas ya terminadas (seguidas de un salto de línea) del texto recibido en streaming"""
+    return text.split('\n')[:-1]
+
+
+def _points_ready(num_points):
+    """Condición de corte del streaming de puntos clave: ya hay num_points líneas no vacías completas"""
+    def ready(text):
+        visible = _visible_answer(text)
+        if visible is None:
+            return False
+        points = [line for line in _complete_lines(visible) if re.sub(r'^\s*([\*\-\+]\s*|\d+\.\s+)?', '', line).strip()]
+        return len(points) >= num_points
+    return ready
+
+
+def _category_ready(text):
+    """Condición de corte del streaming de categoría: ya ha llegado una categoría válida completa"""
+    visible = _visible_answer(text)
+    if visible is None:
+        return False
+    lowered = visible.lower()
+    first = re.match(rf"\s*(?:categor[ií]a\s*:\s*)?[\*\"']*([{_ANSWER_LETTERS}]+)(?=[^{_ANSWER_LETTERS}])", lowered)
+    if first and first.group(1) in ALLOWED_CATEGORIES:
+        return True
+    for line in _complete_lines(lowered):
+        explicit = re.search(r"(?:categor[ií]a|category):\s*([\w\-]+)", line)
+        if explicit and re.sub(rf"[^{_ANSWER_LETTERS}\s-]", "", explicit.group(1)).strip() in ALLOWED_CATEGORIES:
+            return True
+        if re.sub(rf"[^{_ANSWER_LETTERS}\s-]", "", line).strip() in ALLOWED_CATEGORIES:
+            return True
+    return False
+
+
+def _yes_no_ready(text):
+    """Condición de corte del streaming de la verificación: la respuesta ya empieza por sí o no"""
+    visible = _visible_answer(text)
+    return visible is not None and re.match(rf"[^{_ANSWER_LETTERS}]*(sí|si|no)(?=[^{_ANSWER_LETTERS}])", visible.lower()) is not None
+
 class BlinkGenerator:
     """Clase para generar resúmenes en formato BLINK a partir de noticias"""
 
-    def __init__(self, app_config=None): # Added app_config parameter
+    def __init__(self, app_config=None, fetcher=None, llm_cache=None): # Added app_config parameter
         """Inicializa el generador de BLINKS"""
         self.app_config = app_config if app_config is not None else {}
+        # Cliente HTTP inyectable; por defecto el compartido con el scraper (conexiones keep-alive)
+        self._fetcher = fetcher
+        # Caché de respuestas de Ollama inyectable; por defecto la compartida (si está configurada)
+        self._llm_cache = llm_cache
+        # Backend de parseo HTML ('lxml' en una sola pasada o 'html.parser' con BeautifulSoup)
+        self.html_parser = self.app_config.get('html_parser', DEFAULT_PARSER_BACKEND)
+        # Huellas SimHash del contenido (textos casi idénticos, p. ej. el mismo teletipo): con
+        # simhash.enabled a false no se calculan ni se descarta contenido por ellas
+        simhash_config = self.app_config.get('simhash', {})
+        self.simhash_enabled = simhash_config.get('enabled', True)
+        # Distancia de Hamming máxima entre huellas SimHash de textos casi idénticos
+        self.simhash_max_distance = simhash_config.get('max_distance', 6)
+        # Peticiones que atiende Ollama en paralelo (OLLAMA_NUM_PARALLEL del servidor): nunca se le
+        # envían más a la vez, el resto esperaría en su cola y podría agotar el timeout
+        self.ollama_parallel_slots = max(1, int(
+            self.app_config.get('ollama_parallel_slots') or os.environ.get('OLLAMA_NUM_PARALLEL') or 1
+        ))
+        self._ollama_slots = threading.BoundedSemaphore(self.ollama_parallel_slots)
+        # Grupos que se generan a la vez y si las etapas independientes de cada uno van en paralelo
+        self.generation_max_workers = max(1, int(self.app_config.get('generation_max_workers') or self.ollama_parallel_slots))
+        self.parallel_stages = self.app_config.get('generation_parallel_stages', True)
+        # 'structured': categoría y confianza en una llamada con salida JSON (se verifica solo si la
+        # confianza es baja); 'determine_verify': determinar y verificar siempre, en dos llamadas
+        self.category_classification = self.app_config.get('category_classification', 'structured')
+        # Tareas de respuesta corta (puntos, categoría, sí/no) en streaming, cortando al tener la respuesta
+        self.stream_short_answers = self.app_config.get('stream_short_answers', True)
+        self._skip_group_lock = threading.Lock()
+
+        # Caché de contenido de artículos por URL normalizada (memoria LRU + disco, con TTL)
+        content_cache_cfg = self.app_config.get('article_content_cache', {})
+        self.content_cache = None
+        if content_cache_cfg.get('enabled', False):
+            self.content_cache = ArticleContentCache(
+                cache_dir=content_cache_cfg.get('cache_dir'),
+                ttl_hours=content_cache_cfg.get('ttl_hours', 12),
+                max_memory_entries=content_cache_cfg.get('max_memory_entries', 512),
+                max_disk_entries=content_cache_cfg.get('max_disk_entries', 5000)
+            )
 
         # Load external AI task configurations from config.json
         external_ai_configs = {}
@@ -90,6 +197,16 @@ Texto de la noticia:
 
 ¿Consideras que esta clasificación en la categoría "{proposed_category}" es correcta? Responde únicamente con "sí" o "no".
 Respuesta:"""
+            },
+            "classify_category": {
+                "model_name": "qwen3:32b", "input_max_chars": 4000, "temperature": 0.1, "confidence_threshold": 0.7,
+                "prompt_template": """Clasifica la siguiente noticia en UNA de estas categorías: ${categories_str}.
+
+Título: ${title}
+Texto:
+${input_text_truncated}
+
+Responde con un objeto JSON con "categoria" (una de las categorías anteriores) y "confianza" (número entre 0 y 1 que indica lo seguro que estás de la clasificación)."""
             },
             "generate_summary_points": {
                 "model_name": "qwen3:32b", "input_max_chars": 20000, "temperature": 0.3,
@@ -195,6 +312,20 @@ Artículo Estructurado en Formato Markdown:'''
         self.ollama_model = self.app_config.get('default_ollama_model_name', 'qwen3:32b')
 
 
+    @property
+    def llm_cache(self):
+        # Una caché vacía es falsa (__len__): se compara con None
+        return self._llm_cache if self._llm_cache is not None else get_shared_llm_cache()
+
+    def _ollama_chat(self, until=None, **kwargs):
+        """
+        ollama_client.chat a través de la caché de respuestas; si no está cacheada, esperando a que
+        quede libre uno de los ollama_parallel_slots. Con until (y stream_short_answers) la respuesta
+        se recibe en streaming y la generación se cancela en cuanto until(texto recibido) se cumple.
+        """
+        return cached_chat(self.ollama_client, self.llm_cache, self._ollama_slots,
+                           until=until if self.stream_short_answers else None, **kwargs)
+
     def determine_category_with_ai(self, text_content, title):
         task_key = "determine_category"
         task_config = self.ai_task_configs.get(task_key, {}) # This will now contain prompt_template and temperature
@@ -231,7 +362,7 @@ Artículo Estructurado en Formato Markdown:'''
         prompt = template.substitute(**prompt_variables)
 
         try:
-            response = self.ollama_client.chat(
+            response = self._ollama_chat(
                 model=model_to_use,
                 messages=[
                     {
@@ -239,7 +370,8 @@ Artículo Estructurado en Formato Markdown:'''
                         'content': prompt,
                     },
                 ],
-                options={'temperature': temperature}
+                options={'temperature': temperature},
+                until=_category_ready
             )
 
             # Ensure 're' is imported at the top of the file: import re
@@ -321,6 +453,83 @@ Artículo Estructurado en Formato Markdown:'''
             logger.error(f"Unexpected error in determine_category_with_ai: {e}")
             return "general" # Fallback category
 
+    def classify_category_with_ai(self, text_content, title):
+        """
+        Clasifica la noticia en una sola llamada con salida estructurada (JSON con el esquema
+        CATEGORY_CLASSIFICATION_SCHEMA). Devuelve (categoría, confianza entre 0 y 1), o (None, 0.0)
+        si Ollama falla o la respuesta no es válida.
+        """
+        task_key = "classify_category"
+        task_config = self.ai_task_configs.get(task_key, {})
+        model_to_use = task_config.get('model_name', self.ollama_model)
+        max_chars = task_config.get('input_max_chars', 4000)
+        temperature = task_config.get('temperature', 0.1)
+        prompt_template_str = task_config.get('prompt_template')
+
+        if not prompt_template_str:
+            logger.error(f"Prompt template for '{task_key}' not found. Using a very basic fallback or skipping.")
+            return None, 0.0
+
+        if not text_content and not title:
+            return "general", 0.0 # Not enough info to determine category
+
+        # Para clasificar basta con el título y el principio del texto
+        input_text_combined = text_content if text_content else ""
+        if title:
+            input_text_combined = title + "\n\n" + input_text_combined
+
+        prompt = Template(prompt_template_str).substitute(
+            categories_str=", ".join(ALLOWED_CATEGORIES),
+            title=title,
+            input_text_truncated=input_text_combined[:max_chars]
+        )
+
+        try:
+            response = self._ollama_chat(
+                model=model_to_use,
+                messages=[{'role': 'user', 'content': prompt}],
+                format=CATEGORY_CLASSIFICATION_SCHEMA,
+                options={'temperature': temperature}
+            )
+            raw_response_content = response['message']['content'].strip()
+            result = json.loads(re.sub(r"^\s*<think>.*?</think>\s*", "", raw_response_content, flags=re.DOTALL | re.IGNORECASE))
+            category = str(result.get('categoria', '')).strip().lower()
+            confidence = min(1.0, max(0.0, float(result.get('confianza', 0.0))))
+        except ollama.ResponseError as e:
+            logger.error(f"Error communicating with Ollama for structured category classification: {e.error}")
+            return None, 0.0
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.error(f"Invalid structured category classification for '{title}': {e}")
+            return None, 0.0
+        except Exception as e:
+            logger.error(f"Unexpected error in classify_category_with_ai: {e}")
+            return None, 0.0
+
+        if category not in ALLOWED_CATEGORIES:
+            logger.debug(f"Structured classification returned unknown category '{category}' for '{title}'")
+            return None, 0.0
+        logger.debug(f"Structured classification for '{title}': {category} (confianza {confidence:.2f})")
+        return category, confidence
+
+    def select_category_with_ai(self, text_content, title):
+        """
+        Categoría final del blink. En modo 'structured' se acepta la de classify_category_with_ai si
+        su confianza alcanza confidence_threshold; si no, se comprueba con verify_category_with_ai.
+        Si la llamada estructurada falla, o en modo 'determine_verify', se determina y se verifica
+        como antes. Devuelve "general" si la verificación no confirma la categoría.
+        """
+        if self.category_classification == 'structured':
+            threshold = self.ai_task_configs.get("classify_category", {}).get('confidence_threshold', 0.7)
+            category, confidence = self.classify_category_with_ai(text_content, title)
+            if category is not None and confidence >= threshold:
+                return category
+        else:
+            category = None
+        if category is None:
+            category = self.determine_category_with_ai(text_content, title)
+        is_verified, final_category_name = self.verify_category_with_ai(text_content, title, category)
+        return final_category_name if is_verified else "general" # Fallback if verification fails
+
     def verify_category_with_ai(self, text_content, title, proposed_category):
         if not text_content and not title:
             # Not enough info to verify, assume previous category determination was weak
@@ -359,7 +568,7 @@ Artículo Estructurado en Formato Markdown:'''
         prompt = prompt_template_str.format(**prompt_variables)
 
         try:
-            response = self.ollama_client.chat(
+            response = self._ollama_chat(
                 model=model_to_use,
                 messages=[
                     {
@@ -367,7 +576,8 @@ Artículo Estructurado en Formato Markdown:'''
                         'content': prompt,
                     },
                 ],
-                options={'temperature': temperature}
+                options={'temperature': temperature},
+                until=_yes_no_ready
             )
 
             verification_response = response['message']['content'].strip().lower()
@@ -418,7 +628,7 @@ Artículo Estructurado en Formato Markdown:'''
 
         try:
             logger.debug(f"Llamando a Ollama para '{task_key}' para título: {title}. Modelo: {model_to_use}.")
-            response = self.ollama_client.chat(
+            response = self._ollama_chat(
                 model=model_to_use,
                 messages=[{'role': 'user', 'content': prompt}],
                 options={'temperature': temperature}
@@ -473,7 +683,7 @@ Artículo Estructurado en Formato Markdown:'''
 
         try:
             logger.debug(f"Llamando a Ollama para FORMATEAR A MARKDOWN ('{task_key}') para título: {title}. Modelo: {model_to_use}.")
-            response = self.ollama_client.chat(
+            response = self._ollama_chat(
                 model=model_to_use,
                 messages=[{'role': 'user', 'content': prompt}],
                 options={'temperature': temperature}
@@ -759,13 +969,13 @@ Artículo Estructurado en Formato Markdown:'''
         logger.debug(f"_polish_markdown_output finalizado para título: '{title}' (Primeros 100 chars de salida: '{content[:100]}')")
         return content
 
-    def generate_blink_from_news_group(self, news_group):
-        """Genera un resumen en formato BLINK a partir de un grupo de noticias similares"""
-        # Usar el título más representativo del grupo
-        title = self.select_best_title(news_group)
-        logger.debug(f"Iniciando generate_blink_from_news_group para título representativo: {title}")
-
-        # Combinar contenido de todas las noticias
+    def collect_group_content(self, news_group):
+        """
+        Descarga el contenido de los artículos de un grupo (hasta 3 URLs) sin llamar a la IA.
+        Devuelve un diccionario con 'urls', 'sources', 'article_contents' (textos extraídos, sin
+        los casi idénticos a uno anterior, p. ej. el mismo teletipo en dos medios), 'fingerprints'
+        (sus huellas SimHash), 'combined_content' e 'image_url'.
+        """
         combined_content = ""
         sources = []
         urls = []
@@ -777,14 +987,22 @@ Artículo Estructurado en Formato Markdown:'''
 
         # Obtener contenido completo de los artículos
         article_contents = []
+        fingerprints = []
         image_url = None
 
         for url in urls[:3]:  # Limitar a 3 URLs para evitar sobrecarga
             try:
                 content_data = self.get_article_content(url)
                 if content_data['content']:
-                    article_contents.append(content_data['content'])
-                    combined_content += " " + content_data['content']
+                    fingerprint = simhash(content_data['content']) if self.simhash_enabled else None
+                    if fingerprint is not None and any(
+                            other is not None and hamming_distance(fingerprint, other) <= self.simhash_max_distance
+                            for other in fingerprints):
+                        logger.debug(f"Contenido de {url} casi idéntico a otro del grupo; no se repite en el texto combinado")
+                    else:
+                        article_contents.append(content_data['content'])
+                        fingerprints.append(fingerprint)
+                        combined_content += " " + content_data['content']
 
                 # Usar la primera imagen encontrada
                 if not image_url and content_data['image_url']:
@@ -799,23 +1017,39 @@ Artículo Estructurado en Formato Markdown:'''
                 if 'summary' in item and item['summary']:
                     combined_content += " " + item['summary']
 
+        return {
+            'urls': urls,
+            'sources': sources,
+            'article_contents': article_contents,
+            'fingerprints': fingerprints,
+            'combined_content': combined_content,
+            'image_url': image_url
+        }
+
+    def generate_blink_from_news_group(self, news_group, group_content=None):
+        """
+        Genera un resumen en formato BLINK a partir de un grupo de noticias similares.
+        group_content es el resultado de collect_group_content si ya se ha descargado antes.
+        """
+        # Usar el título más representativo del grupo
+        title = self.select_best_title(news_group)
+        logger.debug(f"Iniciando generate_blink_from_news_group para título representativo: {title}")
+
+        # Combinar contenido de todas las noticias
+        if group_content is None:
+            group_content = self.collect_group_content(news_group)
+        combined_content = group_content['combined_content']
+        sources = group_content['sources']
+        urls = group_content['urls']
+        image_url = group_content['image_url']
+
         # Si no se encontró ninguna imagen, generar una automáticamente
         # if not image_url: # <-- INICIO DE BLOQUE COMENTADO
         #     image_url = self.image_generator.generate_image_for_blink(title, combined_content) # <-- LÍNEA COMENTADA
 
-        # Generar puntos clave usando Ollama
-        points = self.generate_ollama_summary(combined_content, title)
-
         # Generar un ID único para el BLINK
         blink_id = hashlib.md5(title.encode()).hexdigest()
 
-        # Determine and verify category
-        determined_category_name = self.determine_category_with_ai(combined_content, title)
-        is_verified, final_category_name = self.verify_category_with_ai(combined_content, title, determined_category_name)
-
-        if not is_verified:
-            final_category_name = "general" # Fallback if verification fails
-
         logger.debug(f"Combined_content (primeros 500 chars) para IA: {combined_content[:500]}")
 
         # Truncate combined_content before sending to AI for base text generation
@@ -829,29 +1063,75 @@ Artículo Estructurado en Formato Markdown:'''
         else:
             truncated_combined_content = combined_content
 
-        logger.info(f"Generando texto base para Blink: {title}")
-        base_content = self._generate_blink_base_content(truncated_combined_content, title)
+        def base_content():
+            logger.info(f"Generando texto base para Blink: {title}")
+            return self._generate_blink_base_content(truncated_combined_content, title)
 
-        logger.info(f"Formateando a Markdown el texto base para Blink: {title}")
-        markdown_content = self.format_content_with_ai(base_content, title)
-        markdown_content = self._polish_markdown_output(markdown_content, title) # Polish the AI-generated markdown
+        def markdown_content(base_text):
+            logger.info(f"Formateando a Markdown el texto base para Blink: {title}")
+            return self._polish_markdown_output(self.format_content_with_ai(base_text, title), title) # Polish the AI-generated markdown
+
+        # Puntos clave, categoría y texto base solo dependen del contenido combinado: se piden a la
+        # vez y el formateo empieza en cuanto tiene su entrada
+        stages = StageGraph(max_workers=None if self.parallel_stages else 1, thread_name_prefix='blink_stage')
+        stages.add('points', lambda: self.generate_ollama_summary(combined_content, title))
+        stages.add('category', lambda: self.select_category_with_ai(combined_content, title))
+        stages.add('base_content', base_content)
+        stages.add('markdown', markdown_content, depends_on=['base_content'])
+        results = stages.run()
+        logger.info(f"Etapas de IA para Blink '{title}': {stages.summary()}")
 
         # Crear el objeto BLINK
         blink = {
             'id': blink_id,
             'title': title,
-            'points': points,
+            'points': results['points'],
             'image': image_url,
             'sources': list(set(sources)),
             'urls': urls,
             'timestamp': datetime.now().isoformat(),
-            'content': markdown_content, # Truncation now happens on input to format_content_with_ai
-            'categories': [final_category_name],
+            'content': results['markdown'], # Truncation now happens on input to format_content_with_ai
+            'categories': [results['category']],
             'votes': {'likes': 0, 'dislikes': 0}
         }
 
         return blink
 
+    def _generate_group_safe(self, news_group, skip_group=None):
+        """Descarga y genera el blink de un grupo; devuelve (contenido, blink, error) sin propagar excepciones"""
+        try:
+            group_content = self.collect_group_content(news_group)
+            if skip_group is not None:
+                # skip_group puede escribir blinks ya guardados: de uno en uno
+                with self._skip_group_lock:
+                    if skip_group(news_group, group_content):
+                        return group_content, None, None
+            return group_content, self.generate_blink_from_news_group(news_group, group_content), None
+        except Exception as e:
+            logger.error(f"Error al generar el blink del grupo '{news_group[0].get('title', 'N/A') if news_group else ''}': {e}")
+            return None, None, e
+
+    def generate_blinks(self, news_groups, skip_group=None):
+        """
+        Genera los blinks de news_groups con hasta generation_max_workers grupos a la vez y va
+        devolviendo tuplas (índice, grupo, contenido, blink, error) según termina cada uno, para
+        guardarlos sin esperar al resto. skip_group(grupo, contenido) se llama tras descargar el
+        contenido y antes de la IA: si devuelve algo verdadero el grupo se omite y blink es None.
+        """
+        workers = min(self.generation_max_workers, len(news_groups)) or 1
+        if workers == 1:
+            for index, group in enumerate(news_groups):
+                yield (index, group) + self._generate_group_safe(group, skip_group)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='blink_generator') as executor:
+            futures = {
+                executor.submit(self._generate_group_safe, group, skip_group): (index, group)
+                for index, group in enumerate(news_groups)
+            }
+            for future in as_completed(futures):
+                yield futures[future] + future.result()
+
     def select_best_title(self, news_group):
         """Selecciona el mejor título del grupo de noticias"""
         if len(news_group) == 1:
@@ -887,69 +1167,33 @@ Artículo Estructurado en Formato Markdown:'''
         return best_title
 
     def get_article_content(self, url):
-        """Obtiene el contenido completo de un artículo desde su URL"""
+        """Obtiene el contenido completo de un artículo desde su URL, usando la caché de contenido si está activa"""
+        if self.content_cache:
+            cached = self.content_cache.get(url)
+            if cached is not None:
+                logger.debug(f"Contenido de artículo servido desde caché: {url}")
+                return cached
+
+        content_data = self._fetch_article_content(url)
+        # Solo se cachean extracciones útiles; un fallo de red no debe fijarse durante todo el TTL
+        if self.content_cache and content_data['content']:
+            self.content_cache.put(url, content_data)
+        return content_data
+
+    def _fetch_article_content(self, url):
+        """Descarga y extrae el contenido y la imagen principal de un artículo"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            for element in soup.find_all(['script', 'style', 'nav', 'footer', 'header', 'aside', 'form']):
-                element.decompose()
-
-            content = ""
-            
-            content_selectors = [
-                'article',
-                'main',
-                'div[class*="content"]',
-                'div[class*="article"]',
-                'div[class*="post"]',
-                'div[class*="story"]',
-                'div[id*="content"]'
-            ]
-            
-            article_element = None
-            for selector in content_selectors:
-                article_element = soup.select_one(selector)
-                if article_element:
-                    break
-            
-            if article_element:
-                paragraphs = article_element.find_all('p')
-                content = ' '.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 30])
-            
-            image_url = None
-            
-            meta_tags = [
-                soup.find('meta', property='og:image'),
-                soup.find('meta', attrs={'name': 'twitter:image'}),
-                soup.find('meta', attrs={'property': 'twitter:image'})
-            ]
-            
-            for tag in meta_tags:
-                if tag and tag.get('content'):
-                    image_url = tag.get('content')
-                    break
-
-            if not image_url and article_element:
-                img_tags = article_element.find_all('img')
-                for img in img_tags:
-                    src = img.get('src') or img.get('data-src')
-                    if src and (img.get('width') is None or int(img.get('width', 0)) >= 300):
-                        if not src.startswith(('http://', 'https://')):
-                            base_url = '/'.join(url.split('/')[:3])
-                            src = base_url + src.lstrip('/')
-                        image_url = src
-                        break
-            
-            return {
-                'content': content,
-                'image_url': image_url
-            }
+            fetcher = self._fetcher or get_shared_fetcher()
+            result = fetcher.fetch(url)
+            if result.not_modified:
+                cached = fetcher.get_extracted(url, 'blink_article')
+                if cached is not None:
+                    logger.debug(f"Artículo sin cambios (304), reutilizando extracción previa: {url}")
+                    return cached
+
+            article_data = extract_article(result.text, url, backend=self.html_parser, min_paragraph_chars=30)
+            fetcher.store_extracted(url, 'blink_article', article_data)
+            return article_data
         except Exception as e:
             logger.error(f"Error al obtener contenido del artículo {url}: {e}")
             return {
@@ -991,7 +1235,7 @@ Artículo Estructurado en Formato Markdown:'''
 
         try:
             logger.debug(f"Llamando a Ollama para GENERAR PUNTOS para título: {title}. Modelo: {model_to_use}. Temperatura: {temperature}")
-            response = self.ollama_client.chat(
+            response = self._ollama_chat(
                 model=model_to_use,
                 messages=[
                     {
@@ -999,7 +1243,8 @@ Artículo Estructurado en Formato Markdown:'''
                         'content': prompt,
                     },
                 ],
-                options={'temperature': temperature}
+                options={'temperature': temperature},
+                until=_points_ready(num_points)
             )
             logger.debug(f"Raw response from Ollama:\n{response}")
             summary_content = response['message']['content']
@@ -0,0 +1,255 @@
+import heapq
+import json
+import os
+import tempfile
+import threading
+
+from .text_features import TitleFeatures, title_features
+from .time_utils import is_after
+
+
+class BlinkKeywordIndex:
+    """Índice invertido persistente palabra clave del título -> IDs de blinks.
+
+    Sirve para buscar duplicados de una noticia nueva puntuando solo los blinks que comparten
+    alguna palabra clave con ella, sin releer todos los ficheros de blinks. Guarda en memoria
+    los TitleFeatures de cada título para puntuarlos sin volver a procesarlos. En disco es un
+    diario JSON Lines (una línea por blink añadido o con título cambiado), así que actualizarlo
+    cuesta una escritura corta; al cargarlo se compacta si acumula demasiadas líneas obsoletas.
+    Si el diario no existe se construye una vez a partir de los blinks guardados; si existe, al
+    cargarlo se quitan los blinks cuyo fichero ya no está y se añaden los que faltan, y
+    candidates() descarta los que desaparezcan después (p. ej. tras borrar data/blinks).
+
+    Cada blink guarda también su fecha y, como firma de la historia, los títulos de las noticias
+    que se le han ido añadiendo (hasta max_titles_per_blink), que cuentan igual que el principal.
+    """
+
+    def __init__(self, path, blinks_dir=None, max_titles_per_blink=12):
+        self.path = os.path.abspath(path)
+        self.blinks_dir = blinks_dir
+        self.max_titles_per_blink = max_titles_per_blink
+        self._lock = threading.Lock()
+        self._titles = None
+        self._members = {}
+        self._timestamps = {}
+        self._postings = {}
+
+    def _ensure_loaded(self):
+        # Carga perezosa: News se instancia también en peticiones que nunca usan el índice
+        if self._titles is not None:
+            return
+        self._titles = {}
+        self._members = {}
+        self._timestamps = {}
+        self._postings = {}
+        if os.path.exists(self.path):
+            stale_lines = self._replay()
+            if self._sync_with_blinks() or stale_lines > len(self._titles):
+                self._write_snapshot()
+        elif self.blinks_dir and os.path.isdir(self.blinks_dir):
+            self._rebuild_from_blinks()
+
+    def _replay(self):
+        """Aplica el diario en orden; devuelve cuántas líneas han quedado obsoletas"""
+        lines = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Línea cortada por una escritura interrumpida: se ignora
+                        continue
+                    lines += 1
+                    if entry.get('removed'):
+                        self._remove(entry['id'])
+                    elif 'member' in entry:
+                        self._apply_member(entry['id'], entry['member'])
+                    else:
+                        self._apply(entry['id'], entry.get('title', ''), entry.get('timestamp'))
+        except OSError as e:
+            print(f"Error leyendo el índice de palabras clave {self.path}: {e}")
+        return lines - len(self._titles) - sum(len(members) for members in self._members.values())
+
+    def _index_blink_file(self, filename):
+        try:
+            with open(os.path.join(self.blinks_dir, filename), 'r', encoding='utf-8') as f:
+                blink = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error leyendo {filename} para el índice de palabras clave: {e}")
+            return
+        self._apply(blink.get('id') or filename[:-len('.json')], blink.get('title', ''), blink.get('timestamp'))
+
+    def _rebuild_from_blinks(self):
+        for filename in sorted(os.listdir(self.blinks_dir)):
+            if filename.endswith('.json'):
+                self._index_blink_file(filename)
+        self._write_snapshot()
+
+    def _sync_with_blinks(self):
+        """Ajusta el índice cargado a los ficheros de blinks_dir; True si ha cambiado algo"""
+        if not self.blinks_dir or not os.path.isdir(self.blinks_dir):
+            return False
+        on_disk = {filename[:-len('.json')] for filename in os.listdir(self.blinks_dir) if filename.endswith('.json')}
+        stale = [blink_id for blink_id in self._titles if blink_id not in on_disk]
+        for blink_id in stale:
+            self._remove(blink_id)
+        missing = sorted(on_disk - set(self._titles))
+        for blink_id in missing:
+            self._index_blink_file(blink_id + '.json')
+        if stale or missing:
+            print(f"Índice de palabras clave sincronizado con {self.blinks_dir}: "
+                  f"{len(stale)} blinks eliminados, {len(missing)} añadidos")
+        return bool(stale or missing)
+
+    def _blink_exists(self, blink_id):
+        return not self.blinks_dir or os.path.exists(os.path.join(self.blinks_dir, f"{blink_id}.json"))
+
+    def _keywords_of(self, blink_id):
+        keywords = set(self._titles[blink_id].keywords)
+        for member in self._members.get(blink_id, ()):
+            keywords |= member.keywords
+        return keywords
+
+    def _apply(self, blink_id, title, timestamp=None):
+        if blink_id in self._titles:
+            previous = self._titles[blink_id]
+            if previous.title == title:
+                # Mismo título (p. ej. el blink se guarda tras un voto): se conservan los títulos añadidos
+                if timestamp is not None:
+                    self._timestamps[blink_id] = timestamp
+                return
+            for keyword in self._keywords_of(blink_id):
+                ids = self._postings.get(keyword)
+                if ids is not None:
+                    ids.discard(blink_id)
+                    if not ids:
+                        del self._postings[keyword]
+            self._members.pop(blink_id, None)
+        features = self._titles[blink_id] = TitleFeatures(title)
+        self._timestamps[blink_id] = timestamp
+        for keyword in features.keywords:
+            self._postings.setdefault(keyword, set()).add(blink_id)
+
+    def _remove(self, blink_id):
+        if blink_id not in self._titles:
+            return False
+        for keyword in self._keywords_of(blink_id):
+            ids = self._postings.get(keyword)
+            if ids is not None:
+                ids.discard(blink_id)
+                if not ids:
+                    del self._postings[keyword]
+        del self._titles[blink_id]
+        self._members.pop(blink_id, None)
+        self._timestamps.pop(blink_id, None)
+        return True
+
+    def _apply_member(self, blink_id, title):
+        """Añade un título a la firma del blink; False si ya estaba, no cabe o el blink no existe"""
+        if blink_id not in self._titles:
+            return False
+        members = self._members.setdefault(blink_id, [])
+        if len(members) >= self.max_titles_per_blink or title == self._titles[blink_id].title \
+                or any(member.title == title for member in members):
+            return False
+        features = TitleFeatures(title)
+        members.append(features)
+        for keyword in features.keywords:
+            self._postings.setdefault(keyword, set()).add(blink_id)
+        return True
+
+    def _write_snapshot(self):
+        """Reescribe el diario con una línea por blink (escritura atómica)"""
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for blink_id, features in self._titles.items():
+                    entry = {'id': blink_id, 'title': features.title, 'timestamp': self._timestamps.get(blink_id)}
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    for member in self._members.get(blink_id, ()):
+                        f.write(json.dumps({'id': blink_id, 'member': member.title}, ensure_ascii=False) + '\n')
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error guardando el índice de palabras clave {self.path}: {e}")
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._titles)
+
+    def _append(self, entry):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except OSError as e:
+            print(f"Error actualizando el índice de palabras clave {self.path}: {e}")
+
+    def add(self, blink_id, title, timestamp=None):
+        """Indexa (o reindexa) el título de un blink; no escribe nada si no ha cambiado"""
+        title = title or ''
+        with self._lock:
+            self._ensure_loaded()
+            previous = self._titles.get(blink_id)
+            if previous is not None and previous.title == title and timestamp in (None, self._timestamps.get(blink_id)):
+                return
+            self._apply(blink_id, title, timestamp)
+            self._append({'id': blink_id, 'title': title, 'timestamp': timestamp})
+
+    def remove(self, blink_id):
+        """Quita un blink del índice (p. ej. porque se ha borrado su fichero)"""
+        with self._lock:
+            self._ensure_loaded()
+            if self._remove(blink_id):
+                self._append({'id': blink_id, 'removed': True})
+
+    def add_member(self, blink_id, title):
+        """Añade a la firma del blink el título de una noticia de la misma historia"""
+        if not title:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            if self._apply_member(blink_id, title):
+                self._append({'id': blink_id, 'member': title})
+
+    def candidates(self, title, live_since=None, limit=None):
+        """
+        Blinks que comparten alguna palabra clave con el título (o sus TitleFeatures) o con los
+        títulos añadidos a su historia, los que más comparten primero, como diccionarios con
+        'id', 'title', 'features' (rasgos del título del blink), 'members' (rasgos de todos los
+        títulos de la historia, el principal primero) y 'live' (True si el blink es posterior a
+        live_since, un datetime). Con limit solo se devuelven los limit que más comparten.
+        """
+        keywords = title_features(title).keywords
+        with self._lock:
+            self._ensure_loaded()
+            shared = {}
+            for keyword in keywords:
+                for blink_id in self._postings.get(keyword, ()):
+                    shared[blink_id] = shared.get(blink_id, 0) + 1
+            rank = lambda blink_id: (-shared[blink_id], blink_id)
+            while True:
+                ranked = heapq.nsmallest(limit, shared, key=rank) if limit else sorted(shared, key=rank)
+                # Blinks borrados desde que se cargó el índice: se quitan y se vuelve a elegir
+                deleted = [blink_id for blink_id in ranked if not self._blink_exists(blink_id)]
+                if not deleted:
+                    break
+                for blink_id in deleted:
+                    self._remove(blink_id)
+                    self._append({'id': blink_id, 'removed': True})
+                    del shared[blink_id]
+            return [
+                {
+                    'id': blink_id,
+                    'title': self._titles[blink_id].title,
+                    'features': self._titles[blink_id],
+                    'members': [self._titles[blink_id]] + self._members.get(blink_id, []),
+                    'live': live_since is not None and is_after(self._timestamps.get(blink_id), live_since)
+                }
+                for blink_id in ranked
+            ]
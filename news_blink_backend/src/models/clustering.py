@@ -0,0 +1,51 @@
+class UnionFind:
+    """Conjuntos disjuntos con unión por tamaño y compresión de caminos"""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b, max_size=None):
+        """Une los conjuntos de a y b; no lo hace si el resultado superaría max_size. True si quedan unidos"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return True
+        if max_size is not None and self.size[root_a] + self.size[root_b] > max_size:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return True
+
+
+def cluster_edges(count, edges, max_cluster_size=None, tie_keys=None):
+    """
+    Componentes conexas del grafo de similitud con count nodos y aristas (similitud, i, j).
+
+    Las aristas se aplican de más a menos similares, así que con max_cluster_size las uniones
+    que se quedan fuera son las más débiles. Los empates se deshacen con tie_keys (una clave
+    estable por nodo, p. ej. la URL) para que el resultado no dependa del orden de entrada.
+    Devuelve listas de índices en orden ascendente, ordenadas por su primer índice.
+    """
+    def edge_order(edge):
+        score, i, j = edge
+        if tie_keys is None:
+            return -score, min(i, j), max(i, j)
+        return (-score,) + tuple(sorted((tie_keys[i], tie_keys[j])))
+
+    components = UnionFind(count)
+    for _, i, j in sorted(edges, key=edge_order):
+        components.union(i, j, max_cluster_size)
+
+    clusters = {}
+    for index in range(count):
+        clusters.setdefault(components.find(index), []).append(index)
+    return sorted(clusters.values(), key=lambda members: members[0])
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from .url_utils import normalize_url
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'content_cache')
+
+
+class ArticleContentCache:
+    """Caché del contenido extraído de artículos ('content' e 'image_url') por URL normalizada.
+
+    Dos niveles: memoria (LRU acotada) y disco (un JSON por URL). Las entradas caducan
+    tras ttl_hours, de modo que una URL repetida no cuesta red ni parseo mientras sea reciente.
+    Cada cierto número de escrituras se borran del disco los ficheros caducados y, si aún
+    quedan más de max_disk_entries, los más antiguos.
+    """
+
+    def __init__(self, cache_dir=None, ttl_hours=12, max_memory_entries=512, max_disk_entries=5000):
+        self.cache_dir = os.path.abspath(cache_dir or DEFAULT_CACHE_DIR)
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, hashlib.md5(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _is_fresh(self, stored_at):
+        return (time.time() - stored_at) < self.ttl_seconds
+
+    def get(self, url):
+        """Devuelve una copia del contenido cacheado para la URL o None si no existe o ha caducado"""
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_fresh(entry['stored_at']):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return dict(entry['data'])
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is not None and self._is_fresh(entry['stored_at']):
+                self._remember(key, entry)
+                self.hits += 1
+                self.disk_hits += 1
+                return dict(entry['data'])
+            self.misses += 1
+        return None
+
+    def put(self, url, data):
+        """Guarda el contenido extraído de la URL en memoria y en disco"""
+        key = normalize_url(url)
+        entry = {
+            'url': key,
+            'stored_at': time.time(),
+            'data': {'content': data.get('content', ''), 'image_url': data.get('image_url')}
+        }
+        with self._lock:
+            self._remember(key, entry)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"Error guardando caché de contenido para {url}: {e}")
+
+        with self._disk_lock:
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= 50:
+                self._writes_since_prune = 0
+                self._prune_disk_unlocked()
+
+    def _prune_disk_unlocked(self):
+        """Borra los ficheros caducados y, si se supera max_disk_entries, los más antiguos"""
+        try:
+            files = []
+            cutoff = time.time() - self.ttl_seconds
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                mtime = os.path.getmtime(path)
+                if mtime < cutoff:
+                    os.remove(path)
+                else:
+                    files.append((mtime, path))
+            if self.max_disk_entries and len(files) > self.max_disk_entries:
+                files.sort()
+                for _, path in files[:len(files) - self.max_disk_entries]:
+                    os.remove(path)
+        except OSError as e:
+            print(f"Error podando la caché de contenido: {e}")
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != key:
+            return None
+        if not self._is_fresh(entry.get('stored_at', 0)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def stats(self):
+        """Contadores de aciertos/fallos para monitorización"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'ttl_hours': self.ttl_seconds / 3600
+            }
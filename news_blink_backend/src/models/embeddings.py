@@ -0,0 +1,132 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import ollama
+from scipy.sparse import csr_matrix
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'embedding_cache.sqlite')
+
+
+def text_key(model, text):
+    """Clave de caché de un texto: hash del modelo y el texto (cada modelo tiene su espacio)"""
+    return hashlib.sha1(f"{model}\x00{text}".encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """Caché en disco (SQLite) de embeddings por hash de modelo + texto, guardados como float32"""
+
+    def __init__(self, path=None):
+        self.path = os.path.abspath(path or DEFAULT_CACHE_PATH)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Una conexión por operación (confirma y cierra al salir): el scraper se usa desde hilos distintos
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get_many(self, keys):
+        """Diccionario clave -> vector (np.float32) con las claves que están en la caché"""
+        found = {}
+        keys = list(keys)
+        with self._lock, self._connect() as connection:
+            # Por bloques: SQLite limita el número de parámetros por consulta
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = connection.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                )
+                for key, dim, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32, count=dim)
+        return found
+
+    def put_many(self, entries):
+        """Guarda pares (clave, vector)"""
+        rows = [(key, len(vector), np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in entries]
+        with self._lock, self._connect() as connection:
+            connection.executemany("INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)", rows)
+
+    def __len__(self):
+        with self._lock, self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class OllamaEmbedder:
+    """Embeddings de textos con el endpoint /api/embed de Ollama, por lotes y con caché en disco.
+
+    Solo se piden los textos que no están en la caché, en lotes de batch_size, así que una
+    extracción completa cuesta unas pocas peticiones y las noticias repetidas ninguna.
+    """
+
+    def __init__(self, model, host=None, client=None, cache=None, batch_size=64, timeout=120):
+        self.model = model
+        self.client = client or ollama.Client(
+            host=host or os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434"), timeout=timeout
+        )
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.requests = 0
+
+    def embed(self, texts):
+        """Matriz (n, dim) de embeddings normalizados L2 (el coseno es el producto escalar)"""
+        texts = [text or '' for text in texts]
+        keys = [text_key(self.model, text) for text in texts]
+        vectors = self.cache.get_many(set(keys)) if self.cache is not None else {}
+
+        missing = list(dict.fromkeys(key for key in keys if key not in vectors))
+        if missing:
+            text_by_key = dict(zip(keys, texts))
+            fresh = []
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                response = self.client.embed(model=self.model, input=[text_by_key[key] for key in batch])
+                self.requests += 1
+                embeddings = response['embeddings']
+                if len(embeddings) != len(batch):
+                    raise ValueError(f"Ollama devolvió {len(embeddings)} embeddings para {len(batch)} textos")
+                fresh.extend(zip(batch, (np.asarray(vector, dtype=np.float32) for vector in embeddings)))
+            vectors.update(fresh)
+            if self.cache is not None:
+                self.cache.put_many(fresh)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        matrix = np.vstack([vectors[key] for key in keys])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+def cosine_neighbors(matrix, threshold, block_rows=1024):
+    """
+    Similitudes coseno > threshold entre las filas (normalizadas) de matrix, como matriz dispersa CSR.
+    Se calcula por bloques de filas para no materializar la matriz densa n x n completa.
+    """
+    count = matrix.shape[0]
+    rows, cols, values = [], [], []
+    for start in range(0, count, block_rows):
+        block = matrix[start:start + block_rows] @ matrix.T
+        block_row, block_col = np.nonzero(block > threshold)
+        rows.append(block_row + start)
+        cols.append(block_col)
+        values.append(block[block_row, block_col])
+    if not rows:
+        return csr_matrix((count, count), dtype=np.float32)
+    similarities = csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))), shape=(count, count)
+    )
+    similarities.sort_indices()
+    return similarities
@@ -0,0 +1,79 @@
+import hashlib
+from datetime import datetime
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+
+class SourceExtractionPlan:
+    """Selectores CSS de una fuente compilados una sola vez para extraer sus artículos de la portada.
+
+    Se construye al crear el NewsScraper: un selector inválido se detecta al arrancar
+    (plan.error) en lugar de fallar en cada extracción.
+    """
+
+    def __init__(self, source, max_articles):
+        self.source = source
+        self.name = source.get('name', source.get('url', ''))
+        self.max_articles = max_articles
+        self.error = None
+        try:
+            self.article = soupsieve.compile(source['article_selector'])
+            self.title = soupsieve.compile(source['title_selector'])
+            # Título y enlace suelen compartir selector: se reutiliza el mismo elemento
+            self.link = self.title if source['link_selector'] == source['title_selector'] else soupsieve.compile(source['link_selector'])
+            self.summary = soupsieve.compile(source['summary_selector']) if source.get('summary_selector') else None
+        except (KeyError, soupsieve.SelectorSyntaxError) as e:
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"Selectores inválidos para {self.name}: {self.error}")
+
+    @property
+    def valid(self):
+        return self.error is None
+
+    def _absolute_link(self, link):
+        """Convierte enlaces relativos en absolutos respecto a la URL de la fuente"""
+        if link and not link.startswith(('http://', 'https://')):
+            if link.startswith('/'):
+                base_url = '/'.join(self.source['url'].split('/')[:3])
+                link = base_url + link
+            else:
+                link = self.source['url'].rstrip('/') + '/' + link
+        return link
+
+    def extract(self, html, parser='html.parser'):
+        """Extrae hasta max_articles noticias del HTML de la portada"""
+        if not self.valid:
+            return []
+        soup = BeautifulSoup(html, parser)
+        # limit detiene la búsqueda en cuanto hay suficientes artículos
+        articles = self.article.select(soup, limit=self.max_articles)
+        timestamp = datetime.now().isoformat()
+
+        news_items = []
+        for article in articles:
+            try:
+                title_element = self.title.select_one(article)
+                link_element = title_element if self.link is self.title else self.link.select_one(article)
+                summary_element = self.summary.select_one(article) if self.summary else None
+
+                if title_element and link_element:
+                    title = title_element.get_text().strip()
+                    link = self._absolute_link(link_element.get('href'))
+                    summary = summary_element.get_text().strip() if summary_element else ""
+
+                    # Validar que el título tenga contenido significativo
+                    if title and link and len(title) > 10:
+                        news_items.append({
+                            'id': hashlib.md5(f"{title}:{link}".encode()).hexdigest(),
+                            'title': title,
+                            'url': link,
+                            'summary': summary,
+                            'source': self.source['name'],
+                            'category': self.source['category'],
+                            'timestamp': timestamp
+                        })
+            except Exception as e:
+                print(f"Error al procesar artículo de {self.name}: {e}")
+                continue
+        return news_items
@@ -0,0 +1,127 @@
+import html
+import io
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin
+from xml.etree import ElementTree
+
+# Tipos de contenido con los que los medios sirven sus feeds
+FEED_CONTENT_TYPES = (
+    'application/rss+xml', 'application/atom+xml', 'application/rdf+xml',
+    'application/xml', 'text/xml', 'application/x-rss+xml'
+)
+
+_XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACES_RE = re.compile(r'\s+')
+
+# Nombres locales (sin namespace) de cada campo, en orden de preferencia
+_ITEM_TAGS = ('item', 'entry')
+_TITLE_TAGS = ('title',)
+_SUMMARY_TAGS = ('description', 'summary', 'content')
+_DATE_TAGS = ('pubDate', 'published', 'updated', 'date', 'issued', 'modified')
+
+
+def _local_name(tag):
+    """'{http://www.w3.org/2005/Atom}entry' -> 'entry'"""
+    return tag.rsplit('}', 1)[-1] if '}' in tag else tag
+
+
+def _clean_text(value):
+    """Quita el HTML que algunos feeds incrustan en títulos y descripciones"""
+    if not value:
+        return ''
+    text = html.unescape(_TAG_RE.sub(' ', value))
+    return _SPACES_RE.sub(' ', text).strip()
+
+
+def parse_feed_date(value):
+    """Convierte una fecha RFC 822 (RSS) o ISO 8601 (Atom, Dublin Core) en datetime con zona horaria"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        parsed = None
+    if parsed is None:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _entry_link(element, base_url):
+    """Enlace del item: texto de <link> (RSS) o href del <link rel="alternate"> (Atom); si no, <guid> permalink"""
+    fallback = None
+    for child in element:
+        name = _local_name(child.tag)
+        if name == 'link':
+            href = child.get('href')
+            if href:
+                if child.get('rel', 'alternate') == 'alternate':
+                    return urljoin(base_url or '', href.strip())
+                fallback = fallback or href.strip()
+            elif child.text and child.text.strip():
+                return urljoin(base_url or '', child.text.strip())
+        elif name == 'guid' and child.get('isPermaLink', 'true') == 'true' and (child.text or '').startswith('http'):
+            fallback = fallback or child.text.strip()
+    return urljoin(base_url or '', fallback) if fallback else ''
+
+
+def _entry_from_element(element, base_url):
+    fields = {}
+    for child in element:
+        name = _local_name(child.tag)
+        if name not in fields and child.text:
+            fields[name] = child.text
+
+    title = next((fields[tag] for tag in _TITLE_TAGS if tag in fields), '')
+    summary = next((fields[tag] for tag in _SUMMARY_TAGS if tag in fields), '')
+    published = None
+    for tag in _DATE_TAGS:
+        published = parse_feed_date(fields.get(tag))
+        if published:
+            break
+
+    return {
+        'title': _clean_text(title),
+        'link': _entry_link(element, base_url),
+        'summary': _clean_text(summary),
+        'published': published
+    }
+
+
+def parse_feed(text, base_url=None, limit=None):
+    """
+    Extrae las entradas de un feed RSS 2.0, RSS 1.0 (RDF) o Atom con un parser XML incremental.
+
+    Devuelve una lista de dicts {'title', 'link', 'summary', 'published'} en el orden del feed;
+    'published' es un datetime con zona horaria o None. Cada entrada se libera en cuanto se
+    procesa y el análisis se detiene al alcanzar limit entradas.
+    """
+    # El texto ya viene decodificado: la declaración de encoding original ya no aplica
+    data = _XML_DECLARATION_RE.sub('', text, count=1).encode('utf-8')
+
+    entries = []
+    depth = 0
+    for event, element in ElementTree.iterparse(io.BytesIO(data), events=('start', 'end')):
+        is_item = _local_name(element.tag) in _ITEM_TAGS
+        if event == 'start':
+            if is_item:
+                depth += 1
+            continue
+        if not is_item:
+            continue
+        depth -= 1
+        if depth:
+            continue  # item anidado (poco habitual): se procesa solo el exterior
+        entries.append(_entry_from_element(element, base_url))
+        element.clear()
+        if limit and len(entries) >= limit:
+            break
+    return entries
@@ -0,0 +1,225 @@
+import re
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml es opcional: sin él se usa el backend BeautifulSoup + html.parser
+    etree = None
+    lxml_html = None
+
+# Los comentarios no se emiten en iterwalk y su tail se perdería: se descartan al parsear
+_LXML_PARSER = lxml_html.HTMLParser(remove_comments=True, remove_pis=True) if lxml_html is not None else None
+
+# Selectores de contenedor principal, en orden de prioridad
+CONTENT_SELECTORS = [
+    'article',
+    'main',
+    'div[class*="content"]',
+    'div[class*="article"]',
+    'div[class*="post"]',
+    'div[class*="story"]',
+    'div[id*="content"]'
+]
+
+# Equivalente de CONTENT_SELECTORS para el recorrido en una sola pasada: (tag, atributo, subcadena)
+_CONTAINER_RULES = [
+    ('article', None, None),
+    ('main', None, None),
+    ('div', 'class', 'content'),
+    ('div', 'class', 'article'),
+    ('div', 'class', 'post'),
+    ('div', 'class', 'story'),
+    ('div', 'id', 'content')
+]
+
+DEFAULT_REMOVED_TAGS = ('script', 'style', 'nav', 'footer', 'header', 'aside', 'form')
+
+# Meta tags de imagen, en orden de prioridad: (atributo, valor)
+_IMAGE_META_RULES = [
+    ('property', 'og:image'),
+    ('name', 'twitter:image'),
+    ('property', 'twitter:image')
+]
+
+PARSER_BACKENDS = ('lxml', 'html.parser')
+DEFAULT_PARSER_BACKEND = 'lxml'
+
+_warned_missing_lxml = False
+
+
+def resolve_parser_backend(name):
+    """Devuelve el backend utilizable: 'lxml' si está instalado y se pidió, si no 'html.parser'"""
+    global _warned_missing_lxml
+    if name == 'lxml' and etree is None:
+        if not _warned_missing_lxml:
+            print("Advertencia: lxml no está instalado; se usa BeautifulSoup con html.parser")
+            _warned_missing_lxml = True
+        return 'html.parser'
+    return name if name in PARSER_BACKENDS else 'html.parser'
+
+
+def bs4_parser_name(backend):
+    """Nombre de parser de BeautifulSoup equivalente al backend configurado"""
+    return 'lxml' if resolve_parser_backend(backend) == 'lxml' else 'html.parser'
+
+
+def _parse_width(value):
+    """Convierte el atributo width en entero; valores no numéricos ('100%', 'auto') cuentan como desconocidos"""
+    if value is None:
+        return None
+    match = re.fullmatch(r'\s*(\d+)\s*(?:px)?\s*', str(value))
+    return int(match.group(1)) if match else None
+
+
+def _is_large_enough(width_attr):
+    width = _parse_width(width_attr)
+    return width is None or width >= 300
+
+
+def extract_article(html, url, backend=DEFAULT_PARSER_BACKEND, min_paragraph_chars=30, removed_tags=DEFAULT_REMOVED_TAGS):
+    """
+    Extrae el texto principal y la imagen destacada de una página de artículo.
+
+    Devuelve {'content': str, 'image_url': str | None}. El contenido son los párrafos
+    (<p>) del primer contenedor que casa con CONTENT_SELECTORS, ignorando los de menos
+    de min_paragraph_chars caracteres y todo lo que esté dentro de removed_tags.
+    """
+    if resolve_parser_backend(backend) == 'lxml':
+        return _extract_single_pass(html, url, min_paragraph_chars, removed_tags)
+    return _extract_with_bs4(html, url, 'html.parser', min_paragraph_chars, removed_tags)
+
+
+def _extract_single_pass(html, url, min_paragraph_chars, removed_tags):
+    """Recorre el árbol de lxml una única vez recogiendo contenedores, párrafos, meta tags e imágenes"""
+    if not html or not html.strip():
+        return {'content': '', 'image_url': None}
+    try:
+        try:
+            root = lxml_html.document_fromstring(html, parser=_LXML_PARSER)
+        except ValueError:
+            # lxml rechaza str con declaración de encoding; se reintenta con bytes
+            root = lxml_html.document_fromstring(html.encode('utf-8'), parser=_LXML_PARSER)
+    except etree.ParserError:
+        return {'content': '', 'image_url': None}
+
+    removed = frozenset(removed_tags)
+    skip_depth = 0
+
+    first_match = [None] * len(_CONTAINER_RULES)  # primer contenedor por selector
+    open_containers = []  # registros de contenedores abiertos (solo los que son primer match)
+    meta_images = [None] * len(_IMAGE_META_RULES)
+    meta_seen = [False] * len(_IMAGE_META_RULES)
+    paragraph_buffers = []  # buffers de texto de los <p> abiertos
+
+    for event, element in etree.iterwalk(root, events=('start', 'end')):
+        tag = element.tag
+        is_element = isinstance(tag, str)
+
+        if event == 'start':
+            if skip_depth:
+                if is_element and tag in removed:
+                    skip_depth += 1
+                continue
+            if not is_element:
+                continue
+            if tag in removed:
+                skip_depth = 1
+                continue
+
+            if tag == 'meta':
+                for idx, (attr, value) in enumerate(_IMAGE_META_RULES):
+                    if not meta_seen[idx] and element.get(attr) == value:
+                        meta_seen[idx] = True
+                        meta_images[idx] = element.get('content')
+            elif tag == 'p':
+                paragraph_buffers.append([])
+            elif tag == 'img':
+                for record in open_containers:
+                    if record['image'] is None:
+                        src = element.get('src') or element.get('data-src')
+                        if src and _is_large_enough(element.get('width')):
+                            record['image'] = src
+
+            record = None
+            for idx, (rule_tag, attr, needle) in enumerate(_CONTAINER_RULES):
+                if first_match[idx] is None and tag == rule_tag and (attr is None or needle in (element.get(attr) or '')):
+                    if record is None:
+                        record = {'element': element, 'paragraphs': [], 'image': None}
+                    first_match[idx] = record
+            if record is not None:
+                open_containers.append(record)
+
+            if paragraph_buffers and element.text:
+                for buffer in paragraph_buffers:
+                    buffer.append(element.text)
+
+        else:  # 'end'
+            if skip_depth:
+                if is_element and tag in removed:
+                    skip_depth -= 1
+                if skip_depth:
+                    continue
+                # El tail de un elemento eliminado pertenece a su padre y sí se conserva
+            elif is_element:
+                if tag == 'p':
+                    text = ''.join(paragraph_buffers.pop()).strip()
+                    if len(text) > min_paragraph_chars:
+                        for record in open_containers:
+                            record['paragraphs'].append(text)
+                if open_containers and open_containers[-1]['element'] is element:
+                    open_containers.pop()
+
+            if paragraph_buffers and element.tail:
+                for buffer in paragraph_buffers:
+                    buffer.append(element.tail)
+
+    container = next((record for record in first_match if record is not None), None)
+    content = ' '.join(container['paragraphs']) if container else ''
+
+    image_url = None
+    for candidate in meta_images:
+        if candidate:
+            image_url = candidate
+            break
+    if not image_url and container and container['image']:
+        image_url = urljoin(url, container['image'])
+
+    return {'content': content, 'image_url': image_url}
+
+
+def _extract_with_bs4(html, url, parser, min_paragraph_chars, removed_tags):
+    """Extracción clásica con BeautifulSoup (varias pasadas sobre el árbol)"""
+    soup = BeautifulSoup(html, parser)
+
+    for element in soup.find_all(list(removed_tags)):
+        element.decompose()
+
+    article_element = None
+    for selector in CONTENT_SELECTORS:
+        article_element = soup.select_one(selector)
+        if article_element:
+            break
+
+    content = ""
+    if article_element:
+        paragraphs = article_element.find_all('p')
+        content = ' '.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > min_paragraph_chars])
+
+    image_url = None
+    meta_tags = [soup.find('meta', attrs={attr: value}) for attr, value in _IMAGE_META_RULES]
+    for tag in meta_tags:
+        if tag and tag.get('content'):
+            image_url = tag.get('content')
+            break
+
+    if not image_url and article_element:
+        for img in article_element.find_all('img'):
+            src = img.get('src') or img.get('data-src')
+            if src and _is_large_enough(img.get('width')):
+                image_url = urljoin(url, src)
+                break
+
+    return {'content': content, 'image_url': image_url}
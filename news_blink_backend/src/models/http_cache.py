@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'http_cache')
+
+
+class HttpCache:
+    """Caché HTTP persistente en disco basada en validadores (ETag / Last-Modified).
+
+    Cada URL se guarda en un fichero JSON con el cuerpo descargado, sus validadores
+    y los resultados ya extraídos de ese cuerpo (por tipo de extracción), de forma
+    que una respuesta 304 permite reutilizar tanto el HTML como el resultado del parseo.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=2000):
+        self.cache_dir = os.path.abspath(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.md5(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        """Devuelve la entrada guardada para la URL o None"""
+        path = self._path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Entrada de caché HTTP ilegible para {url}: {e}")
+            return None
+        return entry if entry.get('url') == url else None
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Cabeceras If-None-Match / If-Modified-Since para revalidar una entrada"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, body, etag=None, last_modified=None):
+        """Guarda un cuerpo nuevo. Solo se cachea si el servidor envió algún validador.
+        Un cuerpo nuevo invalida los resultados extraídos del anterior."""
+        if not etag and not last_modified:
+            return
+        self._write(url, {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': body,
+            'extracted': {},
+            'stored_at': datetime.now().isoformat()
+        })
+
+    def discard(self, url):
+        """Elimina la entrada de la URL (y sus resultados extraídos) si existe"""
+        with self._lock:
+            try:
+                os.remove(self._path(url))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error eliminando caché HTTP para {url}: {e}")
+
+    def get_extracted(self, url, kind):
+        """Resultado de extracción guardado para la URL y el tipo indicado, o None"""
+        entry = self.get(url)
+        if not entry:
+            return None
+        return entry.get('extracted', {}).get(kind)
+
+    def store_extracted(self, url, kind, data):
+        """Asocia un resultado de extracción al cuerpo actualmente cacheado de la URL"""
+        with self._lock:
+            entry = self.get(url)
+            if not entry:
+                return
+            entry.setdefault('extracted', {})[kind] = data
+            self._write_unlocked(url, entry)
+
+    def _write(self, url, entry):
+        with self._lock:
+            self._write_unlocked(url, entry)
+
+    def _write_unlocked(self, url, entry):
+        path = self._path(url)
+        try:
+            # Escritura atómica: un hilo concurrente nunca lee un JSON a medias
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error guardando caché HTTP para {url}: {e}")
+            return
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= 50:
+            self._writes_since_prune = 0
+            self._prune_unlocked()
+
+    def _prune_unlocked(self):
+        """Elimina las entradas más antiguas cuando se supera max_entries"""
+        if not self.max_entries:
+            return
+        try:
+            files = [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if f.endswith('.json')]
+            if len(files) <= self.max_entries:
+                return
+            files.sort(key=os.path.getmtime)
+            for path in files[:len(files) - self.max_entries]:
+                os.remove(path)
+        except OSError as e:
+            print(f"Error podando la caché HTTP: {e}")
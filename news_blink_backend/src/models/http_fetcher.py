@@ -0,0 +1,223 @@
+import codecs
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .http_cache import HttpCache
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Estados HTTP transitorios que merece la pena reintentar
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Tipos de contenido aceptados por defecto: solo páginas HTML
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+_XML_ENCODING_RE = re.compile(rb'^\s*<\?xml[^>]+encoding\s*=\s*["\']([A-Za-z0-9_.:-]+)')
+
+
+class FetchError(requests.RequestException):
+    """Error al descargar una URL que no corresponde a un estado HTTP"""
+
+
+class ContentTypeError(FetchError):
+    """La respuesta declara un tipo de contenido que no se va a procesar (PDF, imagen, vídeo...)"""
+
+
+def _valid_encoding(name):
+    """Devuelve el nombre del códec si Python lo conoce, o None"""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().strip('"\'')).name
+    except LookupError:
+        return None
+
+
+def _parse_content_type(header):
+    """Separa 'text/html; charset=utf-8' en ('text/html', 'utf-8')"""
+    if not header:
+        return '', None
+    parts = [part.strip() for part in header.split(';')]
+    charset = None
+    for param in parts[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            charset = value
+    return parts[0].lower(), _valid_encoding(charset)
+
+
+def decode_body(body, declared_charset=None):
+    """Decodifica el cuerpo con el charset declarado, el de <?xml encoding?> o <meta charset>, o UTF-8, sin detección heurística"""
+    encoding = declared_charset
+    if not encoding and body.startswith(codecs.BOM_UTF8):
+        encoding = 'utf-8-sig'
+    if not encoding:
+        match = _XML_ENCODING_RE.match(body) or _META_CHARSET_RE.search(body[:4096])
+        encoding = _valid_encoding(match.group(1).decode('ascii', 'ignore')) if match else None
+    return body.decode(encoding or 'utf-8', errors='replace')
+
+
+class FetchResult:
+    """Resultado de una descarga: texto decodificado y si se sirvió desde la caché tras un 304"""
+
+    def __init__(self, url, text, status_code, not_modified=False, truncated=False):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        self.not_modified = not_modified
+        self.truncated = truncated
+
+
+class HttpFetcher:
+    """Cliente HTTP compartido con sesión keep-alive, reintentos y límite de conexiones por host"""
+
+    def __init__(self, config=None):
+        """
+        Inicializa la sesión a partir de la sección 'http_client' de config.json:
+        timeout_seconds, connect_timeout_seconds, max_retries, backoff_factor,
+        max_hosts (pools de conexiones cacheados), per_host_connections y
+        conditional_cache / cache_dir para la caché persistente de GET condicionales,
+        max_bytes y max_download_seconds para acotar cada descarga y
+        allowed_content_types con los tipos que se aceptan.
+        """
+        config = config or {}
+        self.timeout = (
+            config.get('connect_timeout_seconds', 5),
+            config.get('timeout_seconds', 15)
+        )
+        self.max_retries = config.get('max_retries', 2)
+        self.backoff_factor = config.get('backoff_factor', 0.5)
+        self.max_hosts = config.get('max_hosts', 20)
+        self.per_host_connections = config.get('per_host_connections', 4)
+        self.max_bytes = config.get('max_bytes', DEFAULT_MAX_BYTES)
+        self.max_download_seconds = config.get('max_download_seconds', 30)
+        self.allowed_content_types = tuple(config.get('allowed_content_types', HTML_CONTENT_TYPES))
+
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # pool_block hace que pool_maxsize sea un límite real de conexiones simultáneas por host
+        adapter = HTTPAdapter(
+            pool_connections=self.max_hosts,
+            pool_maxsize=self.per_host_connections,
+            max_retries=retry,
+            pool_block=True
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': config.get('user_agent', DEFAULT_USER_AGENT)})
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.cache = None
+        if config.get('conditional_cache', False):
+            self.cache = HttpCache(config.get('cache_dir'), config.get('cache_max_entries', 2000))
+
+    def get(self, url, timeout=None, headers=None, stream=False):
+        """Descarga una URL reutilizando las conexiones del pool. Lanza requests.HTTPError si el estado es >= 400"""
+        response = self.session.get(url, headers=headers, timeout=timeout or self.timeout, stream=stream)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return response
+
+    def fetch(self, url, timeout=None, allowed_content_types=None, max_bytes=None):
+        """Descarga una URL como texto. Con caché activa envía If-None-Match/If-Modified-Since
+        y, ante un 304, devuelve el cuerpo guardado con not_modified=True.
+
+        El cuerpo se lee en streaming: se rechaza con ContentTypeError antes de leerlo si el
+        Content-Type no está permitido, y se corta al llegar a max_bytes (truncated=True)."""
+        entry = self.cache.get(url) if self.cache else None
+        response = self.get(url, timeout=timeout, headers=HttpCache.conditional_headers(entry), stream=True)
+
+        with response:
+            if response.status_code == 304 and entry:
+                return FetchResult(url, entry['body'], 304, not_modified=True)
+
+            content_type, charset = _parse_content_type(response.headers.get('Content-Type'))
+            allowed = allowed_content_types or self.allowed_content_types
+            # Sin cabecera se intenta procesar; con ella, solo los tipos permitidos
+            if content_type and content_type not in allowed:
+                raise ContentTypeError(f"Tipo de contenido no soportado '{content_type}' en {url}")
+
+            body, truncated = self._read_limited(response, url, max_bytes or self.max_bytes)
+
+        text = decode_body(body, charset)
+        if self.cache:
+            if truncated:
+                # Un cuerpo cortado no se guarda: un 304 posterior lo serviría como si fuera completo
+                self.cache.discard(url)
+            else:
+                self.cache.store(url, text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return FetchResult(url, text, response.status_code, truncated=truncated)
+
+    def _read_limited(self, response, url, max_bytes):
+        """Lee el cuerpo por bloques hasta max_bytes o max_download_seconds; devuelve (bytes, truncado)"""
+        deadline = time.monotonic() + self.max_download_seconds if self.max_download_seconds else None
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if max_bytes and received + len(chunk) >= max_bytes:
+                chunks.append(chunk[:max_bytes - received])
+                return b''.join(chunks), received + len(chunk) > max_bytes
+            chunks.append(chunk)
+            received += len(chunk)
+            if deadline and time.monotonic() > deadline:
+                raise FetchError(f"Descarga de {url} superó {self.max_download_seconds}s")
+        return b''.join(chunks), False
+
+    def get_extracted(self, url, kind):
+        """Resultado de extracción cacheado junto al cuerpo de la URL (None sin caché)"""
+        return self.cache.get_extracted(url, kind) if self.cache else None
+
+    def store_extracted(self, url, kind, data):
+        """Guarda el resultado de extraer el cuerpo actual de la URL para reutilizarlo tras un 304"""
+        if self.cache:
+            self.cache.store_extracted(url, kind, data)
+
+    def close(self):
+        """Cierra las conexiones abiertas del pool"""
+        self.session.close()
+
+
+_shared_fetcher = None
+_shared_lock = threading.Lock()
+
+
+def configure_shared_fetcher(config=None):
+    """(Re)crea el cliente compartido con la configuración indicada y lo devuelve"""
+    global _shared_fetcher
+    with _shared_lock:
+        previous = _shared_fetcher
+        _shared_fetcher = HttpFetcher(config)
+    if previous is not None:
+        previous.close()
+    return _shared_fetcher
+
+
+def get_shared_fetcher():
+    """Devuelve el cliente compartido, creándolo con valores por defecto si aún no existe"""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = HttpFetcher()
+        return _shared_fetcher
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'llm_cache.sqlite')
+
+
+def request_key(model, messages, options=None, format=None, cut=False):
+    """Clave de caché de una petición de chat: hash del modelo, los mensajes (prompt ya renderizado),
+    las opciones (temperatura...) y el formato de salida pedido. Con cut la clave es la de la
+    respuesta cortada en streaming, distinta de la de la respuesta completa"""
+    fields = {'model': model, 'messages': messages, 'options': options or {}, 'format': format}
+    if cut:
+        fields['cut'] = True
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """Caché en disco (SQLite) de respuestas de chat de Ollama por request_key.
+
+    Cuando el tamaño de las respuestas guardadas supera max_size_mb se eliminan las usadas hace
+    más tiempo hasta bajar al 90% del límite. Cuenta aciertos, fallos y desalojos para monitorizar.
+    """
+
+    def __init__(self, path=None, max_size_mb=100):
+        self.path = os.path.abspath(path or DEFAULT_CACHE_PATH)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, model TEXT NOT NULL, "
+                "content TEXT NOT NULL, size INTEGER NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            self._size_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @contextmanager
+    def _connect(self):
+        # Una conexión por operación (confirma y cierra al salir): los blinks se generan desde varios hilos
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, key):
+        """Contenido de la respuesta guardada para la clave, o None"""
+        with self._lock, self._connect() as connection:
+            row = connection.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, model, content):
+        """Guarda el contenido de una respuesta y desaloja las menos usadas si se supera el tamaño máximo"""
+        size = len(content.encode('utf-8'))
+        now = time.time()
+        with self._lock, self._connect() as connection:
+            previous = connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (key, model, content, size, now, now)
+            )
+            self._size_bytes += size - (previous[0] if previous else 0)
+            if self._size_bytes > self.max_bytes:
+                self._evict(connection, int(self.max_bytes * 0.9))
+
+    def _evict(self, connection, target_bytes):
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if self._size_bytes <= target_bytes:
+                break
+            evicted.append((key,))
+            self._size_bytes -= size
+        connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def __len__(self):
+        with self._lock, self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self):
+        """Contadores de aciertos/fallos y ocupación para monitorización"""
+        entries = len(self)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': entries,
+                'size_mb': round(self._size_bytes / (1024 * 1024), 2),
+                'max_size_mb': round(self.max_bytes / (1024 * 1024), 2)
+            }
+
+
+def stream_chat_until(client, until, **request):
+    """
+    Pide la respuesta en streaming y, en cuanto until(texto recibido) es verdadero, deja de leer y
+    cierra la conexión, con lo que Ollama cancela el resto de la generación. Devuelve
+    {'message': {'role': 'assistant', 'content': texto recibido}} como client.chat.
+    """
+    stream = client.chat(stream=True, **request)
+    content = ''
+    try:
+        for chunk in stream:
+            content += chunk['message']['content'] or ''
+            if until(content):
+                break
+    finally:
+        close = getattr(stream, 'close', None)
+        if close is not None:
+            close()
+    return {'message': {'role': 'assistant', 'content': content}}
+
+
+def cached_chat(client, cache=None, slots=None, until=None, **request):
+    """
+    client.chat(**request) a través de la caché de respuestas: si la misma petición (modelo,
+    mensajes, opciones y formato) ya se hizo, devuelve {'message': {'role': 'assistant', 'content': ...}}
+    sin llamar a Ollama. slots es un semáforo opcional que se adquiere solo para la llamada real.
+    Con until la respuesta se pide en streaming y se corta en cuanto basta (stream_chat_until); esas
+    respuestas incompletas se guardan con otra clave para no servirlas a peticiones sin until.
+    """
+    key = None
+    if cache is not None:
+        key = request_key(request.get('model'), request.get('messages'), request.get('options'),
+                          request.get('format'), cut=until is not None)
+        content = cache.get(key)
+        if content is not None:
+            return {'message': {'role': 'assistant', 'content': content}}
+
+    with slots if slots is not None else nullcontext():
+        if until is None:
+            response = client.chat(**request)
+        else:
+            response = stream_chat_until(client, until, **request)
+
+    if cache is not None:
+        content = response['message']['content']
+        if content:
+            cache.put(key, request.get('model'), content)
+    return response
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def configure_shared_llm_cache(config=None):
+    """(Re)crea la caché compartida con la configuración indicada ('enabled', 'path', 'max_size_mb') y la devuelve"""
+    global _shared_cache
+    config = config or {}
+    with _shared_lock:
+        _shared_cache = None
+        if config.get('enabled', True):
+            _shared_cache = LLMResponseCache(config.get('path'), config.get('max_size_mb', 100))
+        return _shared_cache
+
+
+def get_shared_llm_cache():
+    """Devuelve la caché compartida, o None si no se ha configurado o está desactivada"""
+    with _shared_lock:
+        return _shared_cache
@@ -0,0 +1,84 @@
+import numpy as np
+
+from .text_features import shingle_hash
+
+# Primo de Mersenne 2^31 - 1: a * h + b cabe en uint64 con hashes de 32 bits
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+# Bloques de permutaciones procesados a la vez (acota la memoria de la matriz intermedia)
+_PERM_CHUNK = 16
+
+
+class MinHashLSH:
+    """Firmas MinHash vectorizadas con NumPy y buckets LSH por bandas para generar pares candidatos.
+
+    Con num_perm permutaciones en bands bandas (num_perm / bands filas por banda), dos conjuntos
+    con similitud de Jaccard s comparten algún bucket con probabilidad 1 - (1 - s^filas)^bands.
+    """
+
+    def __init__(self, num_perm=64, bands=32, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm debe ser múltiplo de bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+
+    def signatures(self, shingle_sets):
+        """Matriz (n, num_perm) de firmas MinHash, calculada en bloque para todos los conjuntos"""
+        return self.signatures_from_hashes([shingle_hash(s) for s in shingles] for shingles in shingle_sets)
+
+    def signatures_from_hashes(self, hash_sets):
+        """Como signatures, con los shingles ya convertidos a hashes de 32 bits (p. ej. TitleFeatures.shingle_hashes)"""
+        hashes = []
+        offsets = []
+        for index, shingle_hashes in enumerate(hash_sets):
+            offsets.append(len(hashes))
+            if shingle_hashes:
+                hashes.extend(shingle_hashes)
+            else:
+                # Conjunto vacío: shingle propio para que no colisione con nadie
+                hashes.append(shingle_hash(f"\x00vacio:{index}"))
+        if not offsets:
+            return np.zeros((0, self.num_perm), dtype=np.uint32)
+
+        values = np.array(hashes, dtype=np.uint64)
+        starts = np.array(offsets, dtype=np.intp)
+        signatures = np.empty((self.num_perm, len(offsets)), dtype=np.uint32)
+        for start in range(0, self.num_perm, _PERM_CHUNK):
+            a = self._a[start:start + _PERM_CHUNK, None]
+            b = self._b[start:start + _PERM_CHUNK, None]
+            permuted = (a * values[None, :] + b) % _MERSENNE_PRIME
+            signatures[start:start + _PERM_CHUNK] = np.minimum.reduceat(permuted, starts, axis=1)
+        return signatures.T
+
+    def candidate_neighbors(self, shingle_sets):
+        """Para cada índice i, lista ordenada de índices j > i que comparten algún bucket con i"""
+        return self._neighbors(self.signatures(shingle_sets))
+
+    def candidate_neighbors_from_hashes(self, hash_sets):
+        """Como candidate_neighbors, con los shingles ya convertidos a hashes"""
+        return self._neighbors(self.signatures_from_hashes(hash_sets))
+
+    def _neighbors(self, signatures):
+        n = signatures.shape[0]
+        neighbors = [set() for _ in range(n)]
+        if n < 2:
+            return [[] for _ in range(n)]
+
+        for band in range(self.bands):
+            band_rows = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows])
+            # Cada fila de la banda se ve como un único valor opaco para agrupar con np.unique
+            keys = band_rows.view(np.dtype((np.void, band_rows.dtype.itemsize * self.rows))).ravel()
+            _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            if counts.max() < 2:
+                continue
+            order = np.argsort(inverse, kind='stable')
+            bucket_ends = np.cumsum(counts)
+            for bucket in np.nonzero(counts > 1)[0]:
+                members = order[bucket_ends[bucket] - counts[bucket]:bucket_ends[bucket]].tolist()
+                for pos, i in enumerate(members):
+                    neighbors[i].update(members[pos + 1:])
+
+        return [sorted(candidates) for candidates in neighbors]
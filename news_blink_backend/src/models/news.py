@@ -21,6 +21,8 @@ import json
 from datetime import datetime, timezone
 from functools import cmp_to_key
 
+from .blink_keyword_index import BlinkKeywordIndex
+
 try:
     from news_blink_backend.src.logger_config import app_logger
     app_logger.info("Successfully imported 'app_logger' from 'news_blink_backend.src.logger_config' in models/news.py.")
@@ -68,6 +70,8 @@ class News:
         os.makedirs(self.blinks_dir, exist_ok=True)
         os.makedirs(self.articles_dir, exist_ok=True)
         app_logger.debug(f"Required directories ensured: raw_news, blinks, articles.")
+        # Índice invertido de palabras clave de títulos para la detección de duplicados
+        self.keyword_index = BlinkKeywordIndex(os.path.join(data_dir, 'blink_keyword_index.jsonl'), self.blinks_dir)
 
     def save_raw_news(self, news_items):
         filename = f"raw_news_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.json"
@@ -98,6 +102,56 @@ class News:
         except Exception as e:
             app_logger.error(f"Error saving blink_id='{blink_id}' to {filepath}: {e}", exc_info=True)
             raise
+        try:
+            self.keyword_index.add(blink_id, blink_data.get('title', ''), blink_data.get('timestamp'))
+        except Exception as e:
+            app_logger.error(f"Error indexing keywords for blink_id='{blink_id}': {e}", exc_info=True)
+
+    def find_duplicate_candidates(self, title, live_since=None, limit=None):
+        """Blinks guardados que comparten alguna palabra clave con el título (ver BlinkKeywordIndex.candidates)"""
+        return self.keyword_index.candidates(title, live_since, limit)
+
+    def attach_to_blink(self, blink_id, news_items):
+        """
+        Añade a un blink existente (y a su artículo) las fuentes y URLs de noticias nuevas de la
+        misma historia, y sus títulos a la firma del blink en el índice. Devuelve cuántas URLs eran
+        nuevas, o None si no se pudo leer el blink (p. ej. se ha borrado) y no se añadió nada.
+        """
+        blink_path = os.path.join(self.blinks_dir, f"{blink_id}.json")
+        try:
+            with open(blink_path, 'r', encoding='utf-8') as f:
+                blink_data = json.load(f)
+        except Exception as e:
+            app_logger.error(f"Error reading blink_id='{blink_id}' to attach sources: {e}", exc_info=True)
+            return None
+
+        added_urls = 0
+        urls = blink_data.setdefault('urls', [])
+        sources = blink_data.setdefault('sources', [])
+        for item in news_items:
+            if item.get('url') and item['url'] not in urls:
+                urls.append(item['url'])
+                added_urls += 1
+            if item.get('source') and item['source'] not in sources:
+                sources.append(item['source'])
+
+        if added_urls:
+            self.save_blink(blink_id, blink_data)
+            article_path = os.path.join(self.articles_dir, f"{blink_id}.json")
+            if os.path.exists(article_path):
+                try:
+                    with open(article_path, 'r', encoding='utf-8') as f:
+                        article_data = json.load(f)
+                    article_data['urls'] = list(urls)
+                    article_data['sources'] = list(sources)
+                    self.save_article(blink_id, article_data)
+                except Exception as e:
+                    app_logger.error(f"Error updating sources of article_id='{blink_id}': {e}", exc_info=True)
+            app_logger.info(f"Attached {added_urls} new URLs to blink_id='{blink_id}'")
+
+        for item in news_items:
+            self.keyword_index.add_member(blink_id, item.get('title', ''))
+        return added_urls
 
     def get_blink(self, blink_id, user_id=None):
         filepath = os.path.join(self.blinks_dir, f"{blink_id}.json")
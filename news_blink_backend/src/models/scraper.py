@@ -1,49 +1,164 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import time
 from datetime import datetime, timedelta
 import hashlib
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
+from urllib.parse import urlparse
+
+from .http_fetcher import get_shared_fetcher
+from .feed_parser import FEED_CONTENT_TYPES, parse_feed
+from .seen_url_index import SeenUrlIndex
+from .extraction_plan import SourceExtractionPlan
+from .source_health import SourceHealthTracker
+from .minhash_lsh import MinHashLSH
+from .tfidf_similarity import TfidfSimilarity
+from .text_features import TitleFeatures, extract_keywords, title_features
+from .clustering import cluster_edges
+from .embeddings import EmbeddingCache, OllamaEmbedder, cosine_neighbors
+from .html_extractor import DEFAULT_PARSER_BACKEND, bs4_parser_name, extract_article
+from .string_similarity import DEFAULT_SIMILARITY_BACKEND, ratio, ratios, resolve_similarity_backend
+
+
+# Rasgos de título cacheados por el scraper (se vacía al llenarse; el proceso vive mucho)
+_MAX_CACHED_TITLE_FEATURES = 20000
+
+
+class HostRateLimiter:
+    """Espacia las peticiones a un mismo host para no sobrecargar los servidores"""
+
+    def __init__(self, min_interval):
+        """min_interval: segundos mínimos entre dos peticiones al mismo host"""
+        self.min_interval = max(0.0, float(min_interval or 0))
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        """Bloquea hasta que se permita una nueva petición al host de la URL"""
+        if self.min_interval <= 0:
+            return
+        host = urlparse(url).netloc.lower()
+        # Reservar el turno bajo el lock, pero dormir fuera de él para no bloquear otros hosts
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
 
 class NewsScraper:
     """Clase para extraer noticias de diferentes fuentes web"""
     
-    def __init__(self, config):
+    def __init__(self, config, fetcher=None):
         """Inicializa el scraper con configuraciones básicas"""
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
+        # Si no se inyecta un cliente HTTP se usa el compartido (pool keep-alive común)
+        self._fetcher = fetcher
+
         # Cargar configuración
         self.sources = config.get('news_sources', [])
         self.default_articles_per_source = config.get('default_articles_per_source', 8)
         self.recency_filter_hours = config.get('recency_filter_hours', 24)
         self.similarity_threshold = config.get('similarity_threshold', 0.6)
+        # Umbral de la similitud combinada de títulos (el de respaldo si falla el modo de embeddings)
+        self.combined_similarity_threshold = self.similarity_threshold
+        self.html_parser = config.get('html_parser', DEFAULT_PARSER_BACKEND)
+        # Ratio de caracteres de los títulos: 'rapidfuzz' (en C) o 'difflib' (SequenceMatcher)
+        self.similarity_backend = resolve_similarity_backend(
+            config.get('similarity_backend', DEFAULT_SIMILARITY_BACKEND)
+        )
+        self._title_features = {}
+        # Pares de noticias puntuados desde que se creó el scraper (en las estrategias de matriz,
+        # los pares que el producto disperso deja por encima del umbral); lo usan los benchmarks
+        self.comparisons = 0
+
+        # Agrupado: 'greedy' compara todos los pares; 'lsh' solo los candidatos de MinHash/LSH;
+        # 'tfidf' usa la similitud coseno TF-IDF de título + resumen calculada para todo el lote;
+        # 'embeddings' el coseno de embeddings de Ollama (capta la misma historia en otro idioma)
+        self.grouping_strategy = config.get('grouping_strategy', 'greedy')
+        lsh_cfg = config.get('lsh', {})
+        self.lsh = MinHashLSH(num_perm=lsh_cfg.get('num_perm', 64), bands=lsh_cfg.get('bands', 32))
+        tfidf_cfg = config.get('tfidf', {})
+        self.tfidf = TfidfSimilarity(NewsScraper._extract_keywords, sublinear_tf=tfidf_cfg.get('sublinear_tf', True))
+        self.tfidf_use_summary = tfidf_cfg.get('use_summary', True)
+        if self.grouping_strategy == 'tfidf':
+            # El coseno TF-IDF tiene otra escala que la similitud combinada: umbral propio
+            self.similarity_threshold = tfidf_cfg.get('threshold', 0.4)
+        embeddings_cfg = config.get('embeddings', {})
+        self.embeddings_use_summary = embeddings_cfg.get('use_summary', True)
+        self.embedder = None
+        if self.grouping_strategy == 'embeddings':
+            cache = EmbeddingCache(embeddings_cfg.get('cache_path')) if embeddings_cfg.get('cache', True) else None
+            self.embedder = OllamaEmbedder(
+                embeddings_cfg.get('model', 'bge-m3'),
+                host=embeddings_cfg.get('host'),
+                cache=cache,
+                batch_size=embeddings_cfg.get('batch_size', 64),
+                timeout=embeddings_cfg.get('timeout_seconds', 120)
+            )
+            self.similarity_threshold = embeddings_cfg.get('threshold', 0.8)
+        # Formación de grupos: 'greedy' (cada noticia se une a la primera semilla parecida) o
+        # 'union_find' (componentes conexas del grafo de similitud, con tamaño máximo opcional)
+        clustering_cfg = config.get('clustering', {})
+        self.clustering = clustering_cfg.get('method', 'greedy')
+        self.max_cluster_size = clustering_cfg.get('max_cluster_size')
+
+        # Extracción concurrente: un worker por fuente y espera mínima entre peticiones al mismo host
+        self.scrape_max_workers = max(1, int(config.get('scrape_max_workers', 4)))
+        self.rate_limiter = HostRateLimiter(config.get('scrape_per_host_delay_seconds', 3))
+
+        # Selectores de cada portada compilados una sola vez (por nombre de fuente)
+        self.extraction_plans = {
+            source.get('name'): SourceExtractionPlan(source, self.default_articles_per_source)
+            for source in self.sources if source.get('article_selector')
+        }
+
+        # Salud por fuente: las que fallan seguido se dejan de consultar durante un tiempo creciente
+        health_cfg = config.get('source_health', {})
+        self.health = None
+        if health_cfg.get('enabled', False):
+            self.health = SourceHealthTracker(
+                health_cfg.get('path'),
+                failure_threshold=health_cfg.get('failure_threshold', 2),
+                base_cooldown_seconds=health_cfg.get('base_cooldown_minutes', 120) * 60,
+                max_cooldown_seconds=health_cfg.get('max_cooldown_hours', 48) * 3600
+            )
+
+        # Índice de URLs ya procesadas: las noticias conocidas se descartan nada más extraerse
+        seen_cfg = config.get('seen_url_index', {})
+        self.seen_index = None
+        if seen_cfg.get('enabled', False):
+            self.seen_index = SeenUrlIndex(seen_cfg.get('path'), ttl_days=seen_cfg.get('ttl_days', 7))
+
+    @property
+    def fetcher(self):
+        """Cliente HTTP usado para todas las descargas del scraper"""
+        return self._fetcher or get_shared_fetcher()
+
+    def _plan_for(self, source):
+        """Plan de extracción precompilado de la fuente; se compila al vuelo si la fuente no estaba configurada"""
+        plan = self.extraction_plans.get(source.get('name'))
+        if plan is None or plan.source != source:
+            plan = SourceExtractionPlan(source, self.default_articles_per_source)
+        return plan
 
     @staticmethod
-    def _similarity(a, b):
-        """Calcula la similitud entre dos títulos"""
-        return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+    def _similarity(a, b, backend=DEFAULT_SIMILARITY_BACKEND):
+        """Calcula la similitud entre dos títulos (o sus TitleFeatures)"""
+        return ratio(title_features(a).normalized, title_features(b).normalized, backend)
 
     @staticmethod
     def _extract_keywords(title):
         """Extrae palabras clave de un título"""
-        # Palabras comunes a ignorar
-        stop_words = {
-            'el', 'la', 'los', 'las', 'un', 'una', 'de', 'del', 'en', 'con', 'por', 'para', 'que', 'se', 'es', 'y', 'o',
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are'
-        }
-
-        words = re.findall(r'\b\w+\b', title.lower())
-        return [word for word in words if len(word) > 2 and word not in stop_words]
+        return extract_keywords(title)
 
     @staticmethod
     def _keyword_similarity(title1, title2):
         """Calcula similitud basada en palabras clave comunes"""
-        keywords1 = set(NewsScraper._extract_keywords(title1))
-        keywords2 = set(NewsScraper._extract_keywords(title2))
+        keywords1 = title_features(title1).keywords
+        keywords2 = title_features(title2).keywords
 
         if not keywords1 or not keywords2:
             return 0
@@ -53,33 +168,197 @@ class NewsScraper:
 
         return len(intersection) / len(union) if union else 0
 
+    @staticmethod
+    def _combined_score_above(features_a, features_b, threshold, backend=DEFAULT_SIMILARITY_BACKEND):
+        """
+        calculate_combined_similarity(a, b) si supera threshold; None si no. Antes del ratio exacto
+        descarta con cotas superiores baratas: ratio <= 1, la de longitudes (real_quick_ratio)
+        y quick_ratio (con rapidfuzz, el propio ratio con el mínimo necesario como score_cutoff).
+        """
+        keywords_a, keywords_b = features_a.keywords, features_b.keywords
+        keyword_sim = len(keywords_a & keywords_b) / len(keywords_a | keywords_b) if keywords_a and keywords_b else 0
+        if (1.0 * 0.6) + (keyword_sim * 0.4) <= threshold:
+            return None
+        title_a, title_b = features_a.normalized, features_b.normalized
+        total_length = len(title_a) + len(title_b)
+        length_bound = 2.0 * min(len(title_a), len(title_b)) / total_length if total_length else 1.0
+        if (length_bound * 0.6) + (keyword_sim * 0.4) <= threshold:
+            return None
+        if backend == 'difflib':
+            matcher = SequenceMatcher(None, title_a, title_b)
+            if (matcher.quick_ratio() * 0.6) + (keyword_sim * 0.4) <= threshold:
+                return None
+            text_sim = matcher.ratio()
+        else:
+            text_sim = ratio(title_a, title_b, backend, score_cutoff=(threshold - keyword_sim * 0.4) / 0.6)
+        combined_sim = (text_sim * 0.6) + (keyword_sim * 0.4)
+        return combined_sim if combined_sim > threshold else None
+
+    @staticmethod
+    def _combined_exceeds(features_a, features_b, threshold, backend=DEFAULT_SIMILARITY_BACKEND):
+        """Equivale a calculate_combined_similarity(a, b) > threshold"""
+        return NewsScraper._combined_score_above(features_a, features_b, threshold, backend) is not None
+
+    def features_for(self, item):
+        """TitleFeatures del título de una noticia, calculados una sola vez por título"""
+        title = item.get('title') or ''
+        features = self._title_features.get(title)
+        if features is None:
+            if len(self._title_features) >= _MAX_CACHED_TITLE_FEATURES:
+                self._title_features.clear()
+            features = self._title_features[title] = TitleFeatures(title)
+        return features
+
     def calculate_combined_similarity(self, title1, title2):
-        """Calcula la similitud combinada (textual y por palabras clave) entre dos títulos."""
-        text_sim = NewsScraper._similarity(title1, title2)
-        keyword_sim = NewsScraper._keyword_similarity(title1, title2)
+        """
+        Calcula la similitud combinada (textual y por palabras clave) entre dos títulos (o sus TitleFeatures).
+        En modo embeddings es el coseno de sus embeddings, o la combinada de títulos si Ollama no responde.
+        """
+        features1 = title_features(title1)
+        features2 = title_features(title2)
+        if self.grouping_strategy == 'tfidf':
+            return self.tfidf.similarity(features1.title, features2.title)
+        if self.grouping_strategy == 'embeddings':
+            scores = self._embedding_scores(features1, [features2])
+            if scores is not None:
+                return scores[0]
+
+        text_sim = NewsScraper._similarity(features1, features2, self.similarity_backend)
+        keyword_sim = NewsScraper._keyword_similarity(features1, features2)
 
         # Combinar ambas métricas (mismos pesos que antes)
         combined_sim = (text_sim * 0.6) + (keyword_sim * 0.4)
         return combined_sim
 
+    def _embedding_scores(self, title, choices):
+        """Cosenos de los embeddings de title con los de cada una de choices; None si Ollama no responde"""
+        try:
+            vectors = self.embedder.embed([title_features(title).title] + [title_features(choice).title for choice in choices])
+        except Exception as e:
+            print(f"Error obteniendo embeddings de Ollama para comparar títulos: {e}")
+            return None
+        return (vectors[1:] @ vectors[0]).tolist()
+
+    def similarity_above(self, title1, title2, threshold):
+        """calculate_combined_similarity(title1, title2) si supera threshold; None si no"""
+        if self.grouping_strategy == 'embeddings':
+            return self.scores_above(title1, [title2], threshold)[0]
+        self.comparisons += 1
+        if self.grouping_strategy == 'tfidf':
+            score = self.calculate_combined_similarity(title1, title2)
+            return score if score > threshold else None
+        return NewsScraper._combined_score_above(
+            title_features(title1), title_features(title2), threshold, self.similarity_backend
+        )
+
+    def scores_above(self, title, choices, threshold):
+        """
+        Como similarity_above(title, choice, threshold) para cada una de choices (títulos o
+        TitleFeatures), pero con una sola llamada al backend para los ratios de todo el lote:
+        lista con la similitud o None por cada elección.
+        """
+        if self.grouping_strategy == 'tfidf':
+            # Vocabulario e IDF del último lote agrupado (find_similar_news): solo se vectorizan estos títulos
+            self.comparisons += len(choices)
+            scores = self.tfidf.similarities(title_features(title).title, [title_features(choice).title for choice in choices])
+            return [score if score > threshold else None for score in scores]
+        if self.grouping_strategy == 'embeddings':
+            # Un solo embed para el lote; si falla, títulos con el umbral combinado, como al agrupar con LSH
+            self.comparisons += len(choices)
+            scores = self._embedding_scores(title, choices)
+            if scores is None:
+                features = title_features(title)
+                return [
+                    NewsScraper._combined_score_above(features, title_features(choice),
+                                                      self.combined_similarity_threshold, self.similarity_backend)
+                    for choice in choices
+                ]
+            return [score if score > threshold else None for score in scores]
+        if self.similarity_backend == 'difflib':
+            # difflib no tiene llamada por lotes: cada par con las cotas baratas de _combined_score_above
+            return [self.similarity_above(title, choice, threshold) for choice in choices]
+        features = title_features(title)
+        choices = [title_features(choice) for choice in choices]
+        self.comparisons += len(choices)
+        keywords = features.keywords
+        keyword_sims = [
+            len(keywords & choice.keywords) / len(keywords | choice.keywords) if keywords and choice.keywords else 0
+            for choice in choices
+        ]
+        # Solo llegan al ratio las que podrían superar el umbral con un ratio perfecto
+        viable = [index for index, keyword_sim in enumerate(keyword_sims) if 0.6 + keyword_sim * 0.4 > threshold]
+        scores = [None] * len(choices)
+        if not viable:
+            return scores
+        best_keywords = max(keyword_sims[index] for index in viable)
+        text_sims = ratios(features.normalized, [choices[index].normalized for index in viable],
+                           self.similarity_backend, score_cutoff=max(0.0, (threshold - best_keywords * 0.4) / 0.6))
+        for index, text_sim in zip(viable, text_sims):
+            combined_sim = (text_sim * 0.6) + (keyword_sims[index] * 0.4)
+            if combined_sim > threshold:
+                scores[index] = combined_sim
+        return scores
+
     def scrape_all_sources(self):
-        """Extrae noticias de todas las fuentes configuradas"""
+        """Extrae noticias de todas las fuentes configuradas (en paralelo si scrape_max_workers > 1)"""
         all_news = []
-        
-        for source in self.sources:
-            try:
-                print(f"Extrayendo noticias de {source['name']}...")
-                news_items = self.scrape_source(source)
-                all_news.extend(news_items)
-                # Esperar un poco entre solicitudes para no sobrecargar los servidores
-                time.sleep(3)
-            except Exception as e:
-                print(f"Error al extraer noticias de {source['name']}: {e}")
-        
+        start_time = time.monotonic()
+
+        workers = min(self.scrape_max_workers, len(self.sources)) or 1
+        if workers == 1:
+            results = [self._scrape_source_safe(source) for source in self.sources]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scraper') as executor:
+                # map conserva el orden de las fuentes, así el agrupado posterior es determinista
+                results = list(executor.map(self._scrape_source_safe, self.sources))
+
+        skipped = 0
+        for news_items in results:
+            if self.seen_index is not None:
+                unseen = self.seen_index.filter_unseen(news_items)
+                skipped += len(news_items) - len(unseen)
+                news_items = unseen
+            all_news.extend(news_items)
+        # Rasgos de los títulos calculados una vez aquí; el agrupado y la deduplicación los reutilizan
+        for item in all_news:
+            self.features_for(item)
+        if skipped:
+            print(f"Descartadas {skipped} noticias ya procesadas en ejecuciones anteriores")
+
+        print(f"Extracción de {len(self.sources)} fuentes completada en {time.monotonic() - start_time:.1f}s ({workers} workers)")
+        if self.health is not None:
+            self.health.save()
+
         # Filtrar noticias de las últimas 24 horas
         filtered_news = self.filter_recent_news(all_news)
         
         return filtered_news
+
+    def _scrape_source_safe(self, source):
+        """Envuelve scrape_source para que el fallo de una fuente no afecte al resto y registra su salud"""
+        name = source.get('name', source.get('url'))
+        if self.health is not None and not self.health.allow(name):
+            print(f"Se omite {name}: circuito abierto por fallos recientes")
+            return []
+
+        start = time.monotonic()
+        error = None
+        news_items = []
+        try:
+            print(f"Extrayendo noticias de {source['name']}...")
+            news_items = self.scrape_source(source)
+        except Exception as e:
+            error = str(e)
+            print(f"Error al extraer noticias de {name}: {e}")
+
+        if self.health is not None:
+            self.health.record(name, len(news_items), time.monotonic() - start, error=error)
+        return news_items
+
+    def _note_source_error(self, source, error):
+        """Asocia el motivo de un fallo interno de scrape_source a la salud de la fuente"""
+        if self.health is not None:
+            self.health.note_error(source.get('name', source.get('url')), error)
     
     def filter_recent_news(self, news_items):
         """Filtra noticias para mostrar solo las de las últimas N horas según configuración"""
@@ -91,7 +370,10 @@ class NewsScraper:
                 # Si el timestamp está en formato ISO, convertirlo
                 if 'timestamp' in item:
                     item_time = datetime.fromisoformat(item['timestamp'].replace('Z', '+00:00'))
-                    if item_time.replace(tzinfo=None) >= cutoff_time:
+                    if item_time.tzinfo is not None:
+                        # Pasar a hora local antes de comparar con cutoff_time (naive, hora local)
+                        item_time = item_time.astimezone().replace(tzinfo=None)
+                    if item_time >= cutoff_time:
                         recent_news.append(item)
                 else:
                     # Si no hay timestamp, asumir que es reciente
@@ -103,129 +385,118 @@ class NewsScraper:
         
         return recent_news
     
+    def _source_cache_kind(self, source):
+        """Clave de la extracción cacheada de una portada; cambia si cambian los selectores o el límite"""
+        signature = '|'.join(str(source.get(key, '')) for key in ('article_selector', 'title_selector', 'link_selector', 'summary_selector', 'category', 'name'))
+        signature += f"|{self.default_articles_per_source}"
+        return 'source_items:' + hashlib.md5(signature.encode()).hexdigest()
+
+    def _feed_cache_kind(self, source):
+        """Clave de las entradas cacheadas de un feed; cambia si cambia la fuente o el límite"""
+        signature = '|'.join(str(source.get(key, '')) for key in ('feed_url', 'category', 'name'))
+        signature += f"|{self.default_articles_per_source}"
+        return 'feed_items:' + hashlib.md5(signature.encode()).hexdigest()
+
+    def scrape_feed(self, source):
+        """Extrae noticias del feed RSS/Atom de una fuente, con sus fechas de publicación reales"""
+        feed_url = source['feed_url']
+        self.rate_limiter.wait(feed_url)
+        result = self.fetcher.fetch(feed_url, allowed_content_types=FEED_CONTENT_TYPES)
+        cache_kind = self._feed_cache_kind(source)
+
+        # Feed sin cambios (304): las entradas guardadas conservan su fecha de publicación
+        if result.not_modified:
+            cached_items = self.fetcher.get_extracted(feed_url, cache_kind)
+            if cached_items is not None:
+                print(f"Feed de {source['name']} sin cambios (304): reutilizados {len(cached_items)} artículos")
+                return cached_items
+
+        entries = parse_feed(result.text, base_url=feed_url, limit=self.default_articles_per_source)
+
+        news_items = []
+        now = datetime.now()
+        for entry in entries:
+            title = entry['title']
+            link = entry['link']
+            if title and link and len(title) > 10:
+                # Los timestamps del scraper son ISO en hora local sin zona, igual que en la portada
+                published = entry['published']
+                item_time = published.astimezone().replace(tzinfo=None) if published else now
+                news_items.append({
+                    'id': hashlib.md5(f"{title}:{link}".encode()).hexdigest(),
+                    'title': title,
+                    'url': link,
+                    'summary': entry['summary'],
+                    'source': source['name'],
+                    'category': source['category'],
+                    'timestamp': item_time.isoformat()
+                })
+
+        self.fetcher.store_extracted(feed_url, cache_kind, news_items)
+        print(f"Extraídos {len(news_items)} artículos del feed de {source['name']}")
+        return news_items
+
     def scrape_source(self, source):
-        """Extrae noticias de una fuente específica"""
+        """Extrae noticias de una fuente específica: de su feed si tiene 'feed_url', si no de la portada HTML"""
+        if source.get('feed_url'):
+            try:
+                news_items = self.scrape_feed(source)
+                if news_items or not source.get('article_selector'):
+                    return news_items
+                print(f"El feed de {source['name']} no devolvió artículos; se usa la portada")
+            except Exception as e:
+                print(f"Error al leer el feed de {source['name']}: {e}")
+                self._note_source_error(source, f"feed: {e}")
+                if not source.get('article_selector'):
+                    return []
+
         try:
-            response = requests.get(source['url'], headers=self.headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            articles = soup.select(source['article_selector'])
-            
-            news_items = []
-            for article in articles[:self.default_articles_per_source]:
-                try:
-                    title_element = article.select_one(source['title_selector'])
-                    link_element = article.select_one(source['link_selector'])
-                    summary_element = article.select_one(source['summary_selector'])
-                    
-                    if title_element and link_element:
-                        title = title_element.get_text().strip()
-                        
-                        # Manejar URLs relativas
-                        link = link_element.get('href')
-                        if link and not link.startswith(('http://', 'https://')):
-                            if link.startswith('/'):
-                                base_url = '/'.join(source['url'].split('/')[:3])
-                                link = base_url + link
-                            else:
-                                link = source['url'].rstrip('/') + '/' + link
-                        
-                        summary = ""
-                        if summary_element:
-                            summary = summary_element.get_text().strip()
-                        
-                        # Validar que el título tenga contenido significativo
-                        if title and link and len(title) > 10:
-                            # Generar un ID único basado en el título y la URL
-                            unique_id = hashlib.md5(f"{title}:{link}".encode()).hexdigest()
-                            
-                            news_items.append({
-                                'id': unique_id,
-                                'title': title,
-                                'url': link,
-                                'summary': summary,
-                                'source': source['name'],
-                                'category': source['category'],
-                                'timestamp': datetime.now().isoformat()
-                            })
-                except Exception as e:
-                    print(f"Error al procesar artículo de {source['name']}: {e}")
-                    continue
-            
+            plan = self._plan_for(source)
+            if not plan.valid:
+                print(f"Se omite {source['name']}: {plan.error}")
+                self._note_source_error(source, plan.error)
+                return []
+
+            self.rate_limiter.wait(source['url'])
+            result = self.fetcher.fetch(source['url'])
+            cache_kind = self._source_cache_kind(source)
+
+            # Portada sin cambios (304): reutilizar los artículos ya extraídos sin volver a parsear
+            if result.not_modified:
+                cached_items = self.fetcher.get_extracted(source['url'], cache_kind)
+                if cached_items is not None:
+                    now = datetime.now().isoformat()
+                    for item in cached_items:
+                        item['timestamp'] = now
+                    print(f"{source['name']} sin cambios (304): reutilizados {len(cached_items)} artículos")
+                    return cached_items
+
+            news_items = plan.extract(result.text, bs4_parser_name(self.html_parser))
+
+            self.fetcher.store_extracted(source['url'], cache_kind, news_items)
             print(f"Extraídos {len(news_items)} artículos de {source['name']}")
             return news_items
         except Exception as e:
             print(f"Error al extraer noticias de {source['name']}: {e}")
+            self._note_source_error(source, e)
             return []
     
     def get_article_content(self, url):
         """Obtiene el contenido completo de un artículo desde su URL"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Eliminar elementos no deseados
-            for element in soup.find_all(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-                element.decompose()
-            
-            # Extraer el contenido principal (esto puede variar según el sitio)
-            content = ""
-            
-            # Intentar diferentes selectores para el contenido principal
-            content_selectors = [
-                'article',
-                'main',
-                'div[class*="content"]',
-                'div[class*="article"]',
-                'div[class*="post"]',
-                'div[class*="story"]',
-                'div[id*="content"]'
-            ]
-            
-            article_element = None
-            for selector in content_selectors:
-                article_element = soup.select_one(selector)
-                if article_element:
-                    break
-            
-            if article_element:
-                paragraphs = article_element.find_all('p')
-                content = ' '.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 20])
-            
-            # Intentar extraer una imagen principal
-            image_url = None
-            
-            # Buscar meta tags de Open Graph o Twitter
-            meta_tags = [
-                soup.find('meta', property='og:image'),
-                soup.find('meta', attrs={'name': 'twitter:image'}),
-                soup.find('meta', attrs={'property': 'twitter:image'})
-            ]
-            
-            for tag in meta_tags:
-                if tag and tag.get('content'):
-                    image_url = tag.get('content')
-                    break
-            
-            # Si no se encontró en meta tags, buscar en el contenido
-            if not image_url and article_element:
-                img_tags = article_element.find_all('img')
-                for img in img_tags:
-                    src = img.get('src') or img.get('data-src')
-                    if src and (img.get('width') is None or int(img.get('width', 0)) >= 300):
-                        if not src.startswith(('http://', 'https://')):
-                            base_url = '/'.join(url.split('/')[:3])
-                            src = base_url + src.lstrip('/')
-                        image_url = src
-                        break
-            
-            return {
-                'content': content,
-                'image_url': image_url
-            }
+            self.rate_limiter.wait(url)
+            result = self.fetcher.fetch(url)
+            if result.not_modified:
+                cached = self.fetcher.get_extracted(url, 'scraper_article')
+                if cached is not None:
+                    return cached
+
+            article_data = extract_article(
+                result.text, url, backend=self.html_parser, min_paragraph_chars=20,
+                removed_tags=('script', 'style', 'nav', 'footer', 'header', 'aside')
+            )
+            self.fetcher.store_extracted(url, 'scraper_article', article_data)
+            return article_data
         except Exception as e:
             print(f"Error al obtener contenido del artículo {url}: {e}")
             return {
@@ -237,9 +508,17 @@ class NewsScraper:
         """Agrupa noticias similares basadas en títulos similares con algoritmo mejorado"""
         
         current_threshold = threshold if threshold is not None else self.similarity_threshold
+
+        if self.clustering == 'union_find':
+            return self._cluster_news(news_items, current_threshold)
+        if self.grouping_strategy == 'lsh':
+            return self._find_similar_news_lsh(news_items, current_threshold)
+        if self.grouping_strategy in ('tfidf', 'embeddings'):
+            return self._find_similar_news_matrix(news_items, current_threshold)
         
         grouped_news = []
         processed = set()
+        features = [self.features_for(item) for item in news_items]
         
         for i, item in enumerate(news_items):
             if i in processed:
@@ -248,17 +527,153 @@ class NewsScraper:
             similar_items = [item]
             processed.add(i)
             
-            for j, other_item in enumerate(news_items):
-                if j != i and j not in processed:
-                    # Usar el nuevo método de clase para calcular la similitud combinada
-                    combined_sim = self.calculate_combined_similarity(item['title'], other_item['title'])
-                    
-                    if combined_sim > current_threshold:
-                        similar_items.append(other_item)
-                        processed.add(j)
+            # Todas las noticias aún sin grupo contra la semilla, en una sola llamada al backend
+            others = [j for j in range(len(news_items)) if j not in processed]
+            self.comparisons += len(others)
+            text_sims = ratios(features[i].normalized, [features[j].normalized for j in others], self.similarity_backend)
+            for j, text_sim in zip(others, text_sims):
+                combined_sim = (text_sim * 0.6) + (NewsScraper._keyword_similarity(features[i], features[j]) * 0.4)
+                
+                if combined_sim > current_threshold:
+                    similar_items.append(news_items[j])
+                    processed.add(j)
             
             if similar_items:
                 grouped_news.append(similar_items)
         
         print(f"Agrupadas {len(news_items)} noticias en {len(grouped_news)} grupos")
         return grouped_news
+
+    def _find_similar_news_lsh(self, news_items, threshold):
+        """
+        Mismo agrupado voraz que find_similar_news, pero cada noticia solo se puntúa contra los
+        candidatos que comparten algún bucket MinHash/LSH de palabras clave del título, en lugar
+        de contra todas las demás. La decisión sobre cada candidato es la misma que con
+        calculate_combined_similarity.
+        """
+        start_time = time.monotonic()
+        features = [self.features_for(item) for item in news_items]
+        candidates = self.lsh.candidate_neighbors_from_hashes(item_features.shingle_hashes for item_features in features)
+
+        grouped_news = []
+        processed = set()
+        comparisons = 0
+        for i, item in enumerate(news_items):
+            if i in processed:
+                continue
+            similar_items = [item]
+            processed.add(i)
+            # Los candidatos vienen ordenados: se respeta el orden de entrada como en el modo voraz
+            for j in candidates[i]:
+                if j in processed:
+                    continue
+                comparisons += 1
+                if self._combined_exceeds(features[i], features[j], threshold, self.similarity_backend):
+                    similar_items.append(news_items[j])
+                    processed.add(j)
+            grouped_news.append(similar_items)
+        self.comparisons += comparisons
+
+        print(f"Agrupadas {len(news_items)} noticias en {len(grouped_news)} grupos "
+              f"(LSH: {comparisons} comparaciones, {time.monotonic() - start_time:.2f}s)")
+        return grouped_news
+
+    def _find_similar_news_matrix(self, news_items, threshold):
+        """
+        Agrupado voraz (mismo orden que find_similar_news) sobre la matriz dispersa de similitudes
+        coseno del lote (TF-IDF o embeddings de título + resumen), calculada de una vez.
+        """
+        start_time = time.monotonic()
+        similarities = self._similarity_matrix(news_items, threshold)
+        if similarities is None:
+            print("Agrupando con LSH sobre títulos al no disponer de embeddings")
+            return self._find_similar_news_lsh(news_items, self.combined_similarity_threshold)
+        self.comparisons += max(0, similarities.nnz - len(news_items)) // 2
+
+        grouped_news = []
+        processed = set()
+        for i, item in enumerate(news_items):
+            if i in processed:
+                continue
+            similar_items = [item]
+            processed.add(i)
+            # Índices ordenados: solo los posteriores y aún sin grupo, como en el modo voraz
+            for j in similarities.indices[similarities.indptr[i]:similarities.indptr[i + 1]].tolist():
+                if j > i and j not in processed:
+                    similar_items.append(news_items[j])
+                    processed.add(j)
+            grouped_news.append(similar_items)
+
+        print(f"Agrupadas {len(news_items)} noticias en {len(grouped_news)} grupos "
+              f"({self.grouping_strategy}: {time.monotonic() - start_time:.2f}s)")
+        return grouped_news
+
+    def _similarity_matrix(self, news_items, threshold):
+        """Matriz CSR de similitudes > threshold para 'tfidf' o 'embeddings'; None si Ollama no responde"""
+        if self.grouping_strategy == 'tfidf':
+            return TfidfSimilarity.similarity_matrix(
+                self.tfidf.fit_transform(self._tfidf_texts(news_items)), min_similarity=threshold
+            )
+        texts = [
+            f"{item.get('title', '')} {item.get('summary', '')}" if self.embeddings_use_summary else item.get('title', '')
+            for item in news_items
+        ]
+        try:
+            vectors = self.embedder.embed(texts)
+        except Exception as e:
+            print(f"Error obteniendo embeddings de Ollama ({self.embedder.model}): {e}")
+            return None
+        return cosine_neighbors(vectors, threshold)
+
+    def _tfidf_texts(self, news_items):
+        return [
+            f"{item.get('title', '')} {item.get('summary', '')}" if self.tfidf_use_summary else item.get('title', '')
+            for item in news_items
+        ]
+
+    def _similarity_edges(self, news_items, threshold, strategy=None):
+        """Aristas (similitud, i, j) con i < j y similitud > threshold, con los pares que propone la estrategia"""
+        strategy = strategy or self.grouping_strategy
+        if strategy in ('tfidf', 'embeddings'):
+            similarities = self._similarity_matrix(news_items, threshold)
+            if similarities is None:
+                print("Agrupando con LSH sobre títulos al no disponer de embeddings")
+                return self._similarity_edges(news_items, self.combined_similarity_threshold, strategy='lsh')
+            similarities = similarities.tocoo()
+            self.comparisons += max(0, similarities.nnz - len(news_items)) // 2
+            return [
+                (score, i, j)
+                for i, j, score in zip(similarities.row.tolist(), similarities.col.tolist(), similarities.data.tolist())
+                if i < j
+            ]
+
+        features = [self.features_for(item) for item in news_items]
+        if strategy == 'lsh':
+            candidates = self.lsh.candidate_neighbors_from_hashes(item_features.shingle_hashes for item_features in features)
+            pairs = ((i, j) for i, neighbors in enumerate(candidates) for j in neighbors)
+        else:
+            pairs = ((i, j) for i in range(len(features)) for j in range(i + 1, len(features)))
+
+        edges = []
+        for i, j in pairs:
+            self.comparisons += 1
+            score = self._combined_score_above(features[i], features[j], threshold, self.similarity_backend)
+            if score is not None:
+                edges.append((score, i, j))
+        return edges
+
+    def _cluster_news(self, news_items, threshold):
+        """
+        Agrupado transitivo: une con union-find todas las parejas que superan el umbral, de modo
+        que A~B y B~C acaban en el mismo grupo aunque A y C no se parezcan tanto. Los grupos
+        salen en orden de entrada (por su primera noticia) y su composición no depende de ese orden.
+        """
+        start_time = time.monotonic()
+        edges = self._similarity_edges(news_items, threshold)
+        tie_keys = [(item.get('url') or '', item.get('title') or '') for item in news_items]
+        clusters = cluster_edges(len(news_items), edges, self.max_cluster_size, tie_keys)
+        grouped_news = [[news_items[index] for index in members] for members in clusters]
+
+        print(f"Agrupadas {len(news_items)} noticias en {len(grouped_news)} grupos "
+              f"(union-find sobre {len(edges)} aristas {self.grouping_strategy}, {time.monotonic() - start_time:.2f}s)")
+        return grouped_news
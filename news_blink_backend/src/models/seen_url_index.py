@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from .url_utils import normalize_url
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'seen_urls.json')
+
+
+class SeenUrlIndex:
+    """Índice persistente de URLs de artículos ya procesados (URL normalizada -> última vez vista).
+
+    Permite descartar noticias conocidas nada más extraerlas, antes de agrupar, descargar
+    el artículo o llamar a Ollama. Las entradas caducan tras ttl_days.
+    """
+
+    def __init__(self, path=None, ttl_days=7):
+        self.path = os.path.abspath(path or DEFAULT_INDEX_PATH)
+        self.ttl_seconds = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self._dirty = False
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error leyendo el índice de URLs vistas {self.path}: {e}")
+            return {}
+        now = time.time()
+        return {url: seen_at for url, seen_at in entries.items() if now - seen_at < self.ttl_seconds}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def contains(self, url):
+        """True si la URL (normalizada) se procesó dentro del periodo de caducidad"""
+        key = normalize_url(url)
+        with self._lock:
+            seen_at = self._entries.get(key)
+            if seen_at is None:
+                return False
+            if time.time() - seen_at >= self.ttl_seconds:
+                del self._entries[key]
+                self._dirty = True
+                return False
+            return True
+
+    def filter_unseen(self, news_items):
+        """Devuelve solo las noticias cuya URL no está en el índice"""
+        return [item for item in news_items if not item.get('url') or not self.contains(item['url'])]
+
+    def mark(self, urls):
+        """Registra las URLs como procesadas (renueva su fecha si ya estaban)"""
+        now = time.time()
+        with self._lock:
+            for url in urls:
+                if url:
+                    self._entries[normalize_url(url)] = now
+                    self._dirty = True
+
+    def save(self):
+        """Escribe el índice en disco (sin entradas caducadas) si ha cambiado"""
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            self._entries = {url: seen_at for url, seen_at in self._entries.items() if now - seen_at < self.ttl_seconds}
+            snapshot = dict(self._entries)
+            self._dirty = False
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error guardando el índice de URLs vistas {self.path}: {e}")
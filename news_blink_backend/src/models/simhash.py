@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from .time_utils import is_after
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def simhash(text, bits=64, shingle_size=3, min_tokens=40):
+    """
+    Huella SimHash (entero de bits bits) del texto a partir de sus n-gramas de palabras.
+    Textos casi iguales (p. ej. el mismo teletipo con otro titular o pie) dan huellas a poca
+    distancia de Hamming. Devuelve None si el texto tiene menos de min_tokens palabras.
+    """
+    words = _WORD_RE.findall((text or '').lower())
+    if len(words) < max(min_tokens, shingle_size):
+        return None
+    weights = [0] * bits
+    digest_size = (bits + 7) // 8
+    for start in range(len(words) - shingle_size + 1):
+        shingle = ' '.join(words[start:start + shingle_size])
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=digest_size).digest(), 'big')
+        for bit in range(bits):
+            weights[bit] += 1 if (value >> bit) & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """Índice persistente de huellas SimHash recientes -> ID del blink cuyas fuentes las produjeron.
+
+    Para encontrar huellas a distancia <= max_distance sin compararlas todas, cada huella se parte
+    en max_distance + 1 bloques de bits: dos huellas tan parecidas coinciden exactamente en al
+    menos un bloque, así que basta con comparar las que comparten alguno. En disco es un diario
+    JSON Lines como el de BlinkKeywordIndex; las huellas de más de retention_hours no se devuelven
+    en find y se descartan al cargarlo y cada 50 altas, compactando el diario si sobran líneas.
+    """
+
+    def __init__(self, path, max_distance=6, bits=64, retention_hours=24 * 7):
+        self.path = os.path.abspath(path)
+        self.max_distance = max_distance
+        self.bits = bits
+        self.retention_hours = retention_hours
+        blocks = max_distance + 1
+        edges = [bits * i // blocks for i in range(blocks + 1)]
+        self._masks = [(((1 << (end - start)) - 1) << start) for start, end in zip(edges, edges[1:])]
+        self._lock = threading.Lock()
+        self._entries = None
+        self._tables = []
+        self._adds_since_prune = 0
+
+    def _cutoff(self):
+        return datetime.now() - timedelta(hours=self.retention_hours) if self.retention_hours else None
+
+    def _ensure_loaded(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        self._tables = [{} for _ in self._masks]
+        if not os.path.exists(self.path):
+            return
+        cutoff = self._cutoff()
+        lines = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                        fingerprint = int(entry['simhash'], 16)
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    lines += 1
+                    if cutoff is not None and not is_after(entry.get('timestamp'), cutoff):
+                        continue
+                    self._apply(fingerprint, entry['id'], entry.get('timestamp'))
+        except OSError as e:
+            print(f"Error leyendo el índice SimHash {self.path}: {e}")
+        if lines > 2 * len(self._entries):
+            self._write_snapshot()
+
+    def _apply(self, fingerprint, blink_id, timestamp):
+        if fingerprint not in self._entries:
+            for table, mask in zip(self._tables, self._masks):
+                table.setdefault(fingerprint & mask, []).append(fingerprint)
+        self._entries[fingerprint] = (blink_id, timestamp)
+
+    def _prune_unlocked(self):
+        """Quita de memoria las huellas caducadas y reescribe el diario si había alguna"""
+        cutoff = self._cutoff()
+        if cutoff is None:
+            return
+        expired = {fingerprint for fingerprint, (_, timestamp) in self._entries.items()
+                   if not is_after(timestamp, cutoff)}
+        if not expired:
+            return
+        for fingerprint in expired:
+            del self._entries[fingerprint]
+        for table in self._tables:
+            for block in list(table):
+                kept = [fingerprint for fingerprint in table[block] if fingerprint not in expired]
+                if kept:
+                    table[block] = kept
+                else:
+                    del table[block]
+        self._write_snapshot()
+
+    def _write_snapshot(self):
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for fingerprint, (blink_id, timestamp) in self._entries.items():
+                    f.write(json.dumps({'id': blink_id, 'simhash': f"{fingerprint:x}", 'timestamp': timestamp}) + '\n')
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error guardando el índice SimHash {self.path}: {e}")
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+    def add(self, blink_id, fingerprints, timestamp=None):
+        """Registra las huellas (None se ignoran) de los textos de las fuentes de un blink"""
+        fingerprints = [fingerprint for fingerprint in fingerprints if fingerprint is not None]
+        if not fingerprints:
+            return
+        timestamp = timestamp or datetime.now().isoformat()
+        with self._lock:
+            self._ensure_loaded()
+            lines = []
+            for fingerprint in fingerprints:
+                if self._entries.get(fingerprint, (None,))[0] == blink_id:
+                    continue
+                self._apply(fingerprint, blink_id, timestamp)
+                lines.append(json.dumps({'id': blink_id, 'simhash': f"{fingerprint:x}", 'timestamp': timestamp}) + '\n')
+            if not lines:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.writelines(lines)
+            except OSError as e:
+                print(f"Error actualizando el índice SimHash {self.path}: {e}")
+            self._adds_since_prune += 1
+            if self._adds_since_prune >= 50:
+                self._adds_since_prune = 0
+                self._prune_unlocked()
+
+    def find(self, fingerprints, live_since=None):
+        """
+        Blink más cercano a alguna de las huellas, como diccionario con 'id', 'distance' y 'live'
+        (True si sus huellas se registraron después de live_since), o None si ninguno está a
+        max_distance o menos. Las huellas de más de retention_hours no cuentan.
+        """
+        best = None
+        cutoff = self._cutoff()
+        with self._lock:
+            self._ensure_loaded()
+            for fingerprint in fingerprints:
+                if fingerprint is None:
+                    continue
+                for table, mask in zip(self._tables, self._masks):
+                    for candidate in table.get(fingerprint & mask, ()):
+                        distance = hamming_distance(fingerprint, candidate)
+                        if distance > self.max_distance or (best is not None and distance >= best[0]):
+                            continue
+                        if cutoff is not None and not is_after(self._entries[candidate][1], cutoff):
+                            continue
+                        best = (distance, candidate)
+            if best is None:
+                return None
+            blink_id, timestamp = self._entries[best[1]]
+        return {
+            'id': blink_id,
+            'distance': best[0],
+            'live': live_since is not None and is_after(timestamp, live_since)
+        }
+
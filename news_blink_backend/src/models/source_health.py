@@ -0,0 +1,149 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_HEALTH_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'source_health.json')
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch).isoformat() if epoch else None
+
+
+class SourceHealthTracker:
+    """Estadísticas por fuente (latencia, tasa de error, artículos por ejecución) con circuit breaker.
+
+    Tras failure_threshold fallos seguidos (error o cero artículos) la fuente se deja de consultar
+    durante un enfriamiento que se duplica en cada nueva apertura, hasta max_cooldown_seconds.
+    Pasado el enfriamiento se permite un intento: si funciona el circuito se cierra y el
+    enfriamiento vuelve al valor base; si falla se reabre con el doble.
+    """
+
+    def __init__(self, path=None, failure_threshold=2, base_cooldown_seconds=7200,
+                 max_cooldown_seconds=172800, history_size=20):
+        self.path = os.path.abspath(path or DEFAULT_HEALTH_PATH)
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_cooldown_seconds = base_cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self._pending_errors = {}
+        self._sources = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error leyendo el estado de salud de fuentes {self.path}: {e}")
+            return {}
+
+    def _state_for(self, name):
+        return self._sources.setdefault(name, {
+            'consecutive_failures': 0,
+            'open_until': 0,
+            'cooldown_seconds': 0,
+            'last_error': None,
+            'last_success_at': None,
+            'history': []
+        })
+
+    def allow(self, name):
+        """True si la fuente se puede consultar ahora (circuito cerrado o enfriamiento vencido)"""
+        with self._lock:
+            state = self._sources.get(name)
+            return state is None or time.time() >= state.get('open_until', 0)
+
+    def note_error(self, name, message):
+        """Guarda el motivo del fallo de la ejecución en curso; se asocia a la fuente en record()"""
+        with self._lock:
+            self._pending_errors[name] = str(message)
+
+    def record(self, name, items, latency_seconds, error=None):
+        """Registra el resultado de extraer una fuente y actualiza el circuit breaker"""
+        now = time.time()
+        with self._lock:
+            state = self._state_for(name)
+            pending = self._pending_errors.pop(name, None)
+            # Un error intermedio (p. ej. el feed) no cuenta si la fuente acabó devolviendo artículos
+            if error is None and items == 0:
+                error = pending or 'sin artículos'
+
+            state['history'].append({
+                'at': now,
+                'ok': error is None,
+                'latency': round(latency_seconds, 3),
+                'items': items
+            })
+            del state['history'][:-self.history_size]
+
+            if error is None:
+                state['consecutive_failures'] = 0
+                state['open_until'] = 0
+                state['cooldown_seconds'] = 0
+                state['last_success_at'] = now
+                return
+
+            state['last_error'] = error
+            state['consecutive_failures'] += 1
+            was_open = state['cooldown_seconds'] > 0
+            if was_open or state['consecutive_failures'] >= self.failure_threshold:
+                # Reapertura tras el intento de prueba: el enfriamiento se duplica
+                cooldown = state['cooldown_seconds'] * 2 if was_open else self.base_cooldown_seconds
+                state['cooldown_seconds'] = min(cooldown, self.max_cooldown_seconds)
+                state['open_until'] = now + state['cooldown_seconds']
+                print(f"Fuente {name} desactivada durante {state['cooldown_seconds'] / 60:.0f} min "
+                      f"tras {state['consecutive_failures']} fallos seguidos ({error})")
+
+    def save(self):
+        """Persiste el estado para que los enfriamientos sobrevivan a un reinicio"""
+        with self._lock:
+            snapshot = json.loads(json.dumps(self._sources))
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error guardando el estado de salud de fuentes {self.path}: {e}")
+
+    def stats(self):
+        """Resumen por fuente para monitorización"""
+        now = time.time()
+        result = {}
+        with self._lock:
+            for name, state in self._sources.items():
+                history = state['history']
+                runs = len(history)
+                failures = sum(1 for run in history if not run['ok'])
+                if state['open_until'] > now:
+                    circuit = STATE_OPEN
+                elif state['cooldown_seconds']:
+                    circuit = STATE_HALF_OPEN
+                else:
+                    circuit = STATE_CLOSED
+                result[name] = {
+                    'state': circuit,
+                    'runs': runs,
+                    'error_rate': round(failures / runs, 3) if runs else 0.0,
+                    'avg_latency_seconds': round(sum(run['latency'] for run in history) / runs, 3) if runs else None,
+                    'last_latency_seconds': history[-1]['latency'] if history else None,
+                    'avg_items': round(sum(run['items'] for run in history) / runs, 2) if runs else None,
+                    'last_items': history[-1]['items'] if history else None,
+                    'consecutive_failures': state['consecutive_failures'],
+                    'cooldown_seconds': state['cooldown_seconds'],
+                    'open_until': _iso(state['open_until']) if state['open_until'] > now else None,
+                    'last_error': state['last_error'],
+                    'last_success_at': _iso(state['last_success_at'])
+                }
+        return result
@@ -0,0 +1,97 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class StageGraph:
+    """
+    Grafo de dependencias entre etapas (funciones) de un mismo trabajo.
+
+    Cada etapa recibe como argumentos, en orden, los resultados de las etapas de las que depende.
+    run() lanza a la vez las que no dependen de nada y cada una de las demás en cuanto terminan
+    sus dependencias, de modo que el tiempo total es el del camino crítico y no la suma de todas.
+    Las dependencias deben añadirse antes que la etapa que las usa, así que no puede haber ciclos.
+    """
+
+    def __init__(self, max_workers=None, thread_name_prefix='stage'):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._stages = {}
+        # Tras run(): nombre -> (inicio relativo, segundos) de cada etapa y tiempo total
+        self.timings = {}
+        self.wall_seconds = 0.0
+
+    def add(self, name, func, depends_on=()):
+        if name in self._stages:
+            raise ValueError(f"La etapa '{name}' ya existe")
+        missing = [dependency for dependency in depends_on if dependency not in self._stages]
+        if missing:
+            raise ValueError(f"La etapa '{name}' depende de etapas no definidas: {missing}")
+        self._stages[name] = (func, tuple(depends_on))
+        return self
+
+    def _run_stage(self, name, results, origin):
+        func, depends_on = self._stages[name]
+        start = time.monotonic()
+        try:
+            return func(*(results[dependency] for dependency in depends_on))
+        finally:
+            self.timings[name] = (start - origin, time.monotonic() - start)
+
+    def run(self):
+        """
+        Ejecuta todas las etapas y devuelve un diccionario nombre -> resultado. Si una etapa lanza
+        una excepción no se inician más etapas y se propaga tras esperar a las que ya estaban en marcha.
+        Con max_workers=1 se ejecutan en el hilo actual, en el orden en que se añadieron.
+        """
+        results = {}
+        self.timings = {}
+        origin = time.monotonic()
+        workers = min(self.max_workers or len(self._stages), len(self._stages))
+        try:
+            if workers <= 1:
+                for name in self._stages:
+                    results[name] = self._run_stage(name, results, origin)
+                return results
+
+            pending = dict(self._stages)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=self.thread_name_prefix) as executor:
+                running = {}
+                while pending or running:
+                    ready = [name for name, (_, depends_on) in pending.items()
+                             if all(dependency in results for dependency in depends_on)]
+                    for name in ready:
+                        del pending[name]
+                        running[executor.submit(self._run_stage, name, results, origin)] = name
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        if future.exception() is not None:
+                            # Las etapas en curso terminan al salir del executor; no se lanzan más
+                            pending.clear()
+                            for other in running:
+                                other.cancel()
+                            raise future.exception()
+                        results[name] = future.result()
+            return results
+        finally:
+            self.wall_seconds = time.monotonic() - origin
+
+    def critical_path(self):
+        """Cadena de etapas (nombres) de la última ejecución cuya suma de tiempos es mayor, y esa suma"""
+        best = {}
+        for name, (_, depends_on) in self._stages.items():
+            if name not in self.timings:
+                continue
+            previous = max((best[dependency] for dependency in depends_on if dependency in best),
+                           key=lambda path: path[1], default=((), 0.0))
+            best[name] = (previous[0] + (name,), previous[1] + self.timings[name][1])
+        path, seconds = max(best.values(), key=lambda path: path[1], default=((), 0.0))
+        return list(path), seconds
+
+    def summary(self):
+        """Texto con la duración de cada etapa, el camino crítico y el tiempo total de la última ejecución"""
+        stages = ', '.join(f"{name} {seconds:.1f}s" for name, (_, seconds) in self.timings.items())
+        path, seconds = self.critical_path()
+        serial = sum(seconds for _, seconds in self.timings.values())
+        return (f"{stages} | camino crítico {' -> '.join(path)} {seconds:.1f}s | "
+                f"total {self.wall_seconds:.1f}s (en serie {serial:.1f}s)")
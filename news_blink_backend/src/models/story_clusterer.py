@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+
+class OnlineStoryClusterer:
+    """Asigna cada noticia nueva a una historia ya publicada o la deja para un grupo nuevo.
+
+    La firma de cada historia son los títulos de su blink y de las noticias que se le han ido
+    añadiendo (en el índice de palabras clave de News), así que el trabajo por ejecución depende
+    solo de las noticias nuevas y de los blinks que comparten palabras clave con ellas.
+    Si el blink más parecido es reciente (live_hours) la noticia se le añade como fuente; si es
+    antiguo se descarta como duplicado, como hasta ahora.
+
+    Con body_index (un SimHashIndex) se detectan además, ya con el texto de los artículos
+    descargado y antes de llamar a la IA, los grupos cuyo contenido es casi idéntico al de las
+    fuentes de un blink (el mismo teletipo con otro titular), que el título no delata.
+    """
+
+    def __init__(self, news_model, scraper, live_hours=48, body_index=None, max_candidates=30):
+        self.news_model = news_model
+        self.scraper = scraper
+        self.live_hours = live_hours
+        self.body_index = body_index
+        # Blinks puntuados por noticia: los que más palabras clave comparten con ella. Sin límite, con
+        # miles de blinks indexados cada noticia comparte alguna palabra con cientos de ellos
+        self.max_candidates = max_candidates
+
+    def _live_since(self):
+        return datetime.now() - timedelta(hours=self.live_hours) if self.live_hours else None
+
+    def best_match(self, item, live_since):
+        """(similitud, candidato) del blink más parecido por encima del umbral, o None"""
+        features = self.scraper.features_for(item)
+        threshold = self.scraper.similarity_threshold
+        candidates = self.news_model.find_duplicate_candidates(features, live_since, self.max_candidates)
+        # Todos los títulos de todas las historias candidatas en una sola llamada al scraper
+        owners = [candidate for candidate in candidates for _ in candidate['members']]
+        members = [member for candidate in candidates for member in candidate['members']]
+        best = None
+        for score, candidate in zip(self.scraper.scores_above(features, members, threshold), owners):
+            if score is not None and (best is None or score > best[0]):
+                best = (score, candidate)
+        return best
+
+    def assign(self, news_items):
+        """
+        Reparte las noticias en (attached, duplicates, fresh): attached es blink_id -> noticias de
+        su historia, duplicates las que repiten un blink ya no vigente y fresh las que no coinciden
+        con ningún blink y deben agruparse y generarse.
+        """
+        live_since = self._live_since()
+        attached, duplicates, fresh = {}, [], []
+        for item in news_items:
+            match = self.best_match(item, live_since)
+            if match is None:
+                fresh.append(item)
+                continue
+            score, candidate = match
+            if candidate['live']:
+                attached.setdefault(candidate['id'], []).append(item)
+            else:
+                print(f"Duplicate detected: New item '{item.get('title')}' is too similar to existing blink "
+                      f"'{candidate['title']}' (Score: {score}). Skipping.")
+                duplicates.append(item)
+        if attached:
+            print(f"{sum(len(items) for items in attached.values())} noticias pertenecen a {len(attached)} historias ya publicadas")
+        return attached, duplicates, fresh
+
+    def attach(self, attached):
+        """
+        Añade a cada blink las fuentes y URLs de sus noticias nuevas. Devuelve (URLs añadidas, IDs de
+        los blinks que no se pudieron leer); las noticias de estos últimos no se han añadido a nada.
+        """
+        added_urls, failed = 0, []
+        for blink_id, items in attached.items():
+            added = self.news_model.attach_to_blink(blink_id, items)
+            if added is None:
+                failed.append(blink_id)
+            else:
+                added_urls += added
+        return added_urls, failed
+
+    def resolve_body_duplicate(self, news_group, fingerprints):
+        """
+        Si las huellas SimHash del contenido del grupo coinciden con las de un blink guardado, añade
+        el grupo a ese blink (si es reciente) o lo descarta, y devuelve el ID del blink; si no, None.
+        """
+        if self.body_index is None:
+            return None
+        match = self.body_index.find(fingerprints, self._live_since())
+        if match is None:
+            return None
+        if match['live']:
+            added = self.news_model.attach_to_blink(match['id'], news_group)
+            if added is None:
+                return None
+            print(f"Contenido casi idéntico (distancia {match['distance']}) al blink {match['id']}: "
+                  f"añadidas {added} URLs sin generar un blink nuevo")
+        else:
+            print(f"Duplicate detected: contenido casi idéntico (distancia {match['distance']}) al blink "
+                  f"{match['id']}. Skipping.")
+        return match['id']
+
+    def remember_bodies(self, blink_id, fingerprints, timestamp=None):
+        """Registra las huellas del contenido de las fuentes de un blink recién guardado"""
+        if self.body_index is not None:
+            self.body_index.add(blink_id, fingerprints, timestamp)
@@ -0,0 +1,47 @@
+from difflib import SequenceMatcher
+
+import numpy as np
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # rapidfuzz es opcional: sin él se usa difflib
+    fuzz = None
+    process = None
+
+SIMILARITY_BACKENDS = ('rapidfuzz', 'difflib')
+DEFAULT_SIMILARITY_BACKEND = 'rapidfuzz' if fuzz is not None else 'difflib'
+
+_warned_missing_rapidfuzz = False
+
+
+def resolve_similarity_backend(name):
+    """Devuelve el backend utilizable: 'rapidfuzz' si está instalado y se pidió, si no 'difflib'"""
+    global _warned_missing_rapidfuzz
+    if name == 'rapidfuzz' and fuzz is None:
+        if not _warned_missing_rapidfuzz:
+            print("Advertencia: rapidfuzz no está instalado; se usa difflib para comparar títulos")
+            _warned_missing_rapidfuzz = True
+        return 'difflib'
+    return name if name in SIMILARITY_BACKENDS else DEFAULT_SIMILARITY_BACKEND
+
+
+def ratio(a, b, backend=DEFAULT_SIMILARITY_BACKEND, score_cutoff=0.0):
+    """
+    Similitud entre 0 y 1 de dos cadenas: 2 * caracteres coincidentes / longitud total, como
+    SequenceMatcher.ratio. Con 'rapidfuzz' los coincidentes son los de la subsecuencia común más
+    larga (distancia Indel, calculada en C); con 'difflib' los de los bloques de SequenceMatcher,
+    que dan lo mismo o algo menos. Con rapidfuzz devuelve 0.0 si queda por debajo de score_cutoff.
+    """
+    if backend == 'rapidfuzz':
+        return fuzz.ratio(a, b, score_cutoff=score_cutoff * 100) / 100
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def ratios(query, choices, backend=DEFAULT_SIMILARITY_BACKEND, score_cutoff=0.0):
+    """Lista de ratio(query, choice) para cada una de choices, con rapidfuzz en una sola llamada"""
+    if not choices:
+        return []
+    if backend == 'rapidfuzz':
+        scores = process.cdist([query], choices, scorer=fuzz.ratio, score_cutoff=score_cutoff * 100, dtype=np.float64)
+        return (scores[0] / 100).tolist()
+    return [SequenceMatcher(None, query, choice).ratio() for choice in choices]
@@ -7,18 +7,25 @@ import hashlib
 import os
 import json
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
 import re
 from string import Template
 # from models.image_generator import ImageGenerator # <-- LÍNEA COMENTADA
 import ollama
 
+from .http_fetcher import get_shared_fetcher
+from .llm_cache import cached_chat, get_shared_llm_cache
+from .html_extractor import DEFAULT_PARSER_BACKEND, extract_article
+
 class SuperiorNoteGenerator:
     """Clase para generar notas superiores a partir de múltiples fuentes sobre el mismo tema"""
 
-    def __init__(self):
-        """Inicializa el generador de notas superiores"""
+    def __init__(self, app_config=None, fetcher=None, llm_cache=None):
+        """Inicializa el generador de notas superiores con la configuración de la app (config.json)"""
+        # Cliente HTTP inyectable; por defecto el compartido (conexiones keep-alive)
+        self._fetcher = fetcher
+        # Caché de respuestas de Ollama inyectable; por defecto la compartida (si está configurada)
+        self._llm_cache = llm_cache
+
         # Descargar recursos de NLTK necesarios
         try:
             nltk.data.find('tokenizers/punkt')
@@ -38,22 +45,24 @@ class SuperiorNoteGenerator:
         self.ollama_client = ollama.Client(host=ollama_base_url)
         self.ollama_model = 'qwen3:32b'  # Modelo por defecto
 
-        # Cargar configuraciones de IA desde config.json
-        self.ai_configs = {}
-        try:
-            config_path = os.path.join(os.path.dirname(__file__), '..', 'config.json')
-            with open(config_path, 'r', encoding='utf-8') as f:
-                loaded_configs = json.load(f)
-                if 'ai_task_configs' in loaded_configs:
-                    self.ai_configs = loaded_configs['ai_task_configs']
-                else:
-                    print("Advertencia: 'ai_task_configs' no encontrado en config.json")
-        except FileNotFoundError:
-            print(f"Advertencia: config.json no encontrado en {config_path}")
-        except json.JSONDecodeError:
-            print(f"Advertencia: Error decodificando config.json en {config_path}")
+        self.app_config = app_config if app_config is not None else {}
+        # Backend de parseo HTML ('lxml' en una sola pasada o 'html.parser' con BeautifulSoup)
+        self.html_parser = self.app_config.get('html_parser', DEFAULT_PARSER_BACKEND)
+        # Configuraciones de IA por tarea (prompts, modelo, temperatura)
+        self.ai_configs = self.app_config.get('ai_task_configs', {})
+        if app_config is not None and not self.ai_configs:
+            print("Advertencia: 'ai_task_configs' no encontrado en la configuración")
 
 
+    @property
+    def llm_cache(self):
+        # Una caché vacía es falsa (__len__): se compara con None
+        return self._llm_cache if self._llm_cache is not None else get_shared_llm_cache()
+
+    def _ollama_chat(self, **kwargs):
+        """ollama_client.chat a través de la caché de respuestas"""
+        return cached_chat(self.ollama_client, self.llm_cache, **kwargs)
+
     def generate_superior_note(self, articles_group, topic):
         """
         Genera una nota superior a partir de múltiples artículos sobre el mismo tema
@@ -143,57 +152,17 @@ class SuperiorNoteGenerator:
     def _get_article_content(self, url):
         """Obtiene el contenido completo de un artículo"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Remover elementos no deseados
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'advertisement']):
-                element.decompose()
-
-            # Buscar el contenido principal del artículo
-            content_selectors = [
-                'article',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                '.content',
-                'main',
-                '.story-body',
-                '.article-body'
-            ]
-
-            content = ""
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content = content_elem.get_text(separator=' ', strip=True)
-                    break
-
-            if not content:
-                content = soup.get_text(separator=' ', strip=True)
-
-            content = re.sub(r'\s+', ' ', content)
-            content = content[:10000]
-
-            image_url = None
-            img_selectors = ['meta[property="og:image"]', '.article-image img', 'article img', '.featured-image img']
-            for selector in img_selectors:
-                img_elem = soup.select_one(selector)
-                if img_elem:
-                    image_url = img_elem.get('content') or img_elem.get('src')
-                    if image_url and image_url.startswith('http'):
-                        break
-
-            return {
-                'content': content,
-                'image_url': image_url
-            }
+            fetcher = self._fetcher or get_shared_fetcher()
+            result = fetcher.fetch(url)
+            if result.not_modified:
+                cached = fetcher.get_extracted(url, 'superior_note_article')
+                if cached is not None:
+                    return cached
+
+            article_data = extract_article(result.text, url, backend=self.html_parser, min_paragraph_chars=30)
+            article_data['content'] = re.sub(r'\s+', ' ', article_data['content'])[:10000]
+            fetcher.store_extracted(url, 'superior_note_article', article_data)
+            return article_data
 
         except Exception as e:
             print(f"Error obteniendo contenido de {url}: {e}")
@@ -241,7 +210,7 @@ Contexto de las fuentes:
 
 NOTA SUPERIOR (solo texto, sin formato Markdown):"""
 
-            response = self.ollama_client.chat(model=self.ollama_model, messages=[
+            response = self._ollama_chat(model=self.ollama_model, messages=[
                 {
                     'role': 'user',
                     'content': prompt
@@ -280,7 +249,7 @@ NOTA SUPERIOR (solo texto, sin formato Markdown):"""
             print(f"Enviando a OLLAMA para formateo Markdown (modelo: {model_name}, temp: {temperature}):\n{formatted_prompt[:300]}...")
 
 
-            response = self.ollama_client.chat(
+            response = self._ollama_chat(
                 model=model_name,
                 messages=[{'role': 'user', 'content': formatted_prompt}],
                 options={'temperature': temperature}
@@ -436,7 +405,7 @@ Responde ÚNICAMENTE con los 5 bullets en este formato:
 • [Bullet 4]
 • [Bullet 5]"""
 
-            response = self.ollama_client.chat(model=self.ollama_model, messages=[
+            response = self._ollama_chat(model=self.ollama_model, messages=[
                 {
                     'role': 'user',
                     'content': prompt
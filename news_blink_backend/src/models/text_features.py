@@ -0,0 +1,43 @@
+import re
+import zlib
+
+# Palabras comunes a ignorar
+STOP_WORDS = frozenset({
+    'el', 'la', 'los', 'las', 'un', 'una', 'de', 'del', 'en', 'con', 'por', 'para', 'que', 'se', 'es', 'y', 'o',
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are'
+})
+
+_WORD_RE = re.compile(r'\b\w+\b')
+
+
+def extract_keywords(title):
+    """Extrae palabras clave de un título"""
+    words = _WORD_RE.findall(title.lower())
+    return [word for word in words if len(word) > 2 and word not in STOP_WORDS]
+
+
+def shingle_hash(shingle):
+    """Hash de 32 bits estable entre procesos de un shingle (lo usan las firmas MinHash)"""
+    return zlib.crc32(shingle.encode('utf-8'))
+
+
+class TitleFeatures:
+    """Rasgos de un título calculados una sola vez: texto en minúsculas, palabras clave y sus hashes.
+
+    Las funciones de similitud los aceptan en lugar del título para no repetir en cada par
+    la normalización ni la extracción de palabras clave.
+    """
+
+    __slots__ = ('title', 'normalized', 'keywords', 'shingle_hashes')
+
+    def __init__(self, title):
+        title = title or ''
+        self.title = title
+        self.normalized = title.lower()
+        self.keywords = frozenset(extract_keywords(title))
+        self.shingle_hashes = tuple(shingle_hash(keyword) for keyword in self.keywords)
+
+
+def title_features(value):
+    """Devuelve value si ya es un TitleFeatures; si es un título calcula sus rasgos"""
+    return value if isinstance(value, TitleFeatures) else TitleFeatures(value)
@@ -0,0 +1,119 @@
+import math
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Vectores de textos sueltos guardados para el lote actual (se vacía al llenarse)
+_MAX_CACHED_VECTORS = 50000
+
+
+class TfidfSimilarity:
+    """Matriz TF-IDF dispersa (filas normalizadas L2) de un lote de textos y similitud coseno en bloque.
+
+    El vocabulario y los IDF se ajustan una vez por lote en fit_transform. Para comparar textos
+    sueltos (p. ej. un titular nuevo contra los de blinks ya guardados), similarities() y
+    similarity() solo vectorizan esos textos con los IDF del último lote (cada texto una vez por
+    lote), así que sus puntuaciones son comparables entre llamadas; antes del primer lote los IDF
+    se ajustan a los propios textos comparados.
+    """
+
+    def __init__(self, tokenizer, sublinear_tf=True):
+        self.tokenizer = tokenizer
+        self.sublinear_tf = sublinear_tf
+        self.vocabulary = {}
+        self.idf = np.zeros(0)
+        self.document_count = 0
+        # (vocabulario, IDF como lista, texto -> vector disperso) del último lote; se sustituye entero
+        self._fitted = None
+
+    def fit_transform(self, texts):
+        """Ajusta vocabulario e IDF al lote y devuelve su matriz TF-IDF (n_textos x n_términos)"""
+        vocabulary = {}
+        counts = self._counts(texts, vocabulary, grow=True)
+        n = counts.shape[0]
+        document_frequency = np.bincount(counts.indices, minlength=len(vocabulary))
+        # IDF suavizado: como si hubiera un documento extra con todos los términos
+        idf = np.log((1.0 + n) / (1.0 + document_frequency)) + 1.0
+        self.vocabulary, self.idf, self.document_count = vocabulary, idf, n
+        self._fitted = (vocabulary, idf.tolist(), {})
+        return self._weight(counts, idf)
+
+    def transform(self, texts):
+        """Matriz TF-IDF de los textos con el vocabulario y los IDF del último lote (se ignoran los términos nuevos)"""
+        return self._weight(self._counts(texts, self.vocabulary, grow=False), self.idf)
+
+    def _counts(self, texts, vocabulary, grow):
+        """Matriz de frecuencias de términos; con grow los términos nuevos se añaden al vocabulario"""
+        indptr = [0]
+        indices = []
+        counts = []
+        for text in texts:
+            for term, count in Counter(self.tokenizer(text or '')).items():
+                index = vocabulary.setdefault(term, len(vocabulary)) if grow else vocabulary.get(term)
+                if index is not None:
+                    indices.append(index)
+                    counts.append(count)
+            indptr.append(len(indices))
+        return csr_matrix(
+            (np.array(counts, dtype=np.float64), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+            shape=(len(indptr) - 1, len(vocabulary))
+        )
+
+    def _weight(self, matrix, idf):
+        """Aplica TF sublineal e IDF a la matriz de frecuencias y normaliza sus filas"""
+        if self.sublinear_tf and matrix.nnz:
+            matrix.data = 1.0 + np.log(matrix.data)
+        matrix.data *= idf[matrix.indices]
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix.data /= np.repeat(norms, np.diff(matrix.indptr))
+        return matrix
+
+    @staticmethod
+    def similarity_matrix(matrix, min_similarity=0.0):
+        """Similitud coseno de todas las filas entre sí en una sola multiplicación dispersa.
+
+        Se descartan los valores <= min_similarity para que el resultado siga siendo disperso.
+        """
+        similarities = (matrix @ matrix.T).tocsr()
+        if min_similarity > 0:
+            similarities.data[similarities.data <= min_similarity] = 0
+            similarities.eliminate_zeros()
+        similarities.sort_indices()
+        return similarities
+
+    def _vector(self, text, fitted):
+        """Vector TF-IDF normalizado del texto como diccionario índice de término -> peso"""
+        vocabulary, idf, vectors = fitted
+        vector = vectors.get(text)
+        if vector is None:
+            weights = {}
+            for term, count in Counter(self.tokenizer(text or '')).items():
+                index = vocabulary.get(term)
+                if index is not None:
+                    weights[index] = (1.0 + math.log(count) if self.sublinear_tf else count) * idf[index]
+            norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+            vector = {index: weight / norm for index, weight in weights.items()} if norm else {}
+            if len(vectors) >= _MAX_CACHED_VECTORS:
+                vectors.clear()
+            vectors[text] = vector
+        return vector
+
+    def similarities(self, query, choices):
+        """Similitud coseno de query con cada uno de choices, con los IDF del último lote"""
+        if not choices:
+            return []
+        fitted = self._fitted
+        if fitted is None:
+            matrix = TfidfSimilarity(self.tokenizer, self.sublinear_tf).fit_transform([query] + list(choices))
+            return (matrix[1:] @ matrix[0].T).toarray().ravel().tolist()
+        query_vector = self._vector(query, fitted)
+        return [
+            sum(weight * query_vector.get(index, 0.0) for index, weight in self._vector(choice, fitted).items())
+            for choice in choices
+        ]
+
+    def similarity(self, text_a, text_b):
+        """Similitud coseno entre dos textos, con los IDF del último lote"""
+        return self.similarities(text_a, [text_b])[0]
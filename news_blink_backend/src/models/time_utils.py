@@ -0,0 +1,15 @@
+from datetime import datetime
+
+
+def is_after(timestamp, moment):
+    """True si el timestamp ISO (de un blink o una huella) es posterior a moment (sin fecha o ilegible: False)"""
+    if not timestamp:
+        return False
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return False
+    if parsed.tzinfo is not None:
+        # Los blinks guardan hora local sin zona; se comparan en hora local
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed >= moment
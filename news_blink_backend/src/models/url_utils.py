@@ -0,0 +1,33 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Parámetros de seguimiento que no cambian el contenido de la página
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'ocid', 'cmpid',
+    'ref', 'ref_src', 'igshid', 'smid', 'sr_share', 'outputtype'
+}
+TRACKING_PREFIXES = ('utm_', 'at_')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """Normaliza una URL para usarla como clave: esquema y host en minúsculas, sin puerto
+    por defecto, sin fragmento, sin parámetros de seguimiento, query ordenada y sin barra final."""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
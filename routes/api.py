@@ -12,8 +12,12 @@ import logging # Added for dedicated logger
 # SequenceMatcher import removed as it's no longer directly used here
 
 from models.scraper import NewsScraper
+from models.http_fetcher import configure_shared_fetcher
+from models.llm_cache import configure_shared_llm_cache, get_shared_llm_cache
 from models.blink_generator import BlinkGenerator
 from models.news import News
+from models.simhash import SimHashIndex, hamming_distance
+from models.story_clusterer import OnlineStoryClusterer
 
 # Crear blueprint para las rutas de la API
 api_bp = Blueprint('api', __name__)
@@ -42,6 +46,7 @@ os.makedirs(DATA_DIR, exist_ok=True)
 news_model = News(DATA_DIR)
 # Scraper será inicializado en init_api para acceder a la configuración de la app
 scraper = None
+story_clusterer = None
 blink_generator = BlinkGenerator()
 
 # Removed duplicated similarity function
@@ -394,6 +399,24 @@ def vote(): # This is the original /vote endpoint
     
     return jsonify({'success': True, 'message': f'Voto {vote_type} registrado para el artículo {article_id}'})
 
+@api_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """API para monitorizar las cachés del pipeline de noticias"""
+    content_cache = blink_generator.content_cache if blink_generator else None
+    llm_cache = get_shared_llm_cache()
+    return jsonify({
+        'article_content': content_cache.stats() if content_cache else {'enabled': False},
+        'llm_responses': llm_cache.stats() if llm_cache else {'enabled': False}
+    })
+
+@api_bp.route('/sources/health', methods=['GET'])
+def sources_health():
+    """API para consultar latencia, tasa de error y estado del circuit breaker de cada fuente"""
+    health = scraper.health if scraper else None
+    if health is None:
+        return jsonify({'enabled': False, 'sources': {}})
+    return jsonify({'enabled': True, 'sources': health.stats()})
+
 @api_bp.route('/health', methods=['GET'])
 def health_check():
     """API para verificar el estado del servicio"""
@@ -425,41 +448,31 @@ def collect_and_process_news(app):
                 # Guardar noticias crudas
                 news_model.save_raw_news(news_items)
 
-                # Agrupar noticias similares
-                grouped_news = scraper.find_similar_news(news_items)
-
-                # Obtener blinks existentes para la comprobación de duplicados
-                existing_blinks = news_model.get_all_blinks()
-                newly_processed_groups = []
-
-                for group in grouped_news:
-                    if not group:  # Skip empty groups
-                        continue
-
-                    representative_item = group[0] # Use the first item as representative
-                    is_duplicate = False
-                    for existing_blink in existing_blinks:
-                        if 'title' in existing_blink and 'title' in representative_item:
-                            # Use the new method from the scraper instance
-                            sim_score = scraper.calculate_combined_similarity(representative_item['title'], existing_blink['title'])
+                # Las noticias de historias ya publicadas se añaden a su blink (si es reciente) o se
+                # descartan como duplicadas; solo las demás se agrupan y pasan a la generación
+                attached, duplicates, fresh_items = story_clusterer.assign(news_items)
+                if attached:
+                    added_urls, failed_blink_ids = story_clusterer.attach(attached)
+                    print(f"Añadidas {added_urls} URLs nuevas a blinks existentes")
+                    # Si el blink ya no se puede leer, sus noticias se agrupan y generan como nuevas
+                    for blink_id in failed_blink_ids:
+                        fresh_items.extend(attached.pop(blink_id))
+                if scraper.seen_index is not None:
+                    scraper.seen_index.mark(item.get('url') for items in attached.values() for item in items)
+                    scraper.seen_index.mark(item.get('url') for item in duplicates)
 
-                            if sim_score > scraper.similarity_threshold: # Accessing scraper instance's threshold
-                                is_duplicate = True
-                                print(f"Duplicate detected: New item '{representative_item['title']}' is too similar to existing blink '{existing_blink['title']}' (Score: {sim_score}). Skipping.")
-                                break
-
-                    if not is_duplicate:
-                        newly_processed_groups.append(group)
+                # Agrupar noticias similares
+                grouped_news = scraper.find_similar_news(fresh_items)
+                newly_processed_groups = [group for group in grouped_news if group]
 
                 # Generar BLINKs para cada grupo no duplicado
                 successful_blinks = 0
                 processed_in_this_run_ids = set() # Initialize set for this run
 
-                for i, group in enumerate(newly_processed_groups): # Iterate over non-duplicate groups
-                    # --- Start: In-run duplicate check based on group data (early check) ---
-                    if not group: # Should have been caught earlier, but good to double check
-                        continue
-
+                # --- Start: Tentative ID for the in-run duplicate check based on group data ---
+                pending_groups = []
+                tentative_group_ids = set()
+                for i, group in enumerate(newly_processed_groups):
                     # Use first item of the group for tentative ID
                     first_item_in_group = group[0]
                     tentative_id_source_str = first_item_in_group.get('url', '') # Prioritize URL
@@ -471,20 +484,51 @@ def collect_and_process_news(app):
                         continue
 
                     tentative_group_id = hashlib.md5(tentative_id_source_str.encode()).hexdigest()
-
-                    if tentative_group_id in processed_in_this_run_ids:
+                    if tentative_group_id in tentative_group_ids:
                         print(f"SKIPPING group {i+1} (tentative_id: {tentative_group_id}) as similar content was already processed in this run.")
                         continue
-                    # --- End: In-run duplicate check based on group data ---
+                    pending_groups.append(group)
+                    tentative_group_ids.add(tentative_group_id)
+                # --- End: Tentative ID for the in-run duplicate check ---
+
+                # Huellas de los grupos ya admitidos en esta ejecución: sus blinks aún no están en el índice
+                admitted_fingerprints = []
+
+                def skip_body_duplicate(group, group_content):
+                    # Si el contenido repite el de un blink ya guardado, se añade a él y no se genera
+                    fingerprints = [fingerprint for fingerprint in group_content['fingerprints'] if fingerprint is not None]
+                    if story_clusterer.resolve_body_duplicate(group, fingerprints):
+                        if scraper.seen_index is not None:
+                            scraper.seen_index.mark(item.get('url') for item in group)
+                        return True
+                    # Mismo teletipo que otro grupo de esta ejecución: sin marcarlo como visto, para que en
+                    # la siguiente se añada al blink de aquel si llega a guardarse
+                    if blink_generator.simhash_enabled and any(
+                            hamming_distance(fingerprint, other) <= blink_generator.simhash_max_distance
+                            for fingerprint in fingerprints for other in admitted_fingerprints):
+                        print(f"SKIPPING group '{group[0].get('title', 'N/A')}': su contenido repite el de otro grupo de esta ejecución.")
+                        return True
+                    admitted_fingerprints.extend(fingerprints)
+                    return False
+
+                print(f"Generando {len(pending_groups)} BLINKs con hasta {blink_generator.generation_max_workers} grupos en paralelo...")
+                # Los grupos se generan en paralelo (descarga + IA); cada blink se guarda aquí en cuanto termina
+                for i, group, group_content, blink, error in blink_generator.generate_blinks(pending_groups, skip_body_duplicate):
+                    if error is not None:
+                        print(f"DEBUG_API_ROUTE: Error EXCEPCIÓN al procesar grupo de noticias {i+1} (Título tentativo: {group[0].get('title', 'N/A')}): {error}")
+                        continue
+                    if blink is None: # Contenido repetido de un blink ya guardado
+                        continue
 
                     try: # This is the inner try for individual group processing
-                        print(f"Procesando grupo {i+1}/{len(newly_processed_groups)} con {len(group)} noticias...")
-                        blink = blink_generator.generate_blink_from_news_group(group) # AI calls are here
-
+                        print(f"Procesando grupo {i+1}/{len(pending_groups)} con {len(group)} noticias...")
                         determined_category = blink.get('categories', ["general"])[0]
 
                         if determined_category not in allowed_publish_categories:
                             print(f"DEBUG_API_ROUTE: SKIPPING por CATEGORÍA: Blink '{blink.get('title', 'N/A')}' con categoría '{determined_category}' no está en allowed_publish_categories {allowed_publish_categories}.")
+                            # La categoría no cambiará en la próxima ejecución: no volver a generar este grupo
+                            if scraper.seen_index is not None:
+                                scraper.seen_index.mark(item.get('url') for item in group)
                             continue
                         else:
                             # This else block is for clarity; the actual saving logic follows.
@@ -517,9 +561,8 @@ def collect_and_process_news(app):
                         print(f"DEBUG_API_ROUTE: Intentando guardar BLINK. ID: {blink['id']}, Título: {blink['title']}, Categorías: {blink.get('categories')}")
                         news_model.save_blink(blink['id'], blink)
                         print(f"DEBUG_API_ROUTE: BLINK GUARDADO EXITOSAMENTE. ID: {blink['id']}")
+                        story_clusterer.remember_bodies(blink['id'], group_content['fingerprints'], blink.get('timestamp'))
                         processed_in_this_run_ids.add(blink['id']) # Add ID after successful save of blink
-                        # Also add the tentative_group_id to prevent re-processing of similar groups that might lead to different blink['id']s but were essentially the same source
-                        processed_in_this_run_ids.add(tentative_group_id)
 
 
                         # ... (article creation and saving) ...
@@ -537,10 +580,14 @@ def collect_and_process_news(app):
                         }
                         news_model.save_article(blink['id'], article)
                         successful_blinks += 1
+                        if scraper.seen_index is not None:
+                            scraper.seen_index.mark(item.get('url') for item in group)
 
                     except Exception as e:
                         print(f"DEBUG_API_ROUTE: Error EXCEPCIÓN al procesar grupo de noticias {i+1} (Título tentativo: {group[0].get('title', 'N/A') if group else 'Grupo vacío'}): {e}")
 
+                if scraper.seen_index is not None:
+                    scraper.seen_index.save()
                 print(f"Recopilación completada. Se generaron {successful_blinks} BLINKs exitosamente.")
             else:
                 print("No se encontraron noticias nuevas.")
@@ -578,10 +625,28 @@ def schedule_news_collection(app):
 # Función para inicializar las rutas de la API
 def init_api(app):
     global scraper # Para modificar la instancia global del scraper
+    global story_clusterer
     global blink_generator # Para modificar la instancia global del blink_generator
 
     app_config = app.config.get('APP_CONFIG', {})
+    # Cliente HTTP compartido por scraper, generador de blinks y notas superiores
+    configure_shared_fetcher(app_config.get('http_client', {}))
+    # Caché de respuestas de Ollama compartida por el generador de blinks y el de notas superiores
+    configure_shared_llm_cache(app_config.get('llm_response_cache', {}))
     scraper = NewsScraper(app_config) # Inicializar con la configuración de la app
+    simhash_config = app_config.get('simhash', {})
+    body_index = None
+    if simhash_config.get('enabled', True):
+        body_index = SimHashIndex(
+            os.path.join(news_model.data_dir, 'blink_simhash_index.jsonl'),
+            max_distance=simhash_config.get('max_distance', 6),
+            retention_hours=simhash_config.get('retention_hours', 24 * 7)
+        )
+    online_config = app_config.get('online_clustering', {})
+    story_clusterer = OnlineStoryClusterer(
+        news_model, scraper, online_config.get('live_hours', 48), body_index=body_index,
+        max_candidates=online_config.get('max_candidates', 30)
+    )
     blink_generator = BlinkGenerator(app_config=app_config) # Re-inicializar con la configuración de la app
 
     app.register_blueprint(api_bp, url_prefix='/api')
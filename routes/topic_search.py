@@ -1,5 +1,5 @@
 # routes/topic_search.py
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 import os
 import json
 from datetime import datetime
@@ -58,7 +58,9 @@ def search_topic():
 
     threading.Thread(
         target=process_topic_search,
-        args=(topic, data.get('hours_back', 24), data.get('max_sources', 5), search_key),
+        # El hilo no tiene contexto de la app: la configuración se le pasa ya leída
+        args=(topic, data.get('hours_back', 24), data.get('max_sources', 5), search_key,
+              current_app.config.get('APP_CONFIG', {})),
         daemon=True
     ).start()
 
@@ -75,10 +77,10 @@ def get_search_status(search_key):
         else:
             return jsonify({'status': 'not_found', 'message': 'Búsqueda no encontrada o expirada.'}), 404
 
-def process_topic_search(topic, hours_back, max_sources, search_key):
+def process_topic_search(topic, hours_back, max_sources, search_key, app_config=None):
     try:
         searcher = TopicSearcher()
-        note_generator = SuperiorNoteGenerator()
+        note_generator = SuperiorNoteGenerator(app_config=app_config)
         active_searches[search_key]['status'] = 'searching_news'
         grouped_news = searcher.search_topic_news(topic=topic, hours_back=hours_back, max_sources=max_sources)
 
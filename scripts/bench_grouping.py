@@ -0,0 +1,226 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, project_root)
+
+from news_blink_backend.src.models.blink_keyword_index import BlinkKeywordIndex  # noqa: E402
+from news_blink_backend.src.models.scraper import NewsScraper  # noqa: E402
+from news_blink_backend.src.models.story_clusterer import OnlineStoryClusterer  # noqa: E402
+from headline_corpus import (  # noqa: E402
+    load_raw_news_batches, split_batches, synthetic_headlines, unique_items
+)
+
+DEFAULT_CONFIG = os.path.join(project_root, 'config.json')
+STRATEGIES = ['greedy', 'lsh', 'tfidf']
+CLUSTERINGS = ['greedy', 'union_find']
+REFERENCE = 'greedy/greedy'
+
+
+class IndexedBlinks:
+    """
+    Sustituto de News para el paso de deduplicación: solo el índice de palabras clave (en un
+    directorio temporal), sin ficheros de blinks. Cada grupo "publicado" se indexa con su
+    primer titular, como haría save_blink con el blink generado.
+    """
+
+    def __init__(self, path):
+        self.keyword_index = BlinkKeywordIndex(path)
+
+    def find_duplicate_candidates(self, title, live_since=None, limit=None):
+        return self.keyword_index.candidates(title, live_since, limit)
+
+    def attach_to_blink(self, blink_id, news_items):
+        for item in news_items:
+            self.keyword_index.add_member(blink_id, item.get('title', ''))
+        return len(news_items)
+
+    def publish(self, group, timestamp):
+        blink_id = hashlib.md5((group[0].get('url') or group[0].get('title', '')).encode()).hexdigest()
+        self.keyword_index.add(blink_id, group[0].get('title', ''), timestamp)
+        return blink_id
+
+
+def grouped_pairs(groups):
+    """Pares de noticias (por identidad del objeto) que acaban en el mismo grupo"""
+    pairs = set()
+    for group in groups:
+        ids = sorted(id(item) for item in group)
+        pairs.update((a, b) for pos, a in enumerate(ids) for b in ids[pos + 1:])
+    return pairs
+
+
+def story_pairs(items):
+    """Pares que de verdad son la misma historia (solo los lotes sintéticos traen el campo story)"""
+    stories = {}
+    for item in items:
+        if 'story' in item:
+            stories.setdefault(item['story'], []).append(item)
+    return grouped_pairs(stories.values())
+
+
+def score(pairs, reference):
+    if reference is None:
+        return '-', '-'
+    common = len(pairs & reference)
+    precision = f"{common / len(pairs):.2f}" if pairs else '-'
+    recall = f"{common / len(reference):.2f}" if reference else '-'
+    return precision, recall
+
+
+def replay(config, strategy, method, batches):
+    """
+    Reproduce el pipeline de collect_and_process_news sin IA: por cada lote, descarte de las URLs
+    ya vistas (como SeenUrlIndex), deduplicación contra los blinks ya publicados
+    (OnlineStoryClusterer.assign/attach), agrupado de las noticias restantes (find_similar_news)
+    y publicación de cada grupo como blink nuevo.
+    Devuelve las métricas de la ejecución y los grupos finales (noticias de cada blink).
+    """
+    clustering_cfg = config.get('clustering', {})
+    scraper = NewsScraper(dict(config, grouping_strategy=strategy, clustering=dict(clustering_cfg, method=method)))
+    online_cfg = config.get('online_clustering', {})
+    stats = {'dedupe_seconds': 0.0, 'grouping_seconds': 0.0, 'dedupe_comparisons': 0, 'grouping_comparisons': 0,
+             'blinks': 0, 'attached': 0, 'duplicates': 0, 'new_items': 0, 'threshold': scraper.similarity_threshold}
+    stories = {}
+    seen_urls = set()
+    with tempfile.TemporaryDirectory(prefix='bench_grouping_') as tmp_dir:
+        blinks = IndexedBlinks(os.path.join(tmp_dir, 'blink_keyword_index.jsonl'))
+        clusterer = OnlineStoryClusterer(blinks, scraper, online_cfg.get('live_hours', 48),
+                                         max_candidates=online_cfg.get('max_candidates', 30))
+        timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+        # Los modos imprimen su propio resumen: aquí solo interesan las métricas
+        with contextlib.redirect_stdout(io.StringIO()):
+            for batch in batches:
+                items = [item for item in batch if item.get('url') not in seen_urls]
+                seen_urls.update(item.get('url') for item in batch)
+                stats['new_items'] += len(items)
+
+                start, comparisons = time.perf_counter(), scraper.comparisons
+                attached, duplicates, fresh = clusterer.assign(items)
+                clusterer.attach(attached)
+                stats['dedupe_seconds'] += time.perf_counter() - start
+                stats['dedupe_comparisons'] += scraper.comparisons - comparisons
+
+                start, comparisons = time.perf_counter(), scraper.comparisons
+                groups = scraper.find_similar_news(fresh)
+                stats['grouping_seconds'] += time.perf_counter() - start
+                stats['grouping_comparisons'] += scraper.comparisons - comparisons
+
+                for blink_id, blink_items in attached.items():
+                    stories.setdefault(blink_id, []).extend(blink_items)
+                    stats['attached'] += len(blink_items)
+                for group in groups:
+                    stories.setdefault(blinks.publish(group, timestamp), []).extend(group)
+                    stats['blinks'] += 1
+                stats['duplicates'] += len(duplicates)
+    return stats, list(stories.values())
+
+
+def peak_memory(config, strategy, method, batches):
+    """Pico de memoria (MB) reservada por Python durante la reproducción, medido con tracemalloc"""
+    tracemalloc.start()
+    try:
+        replay(config, strategy, method, batches)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(config, batches, strategies, clusterings, max_pairs=200_000, measure_memory=True):
+    items_total = sum(len(items) for items in batches)
+    all_pairs = sum(len(items) * (len(items) - 1) // 2 for items in batches)
+    # Las historias se reparten entre lotes: la verdad son los pares de todo el corpus
+    truth = story_pairs([item for items in batches for item in items])
+    print(f"Lotes: {len(batches)} | noticias: {items_total} | pares dentro de los lotes: {all_pairs}")
+
+    results = {}
+    for strategy in strategies:
+        for method in clusterings:
+            name = f"{strategy}/{method}"
+            if strategy == 'greedy' and all_pairs > max_pairs:
+                # Compara todos los pares de cada lote: a esta escala tardaría demasiado
+                results[name] = None
+                continue
+            stats, stories = replay(config, strategy, method, batches)
+            stats['pairs'] = grouped_pairs(stories)
+            stats['memory_mb'] = peak_memory(config, strategy, method, batches) if measure_memory else None
+            results[name] = stats
+
+    new_items = next((stats['new_items'] for stats in results.values() if stats), items_total)
+    if new_items != items_total:
+        print(f"Noticias con URL nueva (las demás las descartaría el índice de URLs vistas): {new_items}")
+    header = (f"{'estrategia':<20}{'umbral':>7}{'noticias/s':>12}{'dedupe':>11}{'agrupado':>11}{'comparaciones':>15}"
+              f"{'blinks':>8}{'añadidas':>10}{'duplic.':>9}{'MB pico':>9}{'P greedy':>10}{'R greedy':>10}")
+    print(header + (f"{'P historia':>12}{'R historia':>12}" if truth else ''))
+    reference = results[REFERENCE]['pairs'] if results.get(REFERENCE) else None
+    for name, stats in results.items():
+        if stats is None:
+            print(f"{name:<20}  omitido: más de {max_pairs} pares (--max-pairs)")
+            continue
+        seconds = stats['dedupe_seconds'] + stats['grouping_seconds']
+        precision, recall = score(stats['pairs'], reference if name != REFERENCE else None)
+        memory = f"{stats['memory_mb']:.1f}" if stats['memory_mb'] is not None else '-'
+        line = (f"{name:<20}{stats['threshold']:>7.2f}{stats['new_items'] / seconds if seconds else 0:>12.0f}"
+                f"{stats['dedupe_seconds'] * 1000:>8.0f} ms{stats['grouping_seconds'] * 1000:>8.0f} ms"
+                f"{stats['dedupe_comparisons'] + stats['grouping_comparisons']:>15}{stats['blinks']:>8}"
+                f"{stats['attached']:>10}{stats['duplicates']:>9}{memory:>9}{precision:>10}{recall:>10}")
+        if truth:
+            line += '{:>12}{:>12}'.format(*score(stats['pairs'], truth))
+        print(line)
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="Reproduce los lotes de noticias por la deduplicación y el agrupado de collect_and_process_news "
+                    "y compara las estrategias: noticias/s, comparaciones, memoria pico, blinks creados y "
+                    "precisión/recall de los pares agrupados frente a 'greedy/greedy' (y frente a la historia "
+                    "real en los lotes sintéticos)")
+    arg_parser.add_argument('--config', default=DEFAULT_CONFIG, help="config.json con los umbrales")
+    arg_parser.add_argument('--synthetic', type=int, default=0,
+                            help="Un lote sintético de N titulares en lugar de los archivados en data/raw_news")
+    arg_parser.add_argument('--scale', default='',
+                            help="Tamaños (separados por comas, p. ej. 10000,100000) de corpus sintéticos "
+                                 "generados a partir de los titulares archivados, en lotes de --batch-size")
+    arg_parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Noticias por lote (ejecución de la extracción) en los corpus de --scale")
+    arg_parser.add_argument('--strategies', default=','.join(STRATEGIES), help="Lista separada por comas")
+    arg_parser.add_argument('--clustering', default=','.join(CLUSTERINGS),
+                            help="Métodos de formación de grupos a combinar con cada estrategia (separados por comas)")
+    arg_parser.add_argument('--max-pairs', type=int, default=200_000,
+                            help="Se omite la estrategia 'greedy' (todos los pares) si los lotes suman más pares")
+    arg_parser.add_argument('--similarity-backend', choices=['rapidfuzz', 'difflib'],
+                            help="Backend del ratio de títulos (por defecto el de config.json)")
+    arg_parser.add_argument('--no-memory', action='store_true',
+                            help="No medir la memoria pico (una segunda pasada con tracemalloc, más lenta)")
+    args = arg_parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        app_config = json.load(f)
+    # Solo interesa el agrupado: sin índices ni estado en disco
+    app_config['seen_url_index'] = {'enabled': False}
+    app_config['source_health'] = {'enabled': False}
+    if args.similarity_backend:
+        app_config['similarity_backend'] = args.similarity_backend
+    selected = [name.strip() for name in args.strategies.split(',') if name.strip()]
+    methods = [name.strip() for name in args.clustering.split(',') if name.strip()]
+
+    if args.scale:
+        seed_titles = [item.get('title', '') for item in unique_items(load_raw_news_batches())]
+        for size in (int(value) for value in args.scale.split(',') if value.strip()):
+            print(f"\n== Corpus sintético de {size} titulares a partir de {len(seed_titles)} archivados ==")
+            corpus = synthetic_headlines(size, seed_titles=seed_titles)
+            run_benchmark(app_config, split_batches(corpus, args.batch_size), selected, methods,
+                          args.max_pairs, not args.no_memory)
+    else:
+        batches = [synthetic_headlines(args.synthetic)] if args.synthetic else load_raw_news_batches()
+        run_benchmark(app_config, batches, selected, methods, args.max_pairs, not args.no_memory)
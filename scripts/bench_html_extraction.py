@@ -0,0 +1,129 @@
+import argparse
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, project_root)
+
+from news_blink_backend.src.models.html_extractor import extract_article  # noqa: E402
+
+DEFAULT_PAGES_DIR = os.path.join(project_root, 'tests', 'fixtures', 'articles')
+
+
+def legacy_extract(html, url):
+    """Extracción previa de BlinkGenerator (BeautifulSoup + html.parser, varias pasadas), como referencia"""
+    try:
+        soup = BeautifulSoup(html, 'html.parser')
+
+        for element in soup.find_all(['script', 'style', 'nav', 'footer', 'header', 'aside', 'form']):
+            element.decompose()
+
+        content = ""
+
+        content_selectors = [
+            'article',
+            'main',
+            'div[class*="content"]',
+            'div[class*="article"]',
+            'div[class*="post"]',
+            'div[class*="story"]',
+            'div[id*="content"]'
+        ]
+
+        article_element = None
+        for selector in content_selectors:
+            article_element = soup.select_one(selector)
+            if article_element:
+                break
+
+        if article_element:
+            paragraphs = article_element.find_all('p')
+            content = ' '.join([p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 30])
+
+        image_url = None
+
+        meta_tags = [
+            soup.find('meta', property='og:image'),
+            soup.find('meta', attrs={'name': 'twitter:image'}),
+            soup.find('meta', attrs={'property': 'twitter:image'})
+        ]
+
+        for tag in meta_tags:
+            if tag and tag.get('content'):
+                image_url = tag.get('content')
+                break
+
+        if not image_url and article_element:
+            img_tags = article_element.find_all('img')
+            for img in img_tags:
+                src = img.get('src') or img.get('data-src')
+                if src and (img.get('width') is None or int(img.get('width', 0)) >= 300):
+                    if not src.startswith(('http://', 'https://')):
+                        base_url = '/'.join(url.split('/')[:3])
+                        src = base_url + src.lstrip('/')
+                    image_url = src
+                    break
+
+        return {'content': content, 'image_url': image_url}
+    except Exception:
+        return {'content': "", 'image_url': None}
+
+
+def time_per_page(func, html, url, repeat):
+    """Mejor tiempo (ms) de repeat ejecuciones, para reducir el ruido del sistema"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html, url)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def run_benchmark(pages_dir, repeat):
+    files = sorted(f for f in os.listdir(pages_dir) if f.endswith(('.html', '.htm')))
+    if not files:
+        print(f"No hay páginas HTML en {pages_dir}")
+        return
+
+    backends = [
+        ('legado', legacy_extract),
+        ('html.parser', lambda html, url: extract_article(html, url, backend='html.parser')),
+        ('lxml', lambda html, url: extract_article(html, url, backend='lxml')),
+    ]
+    totals = {name: 0.0 for name, _ in backends}
+
+    print(f"{'página':<32}{'KB':>7}" + ''.join(f"{name:>14}" for name, _ in backends) + f"{'mejora':>9}  igual")
+    for filename in files:
+        with open(os.path.join(pages_dir, filename), 'r', encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        url = f"https://example.com/{filename}"
+
+        timings = {}
+        for name, func in backends:
+            timings[name] = time_per_page(func, html, url, repeat)
+            totals[name] += timings[name]
+
+        # La extracción en una pasada debe producir el mismo resultado que el backend BeautifulSoup
+        same = extract_article(html, url, backend='lxml') == extract_article(html, url, backend='html.parser')
+        speedup = timings['legado'] / timings['lxml'] if timings['lxml'] else 0
+        print(f"{filename[:31]:<32}{len(html) / 1024:>7.1f}"
+              + ''.join(f"{timings[name]:>11.2f} ms" for name, _ in backends)
+              + f"{speedup:>8.1f}x  {'sí' if same else 'NO'}")
+
+    count = len(files)
+    print(f"{'media por página':<39}" + ''.join(f"{totals[name] / count:>11.2f} ms" for name, _ in backends)
+          + f"{totals['legado'] / totals['lxml']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara el tiempo de extracción de artículos por backend de parseo")
+    parser.add_argument('pages_dir', nargs='?', default=DEFAULT_PAGES_DIR,
+                        help="Directorio con páginas HTML guardadas (por defecto tests/fixtures/articles)")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por página (se toma la mejor)")
+    args = parser.parse_args()
+    run_benchmark(args.pages_dir, args.repeat)
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(script_dir, '..'))
+sys.path.insert(0, project_root)
+
+from news_blink_backend.src.models.extraction_plan import SourceExtractionPlan  # noqa: E402
+from news_blink_backend.src.models.html_extractor import bs4_parser_name  # noqa: E402
+
+DEFAULT_PAGES_DIR = os.path.join(project_root, 'tests', 'fixtures', 'homepages')
+DEFAULT_CONFIG = os.path.join(project_root, 'config.json')
+
+
+def legacy_extract(source, html, max_articles, parser):
+    """Extracción previa de scrape_source (selectores interpretados en cada llamada), como referencia"""
+    soup = BeautifulSoup(html, parser)
+    articles = soup.select(source['article_selector'])
+    count = 0
+    for article in articles[:max_articles]:
+        title_element = article.select_one(source['title_selector'])
+        link_element = article.select_one(source['link_selector'])
+        article.select_one(source['summary_selector'])
+        if title_element and link_element and len(title_element.get_text().strip()) > 10 and link_element.get('href'):
+            count += 1
+    return count
+
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmark(config_path, pages_dir, parser_backend, repeat):
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    with open(os.path.join(pages_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    max_articles = config.get('default_articles_per_source', 8)
+    parser = bs4_parser_name(parser_backend)
+    print(f"Parser: {parser} | artículos por fuente: {max_articles} | repeticiones: {repeat}")
+    print(f"{'fuente':<18}{'artículos':>10}{'legado':>12}{'plan':>12}{'artículos/s':>14}  estado")
+
+    broken = []
+    for source in config.get('news_sources', []):
+        name = source.get('name')
+        filename = manifest.get(name)
+        if not source.get('article_selector'):
+            continue
+        if not filename or not os.path.exists(os.path.join(pages_dir, filename)):
+            print(f"{name:<18}{'-':>10}{'-':>12}{'-':>12}{'-':>14}  sin página guardada")
+            continue
+        with open(os.path.join(pages_dir, filename), 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        plan = SourceExtractionPlan(source, max_articles)
+        if not plan.valid:
+            print(f"{name:<18}{'-':>10}{'-':>12}{'-':>12}{'-':>14}  ROTO: {plan.error}")
+            broken.append(name)
+            continue
+
+        items = plan.extract(html, parser)
+        legacy_seconds = best_time(lambda: legacy_extract(source, html, max_articles, parser), repeat)
+        plan_seconds = best_time(lambda: plan.extract(html, parser), repeat)
+        status = 'ok' if items else 'ROTO: ningún artículo'
+        if not items:
+            broken.append(name)
+        rate = len(items) / plan_seconds if plan_seconds else 0
+        print(f"{name[:17]:<18}{len(items):>10}{legacy_seconds * 1000:>9.2f} ms{plan_seconds * 1000:>9.2f} ms{rate:>14.0f}  {status}")
+
+    if broken:
+        print(f"Fuentes con selectores rotos: {', '.join(broken)}")
+    return not broken
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Mide la extracción de portadas guardadas por fuente (sin red)")
+    arg_parser.add_argument('pages_dir', nargs='?', default=DEFAULT_PAGES_DIR,
+                            help="Directorio con las portadas y su manifest.json (nombre de fuente -> fichero)")
+    arg_parser.add_argument('--config', default=DEFAULT_CONFIG, help="config.json con news_sources")
+    arg_parser.add_argument('--parser', default='lxml', choices=['lxml', 'html.parser'])
+    arg_parser.add_argument('--repeat', type=int, default=5, help="Repeticiones por fuente (se toma la mejor)")
+    args = arg_parser.parse_args()
+    sys.exit(0 if run_benchmark(args.config, args.pages_dir, args.parser, args.repeat) else 1)
@@ -0,0 +1,121 @@
+"""Lotes de titulares para los benchmarks de agrupado: archivados (data/raw_news) o sintéticos."""
+import glob
+import json
+import os
+import random
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(script_dir, '..'))
+RAW_NEWS_DIR = os.path.join(project_root, 'data', 'raw_news')
+
+_SYLLABLES = [
+    'ba', 'ca', 'da', 'fa', 'ga', 'la', 'ma', 'na', 'pa', 'ra', 'sa', 'ta', 'be', 'ce', 'de', 'fe', 'le', 'me',
+    'ne', 'pe', 're', 'se', 'te', 'bi', 'ci', 'di', 'li', 'mi', 'ni', 'pi', 'ri', 'si', 'ti', 'bo', 'co', 'do',
+    'lo', 'mo', 'no', 'po', 'ro', 'so', 'to', 'bu', 'cu', 'du', 'lu', 'mu', 'nu', 'pu', 'ru', 'su', 'tu', 'tra',
+    'pro', 'gen', 'tec', 'chip', 'net', 'bit', 'zon', 'mar', 'ver', 'sol'
+]
+_STOP_WORDS = ['el', 'la', 'los', 'las', 'un', 'una', 'de', 'del', 'en', 'con', 'por', 'para', 'que', 'se', 'y']
+_SOURCES = ['El País', 'ABC Tecnología', 'Xataka', 'Hipertextual', 'TechCrunch', 'The Verge', 'Wired']
+
+
+def load_raw_news_batches(raw_dir=RAW_NEWS_DIR):
+    """Lista de lotes archivados (uno por fichero raw_news_*.json), en orden cronológico"""
+    batches = []
+    for path in sorted(glob.glob(os.path.join(raw_dir, 'raw_news_*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            batches.append(json.load(f))
+    return batches
+
+
+def _vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _variant(rng, words, vocabulary, weights):
+    """Reescritura de un titular como la haría otro medio: quita, añade, cambia o reordena palabras"""
+    words = list(words)
+    for _ in range(rng.randint(1, 3)):
+        op = rng.random()
+        if op < 0.3 and len(words) > 4:
+            words.pop(rng.randrange(len(words)))
+        elif op < 0.6:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(_STOP_WORDS))
+        elif op < 0.8:
+            words[rng.randrange(len(words))] = rng.choices(vocabulary, weights)[0]
+        else:
+            i, j = rng.randrange(len(words)), rng.randrange(len(words))
+            words[i], words[j] = words[j], words[i]
+    return words
+
+
+def unique_items(batches):
+    """Noticias de los lotes sin repetir URL (los lotes archivados se solapan mucho entre sí)"""
+    seen = set()
+    items = []
+    for batch in batches:
+        for item in batch:
+            key = item.get('url') or item.get('title')
+            if key not in seen:
+                seen.add(key)
+                items.append(item)
+    return items
+
+
+def split_batches(items, size):
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def _seeded_base(rng, title, vocabulary, weights):
+    """Titular nuevo con la forma de uno real: conserva las palabras vacías y una de cada cuatro de las demás"""
+    words = title.lower().split()
+    return [
+        word if word in _STOP_WORDS or rng.random() < 0.25 else rng.choices(vocabulary, weights)[0]
+        for word in words
+    ]
+
+
+def synthetic_headlines(count, seed=7, vocabulary_size=20000, max_variants=5, seed_titles=None):
+    """
+    Genera count noticias con la forma de las del scraper. El vocabulario sigue una ley de Zipf
+    (como el de titulares reales) y cada historia aparece de 1 a max_variants + 1 veces
+    con variaciones del titular y del resumen, de modo que hay grupos reales que encontrar.
+    Con seed_titles (p. ej. los titulares archivados) cada historia parte de uno de ellos, del
+    que conserva la longitud, las palabras vacías y una cuarta parte del resto de palabras.
+    """
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(rng, vocabulary_size)
+    # Las palabras más frecuentes de un titular son vacías y se filtran: se aplana la cabeza de la Zipf
+    weights = [1.0 / (rank + 100) for rank in range(len(vocabulary))]
+    seed_titles = [title for title in (seed_titles or []) if len(title.split()) >= 4]
+
+    items = []
+    story = 0
+    while len(items) < count:
+        if seed_titles:
+            base = _seeded_base(rng, rng.choice(seed_titles), vocabulary, weights)
+        else:
+            base = rng.choices(vocabulary, weights, k=rng.randint(6, 11))
+            for _ in range(rng.randint(0, 3)):
+                base.insert(rng.randrange(len(base) + 1), rng.choice(_STOP_WORDS))
+        summary = base + rng.choices(vocabulary, weights, k=14)
+        versions = [(base, summary)] + [
+            (_variant(rng, base, vocabulary, weights), _variant(rng, summary, vocabulary, weights))
+            for _ in range(rng.choice([0, 0, 1, 2, max_variants]))
+        ]
+        for version, (words, summary_words) in enumerate(versions):
+            title = ' '.join(words).capitalize()
+            items.append({
+                'id': f"{story}-{version}",
+                'title': title,
+                'url': f"https://noticias.example.com/{story}/{version}",
+                'summary': ' '.join(summary_words).capitalize(),
+                'source': rng.choice(_SOURCES),
+                'category': 'tecnologia',
+                'story': story
+            })
+        story += 1
+    rng.shuffle(items)
+    return items[:count]
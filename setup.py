@@ -12,8 +12,12 @@ setup(
         'Flask-CORS==4.0.0',
         'requests==2.31.0',
         'beautifulsoup4==4.12.2',
+        'lxml==5.2.2',
+        'numpy==1.26.4',
+        'scipy==1.11.4',
         'nltk==3.8.1',
         'ollama==0.5.1',
+        'rapidfuzz==3.9.6',
     ],
     entry_points={
         'console_scripts': [
@@ -0,0 +1,100 @@
+"""Servidor HTTP local para los tests: sirve rutas fijas y cuenta peticiones y conexiones."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, necesario para comprobar la reutilización de conexiones
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connection_count += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append({'path': self.path, 'headers': dict(self.headers)})
+        route = self.server.routes.get(self.path)
+        if route is None:
+            self._send(404, {'Content-Type': 'text/plain'}, b'not found')
+            return
+        status, headers, body = route(self) if callable(route) else route
+        self._send(status, headers, body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = self.rfile.read(length) if length else b''
+        with self.server.lock:
+            self.server.requests.append({'path': self.path, 'headers': dict(self.headers), 'body': payload})
+        route = self.server.routes.get(self.path)
+        if route is None:
+            self._send(404, {'Content-Type': 'text/plain'}, b'not found')
+            return
+        status, headers, body = route(self, payload)
+        self._send(status, headers, body)
+
+    def _send(self, status, headers, body):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        # El cuerpo puede ser un iterable de bloques; en ese caso la ruta indica su Content-Length
+        if 'Content-Length' not in headers:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        chunks = [body] if isinstance(body, bytes) else body
+        try:
+            for chunk in chunks:
+                self.wfile.write(chunk)
+                with self.server.lock:
+                    self.server.bytes_sent += len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalHTTPServer:
+    """Levanta un ThreadingHTTPServer en un puerto libre. Las rutas son tuplas
+    (status, headers, body) o callables handler -> tupla (GET) / (handler, body) -> tupla (POST)."""
+
+    def __init__(self, routes=None):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.routes = routes or {}
+        self.httpd.requests = []
+        self.httpd.connection_count = 0
+        self.httpd.bytes_sent = 0
+        self.httpd.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def routes(self):
+        return self.httpd.routes
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    @property
+    def connection_count(self):
+        return self.httpd.connection_count
+
+    @property
+    def bytes_sent(self):
+        return self.httpd.bytes_sent
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,242 @@
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from news_blink_backend.src.models.blink_generator import BlinkGenerator
+
+
+def _reply(content, stream=False):
+    """Respuesta de ollama.Client.chat: el mensaje completo o, en streaming, un único fragmento"""
+    message = {'message': {'role': 'assistant', 'content': content}}
+    return iter([message]) if stream else message
+
+
+def _groups(count):
+    return [[{'title': f"Noticia {index}", 'url': f"https://example.com/{index}", 'source': 'EFE'}]
+            for index in range(count)]
+
+
+class TestParallelGeneration(unittest.TestCase):
+    def setUp(self):
+        self.delays = {}
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def _content(self, group):
+        return {'fingerprints': [], 'combined_content': group[0]['title']}
+
+    def _generate(self, group, group_content=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            delay = self.delays.get(group[0]['title'], 0.1)
+            if isinstance(delay, Exception):
+                raise delay
+            time.sleep(delay)
+        finally:
+            with self.lock:
+                self.active -= 1
+        return {'id': group[0]['url'], 'title': group[0]['title']}
+
+    def _run(self, workers, groups, skip_group=None):
+        generator = BlinkGenerator(app_config={'generation_max_workers': workers})
+        with patch.object(generator, 'collect_group_content', side_effect=self._content), \
+                patch.object(generator, 'generate_blink_from_news_group', side_effect=self._generate) as generate:
+            start = time.monotonic()
+            results = list(generator.generate_blinks(groups, skip_group))
+            return results, time.monotonic() - start, generate
+
+    def test_pool_is_bounded_and_cuts_wall_clock(self):
+        results, sequential, _ = self._run(1, _groups(4))
+        self.assertEqual([result[0] for result in results], [0, 1, 2, 3])
+        self.assertEqual(self.max_active, 1)
+
+        self.max_active = 0
+        results, parallel, _ = self._run(2, _groups(4))
+        self.assertEqual(sorted(result[0] for result in results), [0, 1, 2, 3])
+        self.assertEqual(self.max_active, 2)
+        self.assertLess(parallel, sequential * 0.75)
+
+    def test_results_arrive_as_groups_finish(self):
+        self.delays = {'Noticia 0': 0.4}
+        results, _, _ = self._run(3, _groups(3))
+        self.assertEqual(results[-1][0], 0)
+        self.assertEqual(results[-1][3]['title'], 'Noticia 0')
+
+    def test_skipped_and_failed_groups(self):
+        groups = _groups(3)
+        self.delays = {'Noticia 2': RuntimeError('Ollama no responde')}
+
+        def skip(group, group_content):
+            return group[0]['title'] == 'Noticia 1'
+
+        results, _, generate = self._run(2, groups, skip)
+        by_index = {result[0]: result for result in results}
+        self.assertEqual(by_index[0][3]['title'], 'Noticia 0')
+        self.assertIsNone(by_index[1][3])
+        self.assertIsNone(by_index[1][4])
+        self.assertIsNone(by_index[2][3])
+        self.assertIsInstance(by_index[2][4], RuntimeError)
+        self.assertEqual(generate.call_count, 2)
+
+
+class SlowOllama:
+    """Cliente falso: cada chat tarda delay segundos; registra cuántos hay en curso a la vez"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def chat(self, model, messages, format=None, options=None, stream=False):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if format is not None:
+            return _reply(json.dumps({'categoria': 'tecnología', 'confianza': 0.9}), stream)
+        return _reply('tecnología', stream)
+
+
+class TestStagesWithinGroup(unittest.TestCase):
+    def _generate(self, app_config):
+        generator = BlinkGenerator(app_config=app_config)
+        generator.ollama_client = SlowOllama()
+        group = _groups(1)[0]
+        content = {'urls': [group[0]['url']], 'sources': ['EFE'], 'article_contents': [], 'fingerprints': [],
+                   'combined_content': "La misión lunar se retrasa seis meses por un fallo en el motor.", 'image_url': None}
+        start = time.monotonic()
+        blink = generator.generate_blink_from_news_group(group, content)
+        return blink, time.monotonic() - start, generator.ollama_client
+
+    def test_independent_stages_share_ollama_slots(self):
+        blink, serial, client = self._generate({'ollama_parallel_slots': 4, 'generation_parallel_stages': False,
+                                                'category_classification': 'determine_verify'})
+        self.assertEqual((client.calls, client.max_active), (5, 1))
+
+        parallel_blink, parallel, client = self._generate({'ollama_parallel_slots': 4,
+                                                           'category_classification': 'determine_verify'})
+        self.assertEqual((client.calls, client.max_active), (5, 3))
+        self.assertEqual({key: value for key, value in parallel_blink.items() if key != 'timestamp'},
+                         {key: value for key, value in blink.items() if key != 'timestamp'})
+        # Camino crítico de dos llamadas frente a cinco en serie
+        self.assertLess(parallel, serial * 0.6)
+
+        _, _, client = self._generate({'ollama_parallel_slots': 2})
+        self.assertEqual(client.max_active, 2)
+
+
+class ScriptedOllama:
+    """Cliente falso que responde en orden con los textos dados y guarda cada petición"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def chat(self, model, messages, format=None, options=None, stream=False):
+        self.requests.append({'prompt': messages[0]['content'], 'format': format})
+        return _reply(self.responses.pop(0), stream)
+
+
+class TestStructuredCategory(unittest.TestCase):
+    TEXT = "El nuevo procesador promete duplicar la autonomía de los portátiles. " * 600
+
+    def _select(self, *responses, **app_config):
+        generator = BlinkGenerator(app_config=app_config)
+        generator.ollama_client = ScriptedOllama(*responses)
+        category = generator.select_category_with_ai(self.TEXT, "Un chip que duplica la batería")
+        return category, generator.ollama_client.requests
+
+    def test_confident_answer_needs_a_single_capped_call(self):
+        category, requests = self._select(json.dumps({'categoria': 'Tecnología', 'confianza': 0.92}))
+        self.assertEqual(category, 'tecnología')
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0]['format']['properties']['categoria']['enum'][0], 'tecnología')
+        self.assertLess(len(requests[0]['prompt']), 4600)
+
+    def test_low_confidence_is_verified(self):
+        low = json.dumps({'categoria': 'ciencia', 'confianza': 0.4})
+        category, requests = self._select(low, "sí")
+        self.assertEqual((category, len(requests)), ('ciencia', 2))
+        self.assertIn('"ciencia"', requests[1]['prompt'])
+        self.assertEqual(self._select(low, "no")[0], 'general')
+
+    def test_invalid_answer_falls_back_to_determine_and_verify(self):
+        category, requests = self._select('{"categoria": "cocina", "confianza": 1}', "economía", "sí")
+        self.assertEqual((category, len(requests)), ('economía', 3))
+        self.assertEqual([request['format'] is None for request in requests], [False, True, True])
+
+        category, requests = self._select("deportes", "sí", category_classification='determine_verify')
+        self.assertEqual((category, len(requests)), ('deportes', 2))
+
+
+class TokenStream:
+    """Flujo falso de fragmentos de pocos caracteres; registra cuántos se leyeron y si se cerró"""
+
+    def __init__(self, content, size=4):
+        self.chunks = [content[start:start + size] for start in range(0, len(content), size)]
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield {'message': {'role': 'assistant', 'content': chunk}}
+
+    def close(self):
+        self.closed = True
+
+
+class StreamingOllama:
+    def __init__(self, content):
+        self.stream = TokenStream(content)
+        self.streamed = None
+
+    def chat(self, model, messages, format=None, options=None, stream=False):
+        self.streamed = stream
+        return self.stream if stream else _reply(content=''.join(self.stream.chunks))
+
+
+class TestStreamingShortAnswers(unittest.TestCase):
+    THINK = "<think>" + "Analizo la noticia con calma. " * 40 + "</think>\n\n"
+
+    def _generator(self, content, **app_config):
+        generator = BlinkGenerator(app_config=app_config)
+        generator.ollama_client = StreamingOllama(content)
+        return generator, generator.ollama_client
+
+    def test_points_stop_after_enough_lines(self):
+        points = [f"Punto clave número {number}." for number in range(1, 9)]
+        generator, client = self._generator(self.THINK + "\n".join(f"- {point}" for point in points) + "\n")
+        self.assertEqual(generator.generate_ollama_summary("Texto de la noticia", "Título", num_points=5), points[:5])
+        self.assertTrue(client.streamed)
+        self.assertTrue(client.stream.closed)
+        self.assertLess(client.stream.read, len(client.stream.chunks) - 10)
+
+    def test_category_and_verification_stop_at_the_answer(self):
+        generator, client = self._generator(self.THINK + "Economía\n\nLa noticia trata sobre los mercados " * 5)
+        self.assertEqual(generator.determine_category_with_ai("Texto", "Título"), "economía")
+        # El bloque <think> se lee entero; de la respuesta, solo hasta la categoría
+        self.assertLess(client.stream.read, len(client.stream.chunks) - 40)
+
+        generator, client = self._generator("No, porque la noticia habla de deportes y no de política. " * 5)
+        self.assertEqual(generator.verify_category_with_ai("Texto", "Título", "política"), (False, "política"))
+        self.assertLessEqual(client.stream.read, 1)
+
+    def test_can_be_disabled(self):
+        generator, client = self._generator("Categoría: salud\nMás texto", stream_short_answers=False)
+        self.assertEqual(generator.determine_category_with_ai("Texto", "Título"), "salud")
+        self.assertFalse(client.streamed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from news_blink_backend.src.models.blink_keyword_index import BlinkKeywordIndex
+from news_blink_backend.src.models.news import News
+
+
+class TestBlinkKeywordIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='keyword_index_test_')
+        self.path = os.path.join(self.tmp_dir, 'index.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_candidates_share_keywords(self):
+        index = BlinkKeywordIndex(self.path)
+        index.add('a', "Apple presenta el iPhone 16 con inteligencia artificial")
+        index.add('b', "Google lanza Gemini 2")
+        index.add('c', "El iPhone 16 llega a las tiendas")
+        candidates = index.candidates("Apple confirma la fecha del iPhone 16")
+        self.assertEqual([blink['id'] for blink in candidates], ['a', 'c'])
+        self.assertEqual(candidates[1]['title'], "El iPhone 16 llega a las tiendas")
+        self.assertEqual(index.candidates("La NASA retrasa Artemis"), [])
+
+    def test_candidates_limit_keeps_best_ranked(self):
+        index = BlinkKeywordIndex(self.path)
+        index.add('a', "Apple presenta el iPhone 16 con inteligencia artificial")
+        index.add('b', "Google lanza Gemini 2")
+        index.add('c', "El iPhone 16 llega a las tiendas")
+        candidates = index.candidates("Apple confirma la fecha del iPhone 16", limit=1)
+        self.assertEqual([blink['id'] for blink in candidates], ['a'])
+
+    def test_retitled_blink_leaves_old_postings(self):
+        index = BlinkKeywordIndex(self.path)
+        index.add('a', "Apple presenta el iPhone 16")
+        index.add('a', "Google lanza Gemini 2")
+        self.assertEqual(index.candidates("Apple iPhone"), [])
+        self.assertEqual([blink['id'] for blink in index.candidates("Gemini")], ['a'])
+
+    def test_journal_is_replayed_and_compacted(self):
+        index = BlinkKeywordIndex(self.path)
+        for version in range(5):
+            index.add('a', f"Apple presenta el iPhone {version}")
+        index.add('a', "Apple presenta el iPhone 4")
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 5)
+
+        reloaded = BlinkKeywordIndex(self.path)
+        self.assertEqual([blink['title'] for blink in reloaded.candidates("iPhone")], ["Apple presenta el iPhone 4"])
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_removed_blink_is_no_candidate_after_reload(self):
+        index = BlinkKeywordIndex(self.path)
+        index.add('a', "Apple presenta el iPhone 16")
+        index.add('b', "El iPhone 16 llega a las tiendas")
+        index.remove('a')
+        self.assertEqual([blink['id'] for blink in index.candidates("iPhone 16")], ['b'])
+        self.assertEqual([blink['id'] for blink in BlinkKeywordIndex(self.path).candidates("iPhone 16")], ['b'])
+
+
+class TestNewsKeywordIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='keyword_index_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_existing_blinks_are_indexed_once(self):
+        blinks_dir = os.path.join(self.tmp_dir, 'blinks')
+        os.makedirs(blinks_dir)
+        with open(os.path.join(blinks_dir, 'viejo.json'), 'w', encoding='utf-8') as f:
+            json.dump({'id': 'viejo', 'title': "Tesla recorta precios del Model 3"}, f)
+
+        news = News(self.tmp_dir)
+        self.assertEqual([blink['id'] for blink in news.find_duplicate_candidates("Tesla baja precios")], ['viejo'])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, 'blink_keyword_index.jsonl')))
+
+    def test_deleted_blink_files_are_dropped(self):
+        news = News(self.tmp_dir)
+        news.save_blink('borrado', {'id': 'borrado', 'title': "Tesla recorta precios del Model 3"})
+        news.save_blink('vivo', {'id': 'vivo', 'title': "Tesla presenta el Model 3 renovado"})
+        os.remove(os.path.join(news.blinks_dir, 'borrado.json'))
+        self.assertEqual([blink['id'] for blink in news.find_duplicate_candidates("Tesla Model 3", limit=1)], ['vivo'])
+        self.assertEqual(len(news.keyword_index), 1)
+
+        # Diario que no coincide con data/blinks (p. ej. tras borrar los blinks a mano): se sincroniza al cargar
+        os.remove(os.path.join(news.blinks_dir, 'vivo.json'))
+        with open(os.path.join(news.blinks_dir, 'nuevo.json'), 'w', encoding='utf-8') as f:
+            json.dump({'id': 'nuevo', 'title': "Tesla abre una fábrica en Valencia"}, f)
+        reloaded = News(self.tmp_dir)
+        self.assertEqual([blink['id'] for blink in reloaded.find_duplicate_candidates("Tesla")], ['nuevo'])
+
+    def test_save_blink_updates_index(self):
+        news = News(self.tmp_dir)
+        news.save_blink('nuevo', {'id': 'nuevo', 'title': "Microsoft compra una startup de ciberseguridad"})
+        candidates = News(self.tmp_dir).find_duplicate_candidates("Startup de ciberseguridad")
+        self.assertEqual([blink['id'] for blink in candidates], ['nuevo'])
+        self.assertEqual(candidates[0]['features'].title, "Microsoft compra una startup de ciberseguridad")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from news_blink_backend.src.models.clustering import UnionFind, cluster_edges
+from news_blink_backend.src.models.scraper import NewsScraper
+
+# A ~ B y B ~ C, pero A y C quedan por debajo del umbral
+CHAIN = [
+    "Apple presenta el iPhone 16 con inteligencia artificial",
+    "Google lanza Gemini 2 para competir con ChatGPT",
+    "Apple presenta el iPhone 16 con inteligencia artificial y nuevo chip",
+    "El iPhone 16 con inteligencia artificial y nuevo chip ya está a la venta",
+]
+
+
+def _items(titles):
+    return [{'id': str(i), 'title': title, 'url': f"https://example.com/{i}"} for i, title in enumerate(titles)]
+
+
+def _ids(groups):
+    return [[item['id'] for item in group] for group in groups]
+
+
+class TestUnionFind(unittest.TestCase):
+    def test_union_respects_max_size(self):
+        components = UnionFind(4)
+        self.assertTrue(components.union(0, 1, max_size=3))
+        self.assertTrue(components.union(1, 2, max_size=3))
+        self.assertFalse(components.union(2, 3, max_size=3))
+        self.assertEqual(components.find(0), components.find(2))
+        self.assertNotEqual(components.find(0), components.find(3))
+
+    def test_strongest_edges_win_under_cap(self):
+        edges = [(0.7, 0, 1), (0.9, 1, 2), (0.8, 2, 3)]
+        self.assertEqual(cluster_edges(4, edges, max_cluster_size=2), [[0], [1, 2], [3]])
+        self.assertEqual(cluster_edges(4, edges), [[0, 1, 2, 3]])
+
+    def test_ties_do_not_depend_on_input_order(self):
+        keys = ['a', 'b', 'c']
+        forward = cluster_edges(3, [(0.8, 0, 1), (0.8, 1, 2)], max_cluster_size=2, tie_keys=keys)
+        backward = cluster_edges(3, [(0.8, 1, 2), (0.8, 0, 1)], max_cluster_size=2, tie_keys=keys)
+        self.assertEqual(forward, backward)
+        self.assertEqual(forward, [[0, 1], [2]])
+
+
+class TestUnionFindGrouping(unittest.TestCase):
+    def test_chained_stories_are_merged(self):
+        scraper = NewsScraper({})
+        self.assertLessEqual(scraper.calculate_combined_similarity(CHAIN[0], CHAIN[3]), 0.6)
+        greedy = NewsScraper({'grouping_strategy': 'greedy'}).find_similar_news(_items(CHAIN))
+        self.assertEqual(_ids(greedy), [['0', '2'], ['1'], ['3']])
+
+        for strategy in ('greedy', 'lsh'):
+            scraper = NewsScraper({'grouping_strategy': strategy, 'clustering': {'method': 'union_find'}})
+            self.assertEqual(_ids(scraper.find_similar_news(_items(CHAIN))), [['0', '2', '3'], ['1']], strategy)
+
+    def test_groups_do_not_depend_on_input_order(self):
+        scraper = NewsScraper({'clustering': {'method': 'union_find', 'max_cluster_size': 2}})
+        items = _items(CHAIN)
+        forward = scraper.find_similar_news(items)
+        backward = scraper.find_similar_news(list(reversed(items)))
+        as_sets = lambda groups: sorted(sorted(item['id'] for item in group) for group in groups)
+        self.assertEqual(as_sets(forward), as_sets(backward))
+        self.assertTrue(all(len(group) <= 2 for group in forward))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from news_blink_backend.src.models.blink_generator import BlinkGenerator
+from news_blink_backend.src.models.content_cache import ArticleContentCache
+from news_blink_backend.src.models.http_fetcher import HttpFetcher
+from news_blink_backend.src.models.url_utils import normalize_url
+from tests.http_test_server import LocalHTTPServer
+
+ARTICLE_HTML = (
+    b"<html><body><article><p>Un parrafo con longitud suficiente para ser considerado contenido real.</p>"
+    b"</article></body></html>"
+)
+
+
+class TestNormalizeUrl(unittest.TestCase):
+    def test_equivalent_urls_share_key(self):
+        variants = [
+            "https://Elpais.com/tecnologia/nota.html",
+            "https://elpais.com:443/tecnologia/nota.html#comentarios",
+            "https://elpais.com/tecnologia/nota.html?utm_source=twitter&utm_medium=social",
+            "https://elpais.com/tecnologia/nota.html/?fbclid=abc",
+        ]
+        keys = {normalize_url(url) for url in variants}
+        self.assertEqual(keys, {"https://elpais.com/tecnologia/nota.html"})
+
+    def test_meaningful_query_is_kept_and_sorted(self):
+        self.assertEqual(
+            normalize_url("https://example.com/a?page=2&id=7"),
+            "https://example.com/a?id=7&page=2"
+        )
+        self.assertNotEqual(normalize_url("https://example.com/a?id=1"), normalize_url("https://example.com/a?id=2"))
+
+
+class TestArticleContentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix='content_cache_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_memory_lru_eviction_falls_back_to_disk(self):
+        cache = ArticleContentCache(self.cache_dir, max_memory_entries=2)
+        for i in range(3):
+            cache.put(f"https://example.com/{i}", {'content': f"texto {i}", 'image_url': None})
+        self.assertEqual(cache.stats()['memory_entries'], 2)
+        self.assertEqual(cache.get("https://example.com/0")['content'], "texto 0")
+        self.assertEqual(cache.stats()['disk_hits'], 1)
+
+    def test_entries_expire_after_ttl(self):
+        cache = ArticleContentCache(self.cache_dir, ttl_hours=0.5 / 3600)
+        cache.put("https://example.com/nota", {'content': "texto", 'image_url': None})
+        self.assertIsNotNone(cache.get("https://example.com/nota"))
+        time.sleep(0.6)
+        self.assertIsNone(cache.get("https://example.com/nota"))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_disk_is_pruned_on_write(self):
+        cache = ArticleContentCache(self.cache_dir, ttl_hours=0.5 / 3600, max_disk_entries=30)
+        cache.put("https://example.com/vieja", {'content': "texto", 'image_url': None})
+        time.sleep(0.6)
+        cache.ttl_seconds = 3600
+        for i in range(49):
+            cache.put(f"https://example.com/{i}", {'content': f"texto {i}", 'image_url': None})
+        files = [name for name in os.listdir(self.cache_dir) if name.endswith('.json')]
+        self.assertEqual(len(files), 30)
+        self.assertNotIn(os.path.basename(cache._path("https://example.com/vieja")), files)
+        self.assertIsNotNone(cache.get("https://example.com/48"))
+
+    def test_disk_entries_survive_restart(self):
+        ArticleContentCache(self.cache_dir).put("https://example.com/nota?utm_source=x", {'content': "texto", 'image_url': "https://img/x.jpg"})
+        reloaded = ArticleContentCache(self.cache_dir)
+        self.assertEqual(reloaded.get("https://example.com/nota")['image_url'], "https://img/x.jpg")
+
+    def test_blink_generator_skips_network_on_repeat(self):
+        config = {'article_content_cache': {'enabled': True, 'cache_dir': self.cache_dir}}
+        with LocalHTTPServer({'/nota': (200, {'Content-Type': 'text/html'}, ARTICLE_HTML)}) as server:
+            generator = BlinkGenerator(app_config=config, fetcher=HttpFetcher({'max_retries': 0}))
+            first = generator.get_article_content(f"{server.base_url}/nota")
+            second = generator.get_article_content(f"{server.base_url}/nota?utm_campaign=portada")
+        self.assertEqual(first, second)
+        self.assertEqual(len(server.requests), 1)
+        stats = generator.content_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_failed_fetch_is_not_cached(self):
+        config = {'article_content_cache': {'enabled': True, 'cache_dir': self.cache_dir}}
+        with LocalHTTPServer({}) as server:
+            generator = BlinkGenerator(app_config=config, fetcher=HttpFetcher({'max_retries': 0}))
+            generator.get_article_content(f"{server.base_url}/caida")
+            generator.get_article_content(f"{server.base_url}/caida")
+        self.assertEqual(len(server.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
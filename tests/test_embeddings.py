@@ -0,0 +1,130 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import unittest
+import zlib
+
+import numpy as np
+
+from news_blink_backend.src.models.embeddings import EmbeddingCache, OllamaEmbedder, cosine_neighbors
+from news_blink_backend.src.models.scraper import NewsScraper
+from tests.http_test_server import LocalHTTPServer
+
+# Embeddings de mentira: cada palabra se traduce a un "concepto" común a ambos idiomas
+_CONCEPTS = {
+    'lanza': 'launch', 'launches': 'launch', 'presenta': 'launch', 'unveils': 'launch',
+    'nuevo': 'new', 'new': 'new', 'teléfono': 'phone', 'phone': 'phone',
+    'retrasa': 'delay', 'delays': 'delay', 'misión': 'mission', 'mission': 'mission',
+    'compra': 'buy', 'buys': 'buy', 'startup': 'startup'
+}
+_DIM = 64
+
+
+def fake_embedding(text):
+    vector = np.zeros(_DIM)
+    for word in re.findall(r'\w+', text.lower()):
+        if len(word) > 3 or word in _CONCEPTS:
+            vector[zlib.crc32(_CONCEPTS.get(word, word).encode('utf-8')) % _DIM] += 1.0
+    return vector.tolist()
+
+
+def embed_route(handler, body):
+    payload = json.loads(body)
+    inputs = payload['input'] if isinstance(payload['input'], list) else [payload['input']]
+    response = {'model': payload['model'], 'embeddings': [fake_embedding(text) for text in inputs]}
+    return 200, {'Content-Type': 'application/json'}, json.dumps(response).encode('utf-8')
+
+
+ITEMS = [
+    {'id': '0', 'title': "Apple presenta su nuevo teléfono iPhone", 'url': "https://elpais.example.com/1"},
+    {'id': '1', 'title': "NASA retrasa la misión Artemis", 'url': "https://elpais.example.com/2"},
+    {'id': '2', 'title': "Apple unveils its new iPhone phone", 'url': "https://techcrunch.example.com/1"},
+    {'id': '3', 'title': "NASA delays Artemis mission again", 'url': "https://techcrunch.example.com/2"},
+    {'id': '4', 'title': "Microsoft compra una startup", 'url': "https://elpais.example.com/3"},
+]
+
+
+class TestOllamaEmbedder(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalHTTPServer({'/api/embed': embed_route}).__enter__()
+        self.tmp_dir = tempfile.mkdtemp(prefix='embeddings_test_')
+        self.cache_path = os.path.join(self.tmp_dir, 'embeddings.sqlite')
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_batches_and_caches_requests(self):
+        embedder = OllamaEmbedder('fake', host=self.server.base_url, cache=EmbeddingCache(self.cache_path), batch_size=2)
+        texts = ["primero texto", "segundo texto", "tercero texto", "cuarto texto", "quinto texto", "primero texto"]
+        vectors = embedder.embed(texts)
+        self.assertEqual(vectors.shape, (6, _DIM))
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+        self.assertEqual(embedder.requests, 3)
+        self.assertEqual(len(self.server.requests), 3)
+
+        again = OllamaEmbedder('fake', host=self.server.base_url, cache=EmbeddingCache(self.cache_path))
+        np.testing.assert_allclose(again.embed(texts[::-1]), vectors[::-1])
+        self.assertEqual(again.requests, 0)
+
+    def test_cosine_neighbors_matches_dense_product(self):
+        vectors = OllamaEmbedder('fake', host=self.server.base_url).embed([item['title'] for item in ITEMS])
+        dense = vectors @ vectors.T
+        sparse = cosine_neighbors(vectors, 0.5, block_rows=2).toarray()
+        np.testing.assert_allclose(sparse, np.where(dense > 0.5, dense, 0), rtol=1e-6)
+
+
+class TestEmbeddingGrouping(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalHTTPServer({'/api/embed': embed_route}).__enter__()
+        self.tmp_dir = tempfile.mkdtemp(prefix='embeddings_test_')
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _scraper(self, method='greedy'):
+        return NewsScraper({
+            'grouping_strategy': 'embeddings',
+            'clustering': {'method': method},
+            'embeddings': {
+                'host': self.server.base_url, 'model': 'fake', 'threshold': 0.7,
+                'cache_path': os.path.join(self.tmp_dir, 'embeddings.sqlite')
+            }
+        })
+
+    def test_groups_same_story_across_languages(self):
+        expected = [['0', '2'], ['1', '3'], ['4']]
+        for method in ('greedy', 'union_find'):
+            groups = self._scraper(method).find_similar_news(ITEMS)
+            self.assertEqual([[item['id'] for item in group] for group in groups], expected, method)
+        # Por similitud de títulos no se agrupan
+        lsh_groups = NewsScraper({'grouping_strategy': 'lsh'}).find_similar_news(ITEMS)
+        self.assertEqual(len(lsh_groups), len(ITEMS))
+        # Una sola petición para todo el lote; la segunda estrategia reutiliza la caché
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_falls_back_to_lsh_when_ollama_fails(self):
+        self.server.routes['/api/embed'] = lambda handler, body: (500, {'Content-Type': 'application/json'},
+                                                                   b'{"error": "model not found"}')
+        scraper = self._scraper()
+        groups = scraper.find_similar_news(ITEMS)
+        self.assertEqual(len(groups), len(ITEMS))
+        self.assertEqual(scraper.calculate_combined_similarity("Apple", "Apple"), 1.0)
+
+    def test_scores_fall_back_to_titles_when_ollama_fails(self):
+        self.server.routes['/api/embed'] = lambda handler, body: (500, {'Content-Type': 'application/json'},
+                                                                   b'{"error": "model not found"}')
+        scraper = self._scraper()
+        scores = scraper.scores_above("NASA retrasa la misión Artemis",
+                                      ["NASA retrasa otra vez la misión Artemis", "Microsoft compra una startup"], 0.7)
+        self.assertIsNotNone(scores[0])
+        self.assertIsNone(scores[1])
+        # Un único intento de embeddings para todo el lote
+        self.assertEqual(len(self.server.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
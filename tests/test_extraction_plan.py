@@ -0,0 +1,59 @@
+import json
+import os
+import unittest
+
+from news_blink_backend.src.models.extraction_plan import SourceExtractionPlan
+from news_blink_backend.src.models.scraper import NewsScraper
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HOMEPAGES_DIR = os.path.join(ROOT_DIR, 'tests', 'fixtures', 'homepages')
+
+
+def _load_config():
+    with open(os.path.join(ROOT_DIR, 'config.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TestSourceExtractionPlan(unittest.TestCase):
+    def test_configured_sources_extract_from_saved_homepages(self):
+        config = _load_config()
+        with open(os.path.join(HOMEPAGES_DIR, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+        scraper = NewsScraper(config)
+        for source in config['news_sources']:
+            with self.subTest(source=source['name']):
+                plan = scraper.extraction_plans[source['name']]
+                self.assertTrue(plan.valid, plan.error)
+                with open(os.path.join(HOMEPAGES_DIR, manifest[source['name']]), encoding='utf-8') as f:
+                    items = plan.extract(f.read(), 'lxml')
+                self.assertEqual(len(items), scraper.default_articles_per_source)
+                self.assertTrue(all(item['url'].startswith('https://') for item in items))
+                self.assertEqual(len({item['id'] for item in items}), len(items))
+
+    def test_relative_links_and_shared_title_selector(self):
+        source = {
+            'name': "Fuente", 'url': "https://fuente.example.com/tecnologia/", 'category': 'tecnologia',
+            'article_selector': 'div.card', 'title_selector': 'h2 a', 'link_selector': 'h2 a', 'summary_selector': 'p'
+        }
+        html = (
+            "<div class='card'><h2><a href='/nota-1'>Titular suficientemente largo</a></h2><p>Resumen</p></div>"
+            "<div class='card'><h2><a href='nota-2'>Otro titular bastante largo</a></h2></div>"
+            "<div class='card'><h2><a href='/corta'>Corto</a></h2></div>"
+        )
+        plan = SourceExtractionPlan(source, max_articles=5)
+        items = plan.extract(html)
+        self.assertIs(plan.link, plan.title)
+        self.assertEqual([item['url'] for item in items],
+                         ["https://fuente.example.com/nota-1", "https://fuente.example.com/tecnologia/nota-2"])
+        self.assertEqual([item['summary'] for item in items], ["Resumen", ""])
+
+    def test_invalid_selector_is_reported_at_startup(self):
+        source = {'name': "Rota", 'url': "https://rota.example.com/", 'category': 'tecnologia',
+                  'article_selector': 'div[', 'title_selector': 'h2 a', 'link_selector': 'h2 a', 'summary_selector': 'p'}
+        scraper = NewsScraper({'news_sources': [source]})
+        self.assertFalse(scraper.extraction_plans["Rota"].valid)
+        self.assertEqual(scraper.scrape_source(source), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from news_blink_backend.src.models.feed_parser import parse_feed, parse_feed_date
+from news_blink_backend.src.models.http_fetcher import HttpFetcher
+from news_blink_backend.src.models.scraper import NewsScraper
+from tests.http_test_server import LocalHTTPServer
+
+
+def _rss(items, encoding='utf-8'):
+    body = ''.join(
+        f"<item><title>{title}</title><link>{link}</link>"
+        f"<description>&lt;p&gt;Resumen de {title}&lt;/p&gt;</description><pubDate>{date}</pubDate></item>"
+        for title, link, date in items
+    )
+    return (f"<?xml version='1.0' encoding='{encoding}'?><rss version='2.0'><channel><title>Feed</title>"
+            f"{body}</channel></rss>").encode(encoding)
+
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Feed Atom</title>
+  <entry>
+    <title type="html">Nuevo chip de &lt;b&gt;inteligencia artificial&lt;/b&gt;</title>
+    <link rel="replies" href="/comentarios/1"/>
+    <link rel="alternate" href="/2024/chip-ia"/>
+    <updated>2024-05-02T10:00:00Z</updated>
+    <published>2024-05-01T08:30:00+02:00</published>
+    <summary>Resumen del chip</summary>
+  </entry>
+</feed>"""
+
+
+class TestParseFeed(unittest.TestCase):
+    def test_rss_entries(self):
+        data = _rss([("Primera noticia del feed", "https://example.com/1", "Wed, 01 May 2024 10:00:00 GMT")])
+        entries = parse_feed(data.decode('utf-8'))
+        self.assertEqual(entries[0]['title'], "Primera noticia del feed")
+        self.assertEqual(entries[0]['link'], "https://example.com/1")
+        self.assertEqual(entries[0]['summary'], "Resumen de Primera noticia del feed")
+        self.assertEqual(entries[0]['published'], datetime(2024, 5, 1, 10, tzinfo=timezone.utc))
+
+    def test_atom_entries(self):
+        entries = parse_feed(ATOM.decode('utf-8'), base_url="https://blog.example.com/feed")
+        self.assertEqual(entries[0]['title'], "Nuevo chip de inteligencia artificial")
+        self.assertEqual(entries[0]['link'], "https://blog.example.com/2024/chip-ia")
+        self.assertEqual(entries[0]['published'], datetime(2024, 5, 1, 6, 30, tzinfo=timezone.utc))
+
+    def test_limit_stops_parsing(self):
+        items = [(f"Noticia numero {i}", f"https://example.com/{i}", "") for i in range(50)]
+        self.assertEqual(len(parse_feed(_rss(items).decode('utf-8'), limit=3)), 3)
+
+    def test_unparseable_dates(self):
+        self.assertIsNone(parse_feed_date("ayer por la tarde"))
+        self.assertEqual(parse_feed_date("2024-05-01T10:00:00").tzinfo, timezone.utc)
+
+
+class TestFeedScraping(unittest.TestCase):
+    def _source(self, server, **extra):
+        source = {
+            'name': "Fuente con feed",
+            'url': f"{server.base_url}/",
+            'feed_url': f"{server.base_url}/feed",
+            'article_selector': 'article',
+            'title_selector': 'h2 a',
+            'link_selector': 'h2 a',
+            'summary_selector': 'p',
+            'category': 'tecnologia'
+        }
+        source.update(extra)
+        return source
+
+    def _scraper(self, source):
+        config = {'news_sources': [source], 'scrape_per_host_delay_seconds': 0}
+        return NewsScraper(config, fetcher=HttpFetcher({'max_retries': 0}))
+
+    def test_feed_skips_homepage_and_keeps_publish_dates(self):
+        now = datetime.now(timezone.utc)
+        fmt = '%a, %d %b %Y %H:%M:%S +0000'
+        items = [
+            ("Noticia reciente de tecnología", "https://example.com/reciente", (now - timedelta(hours=2)).strftime(fmt)),
+            ("Noticia antigua de tecnología", "https://example.com/antigua", (now - timedelta(days=3)).strftime(fmt)),
+        ]
+        routes = {'/feed': (200, {'Content-Type': 'application/rss+xml; charset=ISO-8859-1'}, _rss(items, 'ISO-8859-1'))}
+        with LocalHTTPServer(routes) as server:
+            news = self._scraper(self._source(server)).scrape_all_sources()
+        self.assertEqual([n['title'] for n in news], ["Noticia reciente de tecnología"])
+        self.assertEqual([r['path'] for r in server.requests], ['/feed'])
+        expected = (now - timedelta(hours=2)).astimezone().replace(tzinfo=None, microsecond=0)
+        self.assertEqual(datetime.fromisoformat(news[0]['timestamp']), expected)
+
+    def test_broken_feed_falls_back_to_homepage(self):
+        homepage = b"<html><body><article><h2><a href='/nota'>Titular de la portada HTML</a></h2></article></body></html>"
+        routes = {
+            '/feed': (200, {'Content-Type': 'application/rss+xml'}, b'<rss><channel><item>'),
+            '/': (200, {'Content-Type': 'text/html'}, homepage),
+        }
+        with LocalHTTPServer(routes) as server:
+            news = self._scraper(self._source(server)).scrape_source(self._source(server))
+        self.assertEqual([n['title'] for n in news], ["Titular de la portada HTML"])
+
+    def test_filter_recent_news_handles_aware_timestamps(self):
+        scraper = NewsScraper({'recency_filter_hours': 24})
+        recent = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        old = (datetime.now(timezone.utc) - timedelta(hours=30)).isoformat()
+        kept = scraper.filter_recent_news([{'timestamp': recent}, {'timestamp': old}])
+        self.assertEqual(kept, [{'timestamp': recent}])
+
+
+if __name__ == '__main__':
+    unittest.main()
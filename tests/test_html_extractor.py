@@ -0,0 +1,92 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from news_blink_backend.src.models import html_extractor
+from news_blink_backend.src.models.html_extractor import extract_article
+from news_blink_backend.src.models.http_fetcher import HttpFetcher
+from news_blink_backend.src.models.superior_note_generator import SuperiorNoteGenerator
+from tests.http_test_server import LocalHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'articles')
+BASE_URL = 'https://www.example.com/seccion/nota.html'
+LONG_TEXT = "Este parrafo tiene la longitud suficiente para contar como contenido"
+
+
+class TestHtmlExtractor(unittest.TestCase):
+    def _both(self, html, **kwargs):
+        fast = extract_article(html, BASE_URL, backend='lxml', **kwargs)
+        classic = extract_article(html, BASE_URL, backend='html.parser', **kwargs)
+        self.assertEqual(fast, classic)
+        return fast
+
+    def test_saved_pages_match_beautifulsoup_backend(self):
+        pages = sorted(f for f in os.listdir(FIXTURES_DIR) if f.endswith('.html'))
+        self.assertTrue(pages)
+        for filename in pages:
+            with open(os.path.join(FIXTURES_DIR, filename), encoding='utf-8') as f:
+                html = f.read()
+            with self.subTest(page=filename):
+                result = self._both(html)
+                self.assertGreater(len(result['content']), 1000)
+                self.assertIsNotNone(result['image_url'])
+
+    def test_removed_tags_and_comments(self):
+        html = (
+            f"<html><body><header><article><p>{LONG_TEXT} en la cabecera</p></article></header>"
+            f"<article><p>{LONG_TEXT}<!-- nota --> y sigue<script>var x = 1;</script> hasta el final</p>"
+            f"<aside><p>{LONG_TEXT} en un lateral</p></aside><p>Corto</p></article></body></html>"
+        )
+        result = self._both(html)
+        self.assertEqual(result['content'], f"{LONG_TEXT} y sigue hasta el final")
+
+    def test_selector_priority_and_min_length(self):
+        html = (
+            f"<html><body><div class='post-content'><p>{LONG_TEXT} del div</p></div>"
+            f"<main><p>{LONG_TEXT} del main</p><p>Veinticinco caracteres aq</p></main></body></html>"
+        )
+        self.assertEqual(self._both(html)['content'], f"{LONG_TEXT} del main")
+        self.assertIn("Veinticinco", self._both(html, min_paragraph_chars=20)['content'])
+
+    def test_meta_image_priority(self):
+        html = (
+            "<html><head><meta property='og:image' content=''>"
+            "<meta property='twitter:image' content='https://img.example.com/prop.jpg'>"
+            "<meta name='twitter:image' content='https://img.example.com/name.jpg'></head>"
+            f"<body><article><p>{LONG_TEXT}</p></article></body></html>"
+        )
+        self.assertEqual(self._both(html)['image_url'], 'https://img.example.com/name.jpg')
+
+    def test_inline_image_fallback(self):
+        html = (
+            f"<html><body><article><img src='/icono.png' width='48'><img data-src='/fotos/a.jpg' width='100%'>"
+            f"<p>{LONG_TEXT}</p></article></body></html>"
+        )
+        self.assertEqual(self._both(html)['image_url'], 'https://www.example.com/fotos/a.jpg')
+
+    def test_empty_document(self):
+        self.assertEqual(self._both("   "), {'content': '', 'image_url': None})
+
+    def test_falls_back_without_lxml(self):
+        html = f"<html><body><article><p>{LONG_TEXT}</p></article></body></html>"
+        with patch.object(html_extractor, 'etree', None), patch.object(html_extractor, '_extract_single_pass') as fast:
+            result = extract_article(html, BASE_URL, backend='lxml')
+        fast.assert_not_called()
+        self.assertEqual(result['content'], LONG_TEXT)
+
+
+class TestSuperiorNoteParser(unittest.TestCase):
+    def test_uses_configured_parser(self):
+        html = f"<html><body><nav><p>{LONG_TEXT} en el menú</p></nav><article><p>{LONG_TEXT}</p></article></body></html>"
+        generator = SuperiorNoteGenerator(app_config={'html_parser': 'html.parser'},
+                                          fetcher=HttpFetcher({'max_retries': 0}))
+        self.assertEqual(generator.html_parser, 'html.parser')
+        with LocalHTTPServer({'/nota': (200, {'Content-Type': 'text/html'}, html.encode('utf-8'))}) as server, \
+                patch.object(html_extractor, '_extract_single_pass') as fast:
+            result = generator._get_article_content(f"{server.base_url}/nota")
+        fast.assert_not_called()
+        self.assertEqual(result['content'], LONG_TEXT)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from news_blink_backend.src.models.http_fetcher import ContentTypeError, HttpFetcher
+from news_blink_backend.src.models.blink_generator import BlinkGenerator
+from news_blink_backend.src.models.scraper import NewsScraper
+from tests.http_test_server import LocalHTTPServer
+
+ARTICLE_HTML = (
+    b"<html><head><meta property='og:image' content='https://img.example.com/a.jpg'></head>"
+    b"<body><article><p>Este es un parrafo suficientemente largo para contar como contenido.</p>"
+    b"</article></body></html>"
+)
+HTML_HEADERS = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+class TestHttpFetcher(unittest.TestCase):
+    def test_connections_are_reused_for_same_host(self):
+        routes = {f"/articulo-{i}": (200, HTML_HEADERS, ARTICLE_HTML) for i in range(5)}
+        with LocalHTTPServer(routes) as server:
+            fetcher = HttpFetcher({'max_retries': 0})
+            for i in range(5):
+                fetcher.get(f"{server.base_url}/articulo-{i}")
+            fetcher.close()
+        self.assertEqual(len(server.requests), 5)
+        self.assertEqual(server.connection_count, 1)
+
+    def test_retries_transient_errors(self):
+        attempts = []
+
+        def flaky(handler):
+            attempts.append(1)
+            if len(attempts) < 3:
+                return 503, {'Content-Type': 'text/plain'}, b'busy'
+            return 200, HTML_HEADERS, ARTICLE_HTML
+
+        with LocalHTTPServer({'/flaky': flaky}) as server:
+            fetcher = HttpFetcher({'max_retries': 3, 'backoff_factor': 0})
+            response = fetcher.get(f"{server.base_url}/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(attempts), 3)
+
+    def test_http_errors_raise(self):
+        with LocalHTTPServer({}) as server:
+            fetcher = HttpFetcher({'max_retries': 0})
+            with self.assertRaises(requests.HTTPError):
+                fetcher.get(f"{server.base_url}/no-existe")
+
+    def test_sends_user_agent(self):
+        with LocalHTTPServer({'/': (200, HTML_HEADERS, ARTICLE_HTML)}) as server:
+            HttpFetcher().get(f"{server.base_url}/")
+        self.assertIn('Mozilla/5.0', server.requests[0]['headers'].get('User-Agent', ''))
+
+    def test_components_share_injected_fetcher(self):
+        routes = {f"/nota-{i}": (200, HTML_HEADERS, ARTICLE_HTML) for i in range(4)}
+        with LocalHTTPServer(routes) as server:
+            fetcher = HttpFetcher({'max_retries': 0})
+            scraper = NewsScraper({}, fetcher=fetcher)
+            generator = BlinkGenerator(fetcher=fetcher)
+            scraper.get_article_content(f"{server.base_url}/nota-0")
+            scraper.get_article_content(f"{server.base_url}/nota-1")
+            data = generator.get_article_content(f"{server.base_url}/nota-2")
+            generator.get_article_content(f"{server.base_url}/nota-3")
+        self.assertEqual(server.connection_count, 1)
+        self.assertEqual(data['image_url'], 'https://img.example.com/a.jpg')
+        self.assertIn('parrafo suficientemente largo', data['content'])
+
+
+class TestConditionalCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix='http_cache_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    @staticmethod
+    def _etag_route(body, etag='"v1"'):
+        def route(handler):
+            if handler.headers.get('If-None-Match') == etag:
+                return 304, {'ETag': etag}, b''
+            return 200, dict(HTML_HEADERS, ETag=etag), body
+        return route
+
+    def test_not_modified_reuses_stored_body(self):
+        with LocalHTTPServer({'/portada': self._etag_route(ARTICLE_HTML)}) as server:
+            fetcher = HttpFetcher({'conditional_cache': True, 'cache_dir': self.cache_dir})
+            first = fetcher.fetch(f"{server.base_url}/portada")
+            second = fetcher.fetch(f"{server.base_url}/portada")
+        self.assertFalse(first.not_modified)
+        self.assertTrue(second.not_modified)
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(server.requests[1]['headers'].get('If-None-Match'), '"v1"')
+
+    def test_responses_without_validators_are_not_cached(self):
+        with LocalHTTPServer({'/sin-validadores': (200, HTML_HEADERS, ARTICLE_HTML)}) as server:
+            fetcher = HttpFetcher({'conditional_cache': True, 'cache_dir': self.cache_dir})
+            fetcher.fetch(f"{server.base_url}/sin-validadores")
+            second = fetcher.fetch(f"{server.base_url}/sin-validadores")
+        self.assertFalse(second.not_modified)
+        self.assertNotIn('If-None-Match', server.requests[1]['headers'])
+
+    def test_not_modified_article_skips_parsing(self):
+        with LocalHTTPServer({'/nota': self._etag_route(ARTICLE_HTML)}) as server:
+            fetcher = HttpFetcher({'conditional_cache': True, 'cache_dir': self.cache_dir})
+            generator = BlinkGenerator(fetcher=fetcher)
+            url = f"{server.base_url}/nota"
+            first = generator.get_article_content(url)
+            with patch('news_blink_backend.src.models.blink_generator.extract_article') as extract_mock:
+                second = generator.get_article_content(url)
+            extract_mock.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_changed_body_invalidates_extraction(self):
+        routes = {'/nota': self._etag_route(ARTICLE_HTML)}
+        with LocalHTTPServer(routes) as server:
+            fetcher = HttpFetcher({'conditional_cache': True, 'cache_dir': self.cache_dir})
+            url = f"{server.base_url}/nota"
+            fetcher.fetch(url)
+            fetcher.store_extracted(url, 'blink_article', {'content': 'viejo', 'image_url': None})
+            routes['/nota'] = self._etag_route(ARTICLE_HTML.replace(b'parrafo', b'texto'), etag='"v2"')
+            result = fetcher.fetch(url)
+        self.assertFalse(result.not_modified)
+        self.assertIsNone(fetcher.get_extracted(url, 'blink_article'))
+
+    def test_truncated_body_is_not_served_after_not_modified(self):
+        with LocalHTTPServer({'/nota': self._etag_route(ARTICLE_HTML)}) as server:
+            fetcher = HttpFetcher({'conditional_cache': True, 'cache_dir': self.cache_dir, 'max_bytes': 50})
+            url = f"{server.base_url}/nota"
+            first = fetcher.fetch(url)
+            fetcher.store_extracted(url, 'blink_article', {'content': 'cortado', 'image_url': None})
+            second = fetcher.fetch(url)
+        self.assertTrue(first.truncated)
+        self.assertFalse(second.not_modified)
+        self.assertTrue(second.truncated)
+        self.assertNotIn('If-None-Match', server.requests[1]['headers'])
+        self.assertIsNone(fetcher.get_extracted(url, 'blink_article'))
+
+
+class TestStreamingLimits(unittest.TestCase):
+    def test_body_is_truncated_at_byte_cap(self):
+        chunk = b'<p>' + b'x' * 65533
+        total = 64 * 1024 * len(chunk)
+        routes = {'/pesada': (200, {'Content-Type': 'text/html', 'Content-Length': str(total)}, (chunk for _ in range(64 * 1024)))}
+        with LocalHTTPServer(routes) as server:
+            result = HttpFetcher({'max_retries': 0, 'max_bytes': 100000}).fetch(f"{server.base_url}/pesada")
+        self.assertTrue(result.truncated)
+        self.assertEqual(len(result.text), 100000)
+        self.assertLess(server.bytes_sent, total // 100)
+
+    def test_non_html_is_rejected_before_parsing(self):
+        routes = {'/informe.pdf': (200, {'Content-Type': 'application/pdf'}, b'%PDF-1.7' * 1000)}
+        with LocalHTTPServer(routes) as server:
+            fetcher = HttpFetcher({'max_retries': 0})
+            with self.assertRaises(ContentTypeError):
+                fetcher.fetch(f"{server.base_url}/informe.pdf")
+            data = BlinkGenerator(fetcher=fetcher).get_article_content(f"{server.base_url}/informe.pdf")
+        self.assertEqual(data, {'content': '', 'image_url': None})
+
+    def test_allowed_content_types_can_be_overridden(self):
+        routes = {'/feed': (200, {'Content-Type': 'application/rss+xml'}, b'<rss></rss>')}
+        with LocalHTTPServer(routes) as server:
+            result = HttpFetcher({'max_retries': 0}).fetch(f"{server.base_url}/feed", allowed_content_types=('application/rss+xml',))
+        self.assertEqual(result.text, '<rss></rss>')
+
+    def test_decodes_with_declared_or_meta_charset(self):
+        text = 'Información del año'
+        routes = {
+            '/cabecera': (200, {'Content-Type': 'text/html; charset=ISO-8859-1'}, text.encode('latin-1')),
+            '/meta': (200, {'Content-Type': 'text/html'}, f"<meta charset='windows-1252'>{text}".encode('cp1252')),
+            '/sin-charset': (200, {'Content-Type': 'text/html'}, text.encode('utf-8')),
+        }
+        with LocalHTTPServer(routes) as server:
+            fetcher = HttpFetcher({'max_retries': 0})
+            self.assertEqual(fetcher.fetch(f"{server.base_url}/cabecera").text, text)
+            self.assertTrue(fetcher.fetch(f"{server.base_url}/meta").text.endswith(text))
+            self.assertEqual(fetcher.fetch(f"{server.base_url}/sin-charset").text, text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from news_blink_backend.src.models.blink_generator import BlinkGenerator
+from news_blink_backend.src.models.llm_cache import LLMResponseCache, cached_chat, request_key
+
+
+class EchoOllama:
+    """Cliente falso que responde con el prompt recibido y cuenta las llamadas"""
+
+    def __init__(self, reply=None):
+        self.reply = reply
+        self.calls = 0
+
+    def chat(self, model, messages, format=None, options=None, stream=False):
+        self.calls += 1
+        content = self.reply if self.reply is not None else f"{model}: {messages[-1]['content']}"
+        if stream:
+            words = content.split(' ')
+            return iter([{'message': {'role': 'assistant', 'content': (' ' if position else '') + word}}
+                         for position, word in enumerate(words)])
+        return {'message': {'role': 'assistant', 'content': content}}
+
+
+def _messages(prompt):
+    return [{'role': 'user', 'content': prompt}]
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='llm_cache_test_')
+        self.path = os.path.join(self.tmp_dir, 'llm_cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_key_covers_model_prompt_and_options(self):
+        key = request_key('llama3.1:8b', _messages('hola'), {'temperature': 0.2})
+        self.assertEqual(key, request_key('llama3.1:8b', _messages('hola'), {'temperature': 0.2}))
+        self.assertNotEqual(key, request_key('qwen3:32b', _messages('hola'), {'temperature': 0.2}))
+        self.assertNotEqual(key, request_key('llama3.1:8b', _messages('adiós'), {'temperature': 0.2}))
+        self.assertNotEqual(key, request_key('llama3.1:8b', _messages('hola'), {'temperature': 0.3}))
+        self.assertNotEqual(key, request_key('llama3.1:8b', _messages('hola'), {'temperature': 0.2}, format='json'))
+
+    def test_repeated_requests_are_served_from_disk(self):
+        client = EchoOllama()
+        cache = LLMResponseCache(self.path)
+        first = cached_chat(client, cache, model='m', messages=_messages('hola'), options={'temperature': 0.1})
+        second = cached_chat(client, cache, model='m', messages=_messages('hola'), options={'temperature': 0.1})
+        self.assertEqual(second['message']['content'], first['message']['content'])
+        self.assertEqual(client.calls, 1)
+
+        reopened = LLMResponseCache(self.path)
+        cached_chat(client, reopened, model='m', messages=_messages('hola'), options={'temperature': 0.1})
+        cached_chat(client, reopened, model='m', messages=_messages('hola'), options={'temperature': 0.5})
+        self.assertEqual(client.calls, 2)
+        stats = reopened.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate'], stats['entries']), (1, 1, 0.5, 2))
+
+    def test_empty_answers_are_not_cached(self):
+        client = EchoOllama(reply='')
+        cache = LLMResponseCache(self.path)
+        for _ in range(2):
+            cached_chat(client, cache, model='m', messages=_messages('hola'))
+        self.assertEqual((client.calls, len(cache)), (2, 0))
+
+    def test_streamed_answer_is_cut_and_cached(self):
+        client = EchoOllama(reply="sí porque encaja bien con la categoría")
+        cache = LLMResponseCache(self.path)
+        for _ in range(2):
+            response = cached_chat(client, cache, until=lambda text: 'porque' in text, model='m', messages=_messages('¿?'))
+            self.assertEqual(response['message']['content'], "sí porque")
+        self.assertEqual(client.calls, 1)
+
+    def test_cut_answer_is_not_served_to_full_requests(self):
+        client = EchoOllama(reply="sí porque encaja bien con la categoría")
+        cache = LLMResponseCache(self.path)
+        cached_chat(client, cache, until=lambda text: 'porque' in text, model='m', messages=_messages('¿?'))
+        response = cached_chat(client, cache, model='m', messages=_messages('¿?'))
+        self.assertEqual(response['message']['content'], "sí porque encaja bien con la categoría")
+        self.assertEqual(client.calls, 2)
+
+    def test_evicts_least_recently_used_over_size_limit(self):
+        cache = LLMResponseCache(self.path, max_size_mb=3500 / (1024 * 1024))
+        for name in ('a', 'b', 'c'):
+            cache.put(name, 'm', name * 1000)
+        self.assertIsNotNone(cache.get('a'))  # 'a' pasa a ser la más reciente
+        cache.put('d', 'm', 'd' * 1000)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual([cache.get(key) is not None for key in ('a', 'c', 'd')], [True, True, True])
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertLessEqual(cache.stats()['size_mb'] * 1024 * 1024, 3500)
+
+
+class TestGeneratorUsesCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='llm_cache_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_regenerating_a_blink_repeats_no_calls(self):
+        cache = LLMResponseCache(os.path.join(self.tmp_dir, 'llm_cache.sqlite'))
+        group = [{'title': "La misión lunar se retrasa", 'url': 'https://example.com/1', 'source': 'EFE'}]
+        content = {'urls': ['https://example.com/1'], 'sources': ['EFE'], 'article_contents': [], 'fingerprints': [],
+                   'combined_content': "La misión lunar se retrasa seis meses por un fallo en el motor.", 'image_url': None}
+        client = EchoOllama()
+        blinks = []
+        for _ in range(2):
+            generator = BlinkGenerator(app_config={'category_classification': 'determine_verify'}, llm_cache=cache)
+            generator.ollama_client = client
+            blinks.append(generator.generate_blink_from_news_group(group, content))
+        self.assertEqual(client.calls, 5)
+        self.assertEqual(blinks[1]['content'], blinks[0]['content'])
+        self.assertEqual(cache.stats()['hits'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
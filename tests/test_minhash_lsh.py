@@ -0,0 +1,75 @@
+import unittest
+
+from news_blink_backend.src.models.minhash_lsh import MinHashLSH
+from news_blink_backend.src.models.scraper import NewsScraper
+from news_blink_backend.src.models.text_features import TitleFeatures
+
+TITLES = [
+    "Apple presenta el nuevo iPhone 16 con inteligencia artificial",
+    "Google lanza Gemini 2 para competir con ChatGPT",
+    "Apple presenta el iPhone 16 con inteligencia artificial integrada",
+    "Microsoft compra una startup de ciberseguridad por 500 millones",
+    "Nuevo iPhone 16 de Apple: inteligencia artificial para todos",
+    "Google lanza Gemini 2, su respuesta a ChatGPT",
+    "La NASA retrasa otra vez la misión Artemis III",
+    "Microsoft compra startup de ciberseguridad por 500 millones de dólares",
+    "Tesla recorta precios del Model 3 en Europa",
+    "La NASA vuelve a retrasar la misión Artemis III hasta 2027",
+    "SpaceX logra recuperar el propulsor Super Heavy con la torre",
+    "Tesla baja los precios del Model 3 en Europa",
+]
+
+
+def _items(titles):
+    return [{'id': str(i), 'title': title, 'url': f"https://example.com/{i}"} for i, title in enumerate(titles)]
+
+
+class TestMinHashLSH(unittest.TestCase):
+    def test_similar_sets_become_candidates(self):
+        lsh = MinHashLSH(num_perm=64, bands=32)
+        sets = [
+            {'apple', 'presenta', 'iphone', 'inteligencia', 'artificial'},
+            {'tesla', 'recorta', 'precios', 'model', 'europa'},
+            {'apple', 'presenta', 'iphone', 'inteligencia', 'artificial', 'integrada'},
+            set(),
+            set()
+        ]
+        neighbors = lsh.candidate_neighbors(sets)
+        self.assertIn(2, neighbors[0])
+        self.assertNotIn(1, neighbors[0])
+        # Los títulos sin palabras clave no colisionan entre sí
+        self.assertEqual(neighbors[3], [])
+
+    def test_signatures_are_deterministic(self):
+        sets = [{'apple', 'iphone'}, {'google', 'gemini'}]
+        first = MinHashLSH(seed=3).signatures(sets)
+        second = MinHashLSH(seed=3).signatures(sets)
+        self.assertEqual(first.shape, (2, 64))
+        self.assertTrue((first == second).all())
+
+    def test_bands_must_divide_permutations(self):
+        with self.assertRaises(ValueError):
+            MinHashLSH(num_perm=64, bands=30)
+
+
+class TestLshGrouping(unittest.TestCase):
+    def test_same_groups_as_greedy(self):
+        items = _items(TITLES)
+        greedy = NewsScraper({'grouping_strategy': 'greedy'}).find_similar_news(items)
+        lsh = NewsScraper({'grouping_strategy': 'lsh'}).find_similar_news(items)
+        as_ids = lambda groups: [[item['id'] for item in group] for group in groups]
+        self.assertEqual(as_ids(lsh), as_ids(greedy))
+        self.assertLess(len(lsh), len(items))
+
+    def test_combined_exceeds_matches_combined_similarity(self):
+        scraper = NewsScraper({})
+        for a in TITLES:
+            for b in TITLES:
+                for threshold in (0.3, 0.5, 0.6, 0.8):
+                    expected = scraper.calculate_combined_similarity(a, b) > threshold
+                    got = NewsScraper._combined_exceeds(TitleFeatures(a), TitleFeatures(b), threshold)
+                    self.assertEqual(got, expected, (a, b, threshold))
+
+
+if __name__ == '__main__':
+    unittest.main()
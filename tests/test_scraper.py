@@ -0,0 +1,119 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from news_blink_backend.src.models.scraper import NewsScraper, HostRateLimiter
+from news_blink_backend.src.models.text_features import TitleFeatures
+
+
+def _make_sources(n):
+    return [
+        {
+            'name': f"Fuente {i}",
+            'url': f"https://fuente{i}.example.com/",
+            'article_selector': 'article',
+            'title_selector': 'h2 a',
+            'link_selector': 'h2 a',
+            'summary_selector': 'p',
+            'category': 'tecnologia'
+        }
+        for i in range(n)
+    ]
+
+
+class TestHostRateLimiter(unittest.TestCase):
+    def test_same_host_is_spaced(self):
+        limiter = HostRateLimiter(0.05)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.wait("https://elpais.com/tecnologia/")
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_different_hosts_do_not_wait(self):
+        limiter = HostRateLimiter(0.5)
+        start = time.monotonic()
+        limiter.wait("https://elpais.com/")
+        limiter.wait("https://www.xataka.com/")
+        limiter.wait("https://techcrunch.com/")
+        self.assertLess(time.monotonic() - start, 0.2)
+
+    def test_zero_interval_disables_limiter(self):
+        limiter = HostRateLimiter(0)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.wait("https://elpais.com/")
+        self.assertLess(time.monotonic() - start, 0.05)
+
+
+class TestConcurrentScrape(unittest.TestCase):
+    def _fake_scrape_source(self, delay):
+        def fake(source):
+            time.sleep(delay)
+            return [{'id': source['name'], 'title': source['name'], 'url': source['url']}]
+        return fake
+
+    def test_wall_clock_tracks_slowest_source(self):
+        sources = _make_sources(6)
+        scraper = NewsScraper({'news_sources': sources, 'scrape_max_workers': 6})
+        with patch.object(scraper, 'scrape_source', side_effect=self._fake_scrape_source(0.2)):
+            start = time.monotonic()
+            news = scraper.scrape_all_sources()
+            elapsed = time.monotonic() - start
+        self.assertEqual(len(news), 6)
+        self.assertLess(elapsed, 0.2 * 6 / 2)
+
+    def test_results_keep_source_order(self):
+        sources = _make_sources(5)
+        scraper = NewsScraper({'news_sources': sources, 'scrape_max_workers': 5})
+        delays = {s['name']: 0.05 * (5 - i) for i, s in enumerate(sources)}
+
+        def fake(source):
+            time.sleep(delays[source['name']])
+            return [{'id': source['name'], 'title': source['name'], 'url': source['url']}]
+
+        with patch.object(scraper, 'scrape_source', side_effect=fake):
+            news = scraper.scrape_all_sources()
+        self.assertEqual([n['id'] for n in news], [s['name'] for s in sources])
+
+    def test_failing_source_does_not_abort_run(self):
+        sources = _make_sources(3)
+        scraper = NewsScraper({'news_sources': sources, 'scrape_max_workers': 3})
+
+        def fake(source):
+            if source['name'] == "Fuente 1":
+                raise RuntimeError("boom")
+            return [{'id': source['name'], 'title': source['name'], 'url': source['url']}]
+
+        with patch.object(scraper, 'scrape_source', side_effect=fake):
+            news = scraper.scrape_all_sources()
+        self.assertEqual([n['id'] for n in news], ["Fuente 0", "Fuente 2"])
+
+
+class TestTitleFeatures(unittest.TestCase):
+    TITLES = [
+        "Apple presenta el iPhone 16 con inteligencia artificial",
+        "Apple presenta el iPhone 16 con IA integrada",
+        "Google lanza Gemini 2 para competir con ChatGPT",
+        "Google lanza Gemini 2",
+    ]
+
+    def test_features_give_same_similarity_as_titles(self):
+        scraper = NewsScraper({})
+        for a in self.TITLES:
+            for b in self.TITLES:
+                self.assertEqual(scraper.calculate_combined_similarity(TitleFeatures(a), TitleFeatures(b)),
+                                 scraper.calculate_combined_similarity(a, b))
+
+    def test_grouping_extracts_keywords_once_per_title(self):
+        scraper = NewsScraper({'grouping_strategy': 'greedy'})
+        items = [{'id': str(i), 'title': title} for i, title in enumerate(self.TITLES)]
+        with patch('news_blink_backend.src.models.text_features.extract_keywords',
+                   wraps=NewsScraper._extract_keywords) as extract:
+            groups = scraper.find_similar_news(items)
+            scraper.find_similar_news(items)
+        self.assertEqual(extract.call_count, len(self.TITLES))
+        self.assertEqual([[item['id'] for item in group] for group in groups], [['0', '1'], ['2', '3']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from news_blink_backend.src.models.scraper import NewsScraper
+from news_blink_backend.src.models.seen_url_index import SeenUrlIndex
+
+
+class TestSeenUrlIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='seen_urls_test_')
+        self.path = os.path.join(self.tmp_dir, 'seen_urls.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_marked_urls_persist_normalized(self):
+        index = SeenUrlIndex(self.path)
+        index.mark(["https://Elpais.com/tecnologia/nota.html?utm_source=rss"])
+        index.save()
+        reloaded = SeenUrlIndex(self.path)
+        self.assertTrue(reloaded.contains("https://elpais.com/tecnologia/nota.html#comentarios"))
+        self.assertFalse(reloaded.contains("https://elpais.com/tecnologia/otra.html"))
+
+    def test_entries_expire(self):
+        index = SeenUrlIndex(self.path, ttl_days=0.3 / 86400)
+        index.mark(["https://example.com/nota"])
+        self.assertTrue(index.contains("https://example.com/nota"))
+        time.sleep(0.4)
+        self.assertFalse(index.contains("https://example.com/nota"))
+        index.save()
+        self.assertEqual(len(SeenUrlIndex(self.path)), 0)
+
+    def test_scraper_drops_known_urls_before_grouping(self):
+        config = {
+            'news_sources': [{'name': "Fuente", 'url': "https://fuente.example.com/"}],
+            'seen_url_index': {'enabled': True, 'path': self.path}
+        }
+        scraper = NewsScraper(config)
+        scraper.seen_index.mark(["https://fuente.example.com/vieja"])
+        items = [
+            {'id': '1', 'title': "Noticia ya publicada", 'url': "https://fuente.example.com/vieja?utm_medium=feed"},
+            {'id': '2', 'title': "Noticia nueva", 'url': "https://fuente.example.com/nueva"},
+        ]
+        with patch.object(scraper, 'scrape_source', return_value=items):
+            news = scraper.scrape_all_sources()
+        self.assertEqual([n['id'] for n in news], ['2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from news_blink_backend.src.models.blink_generator import BlinkGenerator
+from news_blink_backend.src.models.http_fetcher import HttpFetcher
+from news_blink_backend.src.models.news import News
+from news_blink_backend.src.models.scraper import NewsScraper
+from news_blink_backend.src.models.simhash import SimHashIndex, hamming_distance, simhash
+from news_blink_backend.src.models.story_clusterer import OnlineStoryClusterer
+from tests.http_test_server import LocalHTTPServer
+
+WIRE = (
+    "La Agencia Espacial Europea ha confirmado este martes que el lanzamiento de la sonda de exploración "
+    "lunar se retrasará al menos seis meses por un fallo detectado en el sistema de propulsión durante las "
+    "pruebas finales en la Guayana Francesa. Según el comunicado oficial, los ingenieros identificaron una "
+    "fuga en una de las válvulas del motor principal que obliga a desmontar parte de la etapa superior del "
+    "cohete. La misión, que cuenta con la participación de doce países y un presupuesto de más de mil "
+    "millones de euros, tenía previsto despegar el próximo mes de marzo. Los responsables del programa "
+    "aseguran que el retraso no afectará a los objetivos científicos de la misión. Fuentes de la agencia "
+    "explicaron que el calendario revisado se presentará a los estados miembros en la próxima reunión del "
+    "consejo, prevista para finales de mes en París. Allí se decidirá también si la sonda mantiene la órbita "
+    "de aproximación prevista o si se opta por una trayectoria más larga que ahorre combustible. La industria "
+    "europea, que ha invertido en el proyecto durante casi una década, confía en que el aplazamiento sirva "
+    "para reforzar las pruebas de otros componentes críticos antes del lanzamiento definitivo."
+)
+OTHER = (
+    "El Gobierno ha aprobado este martes en el Consejo de Ministros el anteproyecto de ley de vivienda que "
+    "limitará los precios del alquiler en las zonas tensionadas y creará un registro estatal de grandes "
+    "tenedores. La norma, que ahora iniciará su tramitación parlamentaria, incluye bonificaciones fiscales "
+    "para los propietarios que rebajen la renta y obliga a las comunidades autónomas a declarar las áreas "
+    "afectadas en un plazo de seis meses. Las asociaciones de inquilinos han valorado positivamente la "
+    "medida, aunque reclaman que se amplíe a los contratos de temporada."
+)
+
+
+def _html(text):
+    return f"<html><body><article><p>{text}</p></article></body></html>".encode('utf-8')
+
+
+class TestSimHash(unittest.TestCase):
+    def test_near_duplicates_are_close(self):
+        copy = "EUROPA PRESS. " + WIRE.replace("este martes", "hoy") + " Más información en nuestra web."
+        self.assertLessEqual(hamming_distance(simhash(WIRE), simhash(copy)), 6)
+        self.assertGreater(hamming_distance(simhash(WIRE), simhash(OTHER)), 6)
+        self.assertIsNone(simhash("Texto demasiado corto"))
+
+
+class TestSimHashIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='simhash_test_')
+        self.path = os.path.join(self.tmp_dir, 'simhash.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_finds_fingerprints_within_distance(self):
+        index = SimHashIndex(self.path, max_distance=3)
+        index.add('a', [0b1111 << 40, None])
+        self.assertEqual(index.find([(0b1111 << 40) ^ 0b111])['id'], 'a')
+        self.assertEqual(index.find([(0b1111 << 40) ^ 0b111])['distance'], 3)
+        self.assertIsNone(index.find([(0b1111 << 40) ^ 0b1111]))
+        self.assertIsNone(index.find([None]))
+
+    def test_journal_drops_expired_fingerprints(self):
+        index = SimHashIndex(self.path, retention_hours=24)
+        index.add('viejo', [0xFFFF], (datetime.now() - timedelta(hours=48)).isoformat())
+        index.add('nuevo', [0xFFFF << 48])
+        reloaded = SimHashIndex(self.path, retention_hours=24)
+        self.assertEqual(len(reloaded), 1)
+        self.assertIsNone(reloaded.find([0xFFFF]))
+        match = reloaded.find([0xFFFF << 48], live_since=datetime.now() - timedelta(hours=1))
+        self.assertEqual((match['id'], match['live']), ('nuevo', True))
+
+    def test_expired_fingerprints_are_not_found_while_running(self):
+        index = SimHashIndex(self.path, retention_hours=24)
+        index.add('viejo', [0xFFFF], (datetime.now() - timedelta(hours=48)).isoformat())
+        self.assertIsNone(index.find([0xFFFF]))
+        for number in range(50):
+            index.add(f"nuevo{number}", [(number + 1) << 32])
+        self.assertEqual(len(index), 50)
+
+
+class TestBodyDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='simhash_test_')
+        self.server = LocalHTTPServer({
+            '/efe': (200, {'Content-Type': 'text/html'}, _html(WIRE)),
+            '/copia': (200, {'Content-Type': 'text/html'}, _html("EUROPA PRESS. " + WIRE)),
+            '/otra': (200, {'Content-Type': 'text/html'}, _html(OTHER)),
+        }).__enter__()
+        self.generator = BlinkGenerator(fetcher=HttpFetcher({'max_retries': 0}))
+        self.news = News(self.tmp_dir)
+        self.clusterer = OnlineStoryClusterer(
+            self.news, NewsScraper({}), live_hours=48,
+            body_index=SimHashIndex(os.path.join(self.tmp_dir, 'simhash.jsonl'))
+        )
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _item(self, path, title, source):
+        return {'title': title, 'url': f"{self.server.base_url}{path}", 'source': source}
+
+    def test_group_content_skips_repeated_wire_copy(self):
+        group = [self._item('/efe', "La ESA retrasa su sonda lunar", 'EFE'),
+                 self._item('/copia', "Fallo en el motor aplaza la misión", 'Europa Press')]
+        content = self.generator.collect_group_content(group)
+        self.assertEqual(len(content['article_contents']), 1)
+        self.assertEqual(content['urls'], [item['url'] for item in group])
+
+    def test_disabled_simhash_keeps_repeated_wire_copy(self):
+        generator = BlinkGenerator(app_config={'simhash': {'enabled': False}}, fetcher=HttpFetcher({'max_retries': 0}))
+        group = [self._item('/efe', "La ESA retrasa su sonda lunar", 'EFE'),
+                 self._item('/copia', "Fallo en el motor aplaza la misión", 'Europa Press')]
+        content = generator.collect_group_content(group)
+        self.assertEqual(len(content['article_contents']), 2)
+        self.assertEqual(content['fingerprints'], [None, None])
+
+    def test_group_matching_saved_blink_is_attached_without_generation(self):
+        first = [self._item('/efe', "La ESA retrasa su sonda lunar", 'EFE')]
+        fingerprints = self.generator.collect_group_content(first)['fingerprints']
+        self.news.save_blink('sonda', {'id': 'sonda', 'title': first[0]['title'], 'urls': [first[0]['url']],
+                                       'sources': ['EFE'], 'timestamp': datetime.now().isoformat()})
+        self.clusterer.remember_bodies('sonda', fingerprints)
+
+        syndicated = [self._item('/copia', "Fallo en el motor aplaza la misión", 'Europa Press')]
+        syndicated_content = self.generator.collect_group_content(syndicated)
+        self.assertEqual(self.clusterer.resolve_body_duplicate(syndicated, syndicated_content['fingerprints']), 'sonda')
+        with open(os.path.join(self.tmp_dir, 'blinks', 'sonda.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['sources'], ['EFE', 'Europa Press'])
+
+        unrelated = [self._item('/otra', "El Gobierno aprueba la ley de vivienda", 'EFE')]
+        unrelated_content = self.generator.collect_group_content(unrelated)
+        self.assertIsNone(self.clusterer.resolve_body_duplicate(unrelated, unrelated_content['fingerprints']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from news_blink_backend.src.models.scraper import NewsScraper
+from news_blink_backend.src.models.source_health import SourceHealthTracker
+
+
+class TestSourceHealthTracker(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='source_health_test_')
+        self.path = os.path.join(self.tmp_dir, 'source_health.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        tracker = SourceHealthTracker(self.path, failure_threshold=2, base_cooldown_seconds=60)
+        tracker.record("Wired", 0, 15.0, error="timeout")
+        self.assertTrue(tracker.allow("Wired"))
+        tracker.record("Wired", 0, 0.4)
+        self.assertFalse(tracker.allow("Wired"))
+        stats = tracker.stats()["Wired"]
+        self.assertEqual(stats['state'], 'open')
+        self.assertEqual(stats['error_rate'], 1.0)
+        self.assertEqual(stats['last_error'], 'sin artículos')
+
+    def test_cooldown_doubles_until_success(self):
+        tracker = SourceHealthTracker(self.path, failure_threshold=1, base_cooldown_seconds=0.1, max_cooldown_seconds=0.3)
+        cooldowns = []
+        for _ in range(3):
+            tracker.record("Wired", 0, 1.0, error="timeout")
+            cooldowns.append(tracker.stats()["Wired"]['cooldown_seconds'])
+            time.sleep(cooldowns[-1] + 0.02)
+            self.assertEqual(tracker.stats()["Wired"]['state'], 'half_open')
+        self.assertEqual(cooldowns, [0.1, 0.2, 0.3])
+        tracker.record("Wired", 8, 1.0)
+        stats = tracker.stats()["Wired"]
+        self.assertEqual((stats['state'], stats['cooldown_seconds'], stats['consecutive_failures']), ('closed', 0, 0))
+
+    def test_state_survives_restart(self):
+        tracker = SourceHealthTracker(self.path, failure_threshold=1, base_cooldown_seconds=3600)
+        tracker.record("Wired", 0, 1.0, error="timeout")
+        tracker.save()
+        self.assertFalse(SourceHealthTracker(self.path).allow("Wired"))
+
+
+class TestScraperHealth(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='source_health_test_')
+        sources = [{'name': name, 'url': f"https://{name.lower()}.example.com/"} for name in ("Viva", "Caida")]
+        self.scraper = NewsScraper({
+            'news_sources': sources,
+            'source_health': {'enabled': True, 'path': os.path.join(self.tmp_dir, 'health.json'), 'failure_threshold': 2}
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_failing_source_is_skipped_while_open(self):
+        calls = []
+
+        def fake(source):
+            calls.append(source['name'])
+            if source['name'] == "Caida":
+                self.scraper._note_source_error(source, "Read timed out")
+                return []
+            return [{'id': '1', 'title': "Noticia", 'url': "https://viva.example.com/1"}]
+
+        with patch.object(self.scraper, 'scrape_source', side_effect=fake):
+            for _ in range(3):
+                self.scraper.scrape_all_sources()
+        self.assertEqual(calls.count("Viva"), 3)
+        self.assertEqual(calls.count("Caida"), 2)
+        stats = self.scraper.health.stats()
+        self.assertEqual(stats["Caida"]['last_error'], "Read timed out")
+        self.assertEqual(stats["Viva"]['avg_items'], 1)
+
+    def test_recovered_feed_error_counts_as_success(self):
+        def fake(source):
+            self.scraper._note_source_error(source, "feed: XML mal formado")
+            return [{'id': source['name'], 'title': "Noticia", 'url': source['url']}]
+
+        with patch.object(self.scraper, 'scrape_source', side_effect=fake):
+            self.scraper.scrape_all_sources()
+        self.assertEqual(self.scraper.health.stats()["Viva"]['error_rate'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
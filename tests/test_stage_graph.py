@@ -0,0 +1,56 @@
+import threading
+import time
+import unittest
+
+from news_blink_backend.src.models.stage_graph import StageGraph
+
+
+def _sleep_then(value, seconds=0.1):
+    def stage(*inputs):
+        time.sleep(seconds)
+        return (value,) + inputs
+    return stage
+
+
+class TestStageGraph(unittest.TestCase):
+    def test_independent_stages_overlap_and_dependents_wait(self):
+        graph = StageGraph()
+        graph.add('a', _sleep_then('a'))
+        graph.add('b', _sleep_then('b'))
+        graph.add('c', _sleep_then('c'), depends_on=['a'])
+        graph.add('d', _sleep_then('d', 0.05), depends_on=['c', 'b'])
+        results = graph.run()
+
+        self.assertEqual(results['d'], ('d', ('c', ('a',)), ('b',)))
+        self.assertGreaterEqual(graph.timings['c'][0], graph.timings['a'][1])
+        # Camino crítico a -> c -> d (0.25s) en lugar de la suma de las cuatro (0.35s)
+        self.assertLess(graph.wall_seconds, 0.33)
+        path, seconds = graph.critical_path()
+        self.assertEqual(path, ['a', 'c', 'd'])
+        self.assertAlmostEqual(seconds, 0.25, delta=0.05)
+        self.assertIn('camino crítico a -> c -> d', graph.summary())
+
+    def test_single_worker_runs_in_order_on_calling_thread(self):
+        threads = []
+        graph = StageGraph(max_workers=1)
+        graph.add('a', lambda: threads.append(threading.current_thread()) or 1)
+        graph.add('b', lambda a: a + 1, depends_on=['a'])
+        self.assertEqual(graph.run(), {'a': 1, 'b': 2})
+        self.assertEqual(threads, [threading.current_thread()])
+
+    def test_failure_stops_dependents(self):
+        graph = StageGraph()
+        graph.add('a', lambda: 1 / 0)
+        graph.add('b', lambda a: self.fail("no debería ejecutarse"), depends_on=['a'])
+        with self.assertRaises(ZeroDivisionError):
+            graph.run()
+        self.assertNotIn('b', graph.timings)
+
+    def test_rejects_unknown_dependencies(self):
+        graph = StageGraph()
+        with self.assertRaises(ValueError):
+            graph.add('a', lambda b: b, depends_on=['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
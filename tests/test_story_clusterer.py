@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from news_blink_backend.src.models.blink_keyword_index import BlinkKeywordIndex
+from news_blink_backend.src.models.news import News
+from news_blink_backend.src.models.scraper import NewsScraper
+from news_blink_backend.src.models.story_clusterer import OnlineStoryClusterer
+
+
+class TestOnlineStoryClusterer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='story_clusterer_test_')
+        self.news = News(self.tmp_dir)
+        self.clusterer = OnlineStoryClusterer(self.news, NewsScraper({}), live_hours=48)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _save(self, blink_id, title, hours_ago):
+        timestamp = (datetime.now() - timedelta(hours=hours_ago)).isoformat()
+        data = {'id': blink_id, 'title': title, 'timestamp': timestamp,
+                'urls': [f"https://elpais.example.com/{blink_id}"], 'sources': ['El País']}
+        self.news.save_blink(blink_id, data)
+        self.news.save_article(blink_id, dict(data, content="Texto"))
+
+    def _read(self, directory, blink_id):
+        with open(os.path.join(self.tmp_dir, directory, f"{blink_id}.json"), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_assigns_live_old_and_fresh_items(self):
+        self._save('vivo', "Apple presenta el iPhone 16 con inteligencia artificial", hours_ago=2)
+        self._save('viejo', "Tesla recorta los precios del Model 3 en Europa", hours_ago=24 * 10)
+        live = {'title': "Apple presenta el iPhone 16 con inteligencia artificial generativa",
+                'url': "https://techcrunch.example.com/1", 'source': 'TechCrunch'}
+        old = {'title': "Tesla recorta los precios del Model 3 en Europa otra vez",
+               'url': "https://techcrunch.example.com/2", 'source': 'TechCrunch'}
+        fresh = {'title': "La NASA retrasa la misión Artemis III", 'url': "https://techcrunch.example.com/3"}
+
+        attached, duplicates, fresh_items = self.clusterer.assign([live, old, fresh])
+        self.assertEqual(attached, {'vivo': [live]})
+        self.assertEqual(duplicates, [old])
+        self.assertEqual(fresh_items, [fresh])
+
+        self.assertEqual(self.clusterer.attach(attached), (1, []))
+        for directory in ('blinks', 'articles'):
+            data = self._read(directory, 'vivo')
+            self.assertEqual(data['urls'], ["https://elpais.example.com/vivo", live['url']])
+            self.assertEqual(data['sources'], ['El País', 'TechCrunch'])
+        # Volver a añadir la misma noticia no duplica la URL
+        self.assertEqual(self.clusterer.attach(attached), (0, []))
+
+    def test_attach_reports_blinks_that_cannot_be_read(self):
+        self._save('vivo', "Apple presenta el iPhone 16 con inteligencia artificial", hours_ago=2)
+        item = {'title': "Apple presenta el iPhone 16 con inteligencia artificial generativa",
+                'url': "https://techcrunch.example.com/1", 'source': 'TechCrunch'}
+        self.assertEqual(self.clusterer.attach({'borrado': [item], 'vivo': [item]}), (1, ['borrado']))
+
+    def test_attached_titles_extend_the_story_signature(self):
+        self._save('vivo', "Apple presenta el iPhone 16 con inteligencia artificial", hours_ago=2)
+        follow_up = {'title': "El iPhone 16 de Apple con inteligencia artificial ya está en tiendas",
+                     'url': "https://techcrunch.example.com/1"}
+        later = {'title': "El nuevo iPhone 16 de Apple ya está en tiendas", 'url': "https://techcrunch.example.com/2"}
+        self.assertEqual(self.clusterer.assign([later])[2], [later])
+
+        attached, _, _ = self.clusterer.assign([follow_up])
+        self.assertEqual(list(attached), ['vivo'])
+        self.clusterer.attach(attached)
+        self.assertEqual(self.clusterer.assign([later])[0], {'vivo': [later]})
+
+        # La firma sobrevive a un reinicio (se reconstruye desde el diario del índice)
+        reloaded = OnlineStoryClusterer(News(self.tmp_dir), NewsScraper({}), live_hours=48)
+        self.assertEqual(reloaded.assign([later])[0], {'vivo': [later]})
+
+
+class TestKeywordIndexMembers(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='story_clusterer_test_')
+        self.path = os.path.join(self.tmp_dir, 'index.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_members_are_capped_and_replayed(self):
+        index = BlinkKeywordIndex(self.path, max_titles_per_blink=2)
+        index.add('a', "Apple presenta el iPhone 16", "2026-01-01T10:00:00")
+        for title in ("El iPhone 16 llega", "Colas por el iPhone 16", "El iPhone 16 se agota", "El iPhone 16 llega"):
+            index.add_member('a', title)
+        index.add_member('desconocido', "Google lanza Gemini")
+
+        reloaded = BlinkKeywordIndex(self.path, max_titles_per_blink=2)
+        candidates = reloaded.candidates("Colas", live_since=datetime(2025, 12, 31))
+        self.assertEqual([candidate['id'] for candidate in candidates], ['a'])
+        self.assertEqual([member.title for member in candidates[0]['members']],
+                         ["Apple presenta el iPhone 16", "El iPhone 16 llega", "Colas por el iPhone 16"])
+        self.assertTrue(candidates[0]['live'])
+        self.assertFalse(reloaded.candidates("Colas", live_since=datetime(2026, 1, 2))[0]['live'])
+        self.assertEqual(reloaded.candidates("Gemini"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from difflib import SequenceMatcher
+from unittest.mock import patch
+
+from news_blink_backend.src.models import string_similarity
+from news_blink_backend.src.models.scraper import NewsScraper
+from news_blink_backend.src.models.string_similarity import ratio, ratios, resolve_similarity_backend
+from news_blink_backend.src.models.text_features import TitleFeatures
+from tests.test_minhash_lsh import TITLES, _items
+
+NORMALIZED = [TitleFeatures(title).normalized for title in TITLES]
+
+
+class TestStringSimilarity(unittest.TestCase):
+    def test_rapidfuzz_ratio_is_close_to_difflib(self):
+        for a in NORMALIZED:
+            for b in NORMALIZED:
+                expected = SequenceMatcher(None, a, b).ratio()
+                self.assertEqual(ratio(a, b, 'difflib'), expected)
+                # Subsecuencia común más larga: nunca menos coincidencias que los bloques de difflib
+                self.assertGreaterEqual(ratio(a, b, 'rapidfuzz') + 1e-9, expected)
+
+    def test_batch_matches_pairwise_with_cutoff(self):
+        for backend in ('rapidfuzz', 'difflib'):
+            batch = ratios(NORMALIZED[0], NORMALIZED, backend)
+            self.assertEqual(batch, [ratio(NORMALIZED[0], other, backend) for other in NORMALIZED])
+        cut = ratios(NORMALIZED[0], NORMALIZED, 'rapidfuzz', score_cutoff=0.7)
+        self.assertEqual([score > 0 for score in cut], [score >= 0.7 for score in ratios(NORMALIZED[0], NORMALIZED)])
+        self.assertEqual(ratios(NORMALIZED[0], []), [])
+
+    def test_falls_back_without_rapidfuzz(self):
+        with patch.object(string_similarity, 'fuzz', None):
+            self.assertEqual(resolve_similarity_backend('rapidfuzz'), 'difflib')
+        self.assertEqual(resolve_similarity_backend('rapidfuzz'), 'rapidfuzz')
+
+
+class TestScraperBackends(unittest.TestCase):
+    def test_scores_above_matches_similarity_above(self):
+        for backend in ('rapidfuzz', 'difflib'):
+            scraper = NewsScraper({'similarity_backend': backend})
+            for title in TITLES:
+                for threshold in (0.3, 0.6):
+                    expected = [scraper.similarity_above(title, other, threshold) for other in TITLES]
+                    got = scraper.scores_above(title, TITLES, threshold)
+                    self.assertEqual([score is None for score in got], [score is None for score in expected])
+                    for score, other in zip(got, expected):
+                        if score is not None:
+                            self.assertAlmostEqual(score, other)
+
+    def test_backends_group_alike(self):
+        items = _items(TITLES)
+        as_ids = lambda groups: [[item['id'] for item in group] for group in groups]
+        difflib_groups = as_ids(NewsScraper({'similarity_backend': 'difflib'}).find_similar_news(items))
+        for strategy in ('greedy', 'lsh'):
+            scraper = NewsScraper({'similarity_backend': 'rapidfuzz', 'grouping_strategy': strategy})
+            self.assertEqual(as_ids(scraper.find_similar_news(items)), difflib_groups, strategy)
+
+
+if __name__ == '__main__':
+    unittest.main()
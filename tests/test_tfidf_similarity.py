@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+
+from news_blink_backend.src.models.scraper import NewsScraper
+from news_blink_backend.src.models.tfidf_similarity import TfidfSimilarity
+
+ITEMS = [
+    {'id': '0', 'title': "Apple presenta el iPhone 16",
+     'summary': "El nuevo teléfono de Apple incorpora inteligencia artificial y un chip más rápido"},
+    {'id': '1', 'title': "Google lanza Gemini 2",
+     'summary': "El modelo de Google compite con ChatGPT en razonamiento y programación"},
+    {'id': '2', 'title': "Así es el nuevo teléfono de Apple",
+     'summary': "El iPhone 16 de Apple llega con inteligencia artificial y un chip más rápido"},
+    {'id': '3', 'title': "La NASA retrasa Artemis III", 'summary': ""},
+    {'id': '4', 'title': "Gemini 2 ya está aquí",
+     'summary': "Google presenta su modelo Gemini 2 para competir con ChatGPT en programación"},
+]
+
+
+class TestTfidfSimilarity(unittest.TestCase):
+    def setUp(self):
+        self.tfidf = TfidfSimilarity(NewsScraper._extract_keywords)
+        self.texts = [f"{item['title']} {item['summary']}" for item in ITEMS] + [""]
+
+    def test_rows_are_normalized(self):
+        matrix = self.tfidf.fit_transform(self.texts)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        np.testing.assert_allclose(norms[:-1], 1.0)
+        # Un texto sin términos queda como fila vacía
+        self.assertEqual(norms[-1], 0.0)
+
+    def test_pairwise_similarity_reuses_batch_idf(self):
+        # Sin lote ajustado, los IDF son los del par comparado
+        pair = TfidfSimilarity.similarity_matrix(TfidfSimilarity(NewsScraper._extract_keywords).fit_transform(self.texts[:2]))
+        self.assertAlmostEqual(self.tfidf.similarity(*self.texts[:2]), pair[0, 1], places=9)
+        self.assertEqual(self.tfidf.document_count, 0)
+
+        batch = TfidfSimilarity.similarity_matrix(self.tfidf.fit_transform(self.texts))
+        vocabulary = self.tfidf.vocabulary
+        for i, text_a in enumerate(self.texts):
+            scores = self.tfidf.similarities(text_a, self.texts)
+            for j in range(len(self.texts)):
+                self.assertAlmostEqual(scores[j], batch[i, j], places=9)
+        # Comparar textos sueltos no reajusta el vocabulario ni los IDF
+        self.assertIs(self.tfidf.vocabulary, vocabulary)
+        self.assertEqual(self.tfidf.similarity("Apple presenta el iPhone 16", "palabras fuera del vocabulario"), 0.0)
+
+    def test_min_similarity_keeps_matrix_sparse(self):
+        similarities = TfidfSimilarity.similarity_matrix(self.tfidf.fit_transform(self.texts), min_similarity=0.3)
+        self.assertTrue((similarities.data > 0.3).all())
+        self.assertGreater(similarities[0, 2], 0.3)
+        self.assertEqual(similarities[0, 1], 0)
+
+
+class TestTfidfGrouping(unittest.TestCase):
+    def test_groups_by_title_and_summary(self):
+        scraper = NewsScraper({'grouping_strategy': 'tfidf', 'tfidf': {'threshold': 0.3}})
+        groups = scraper.find_similar_news(ITEMS)
+        self.assertEqual([[item['id'] for item in group] for group in groups], [['0', '2'], ['1', '4'], ['3']])
+
+    def test_pairwise_similarity_uses_last_batch(self):
+        scraper = NewsScraper({'grouping_strategy': 'tfidf'})
+        self.assertEqual(scraper.similarity_threshold, 0.4)
+        pair = ("Apple presenta el iPhone 16", "Así es el nuevo iPhone 16 de Apple")
+        scraper.find_similar_news(ITEMS)
+        fitted = scraper.calculate_combined_similarity(*pair)
+        expected = TfidfSimilarity.similarity_matrix(scraper.tfidf.transform(pair))[0, 1]
+        self.assertAlmostEqual(fitted, expected, places=9)
+        self.assertEqual(scraper.scores_above(pair[0], [pair[1]], 0.0), [fitted])
+        self.assertEqual(scraper.calculate_combined_similarity(*pair), fitted)
+        same = scraper.calculate_combined_similarity("Apple presenta el iPhone 16", "Apple presenta el iPhone 16")
+        self.assertAlmostEqual(same, 1.0)
+        self.assertEqual(scraper.calculate_combined_similarity("Apple presenta el iPhone 16", "La NASA retrasa Artemis III"), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()